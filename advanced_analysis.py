@@ -6,8 +6,74 @@ Advanced analysis modules for The Referee
 - What-If Scenario Analysis
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from constraints import Constraints, Budget, Performance, Scale, TeamSkill, TimeToMarket
+from options import get_database_options, get_scaling_models
+from plugins import loaded_provider
+from simulator import SCALE_BASE_RPS, simulate_traffic_spike
+
+# Extended constraint values that turn a built-in option into a risky fit:
+# (field, value) -> {option: (reasoning, context_warning)}
+EXTENDED_FIT_RISKS = {
+    ("data_volume", "hundreds_of_tb"): {
+        "PostgreSQL (RDS)": ("Dataset exceeds what a single RDS instance can store (64 TiB)",
+                             "Only viable with sharding across instances or archiving cold data"),
+        "Redis (ElastiCache)": ("Hundreds of TB in memory is prohibitively expensive",
+                                "Only viable as a cache for a small hot subset"),
+    },
+    ("data_volume", "petabytes"): {
+        "PostgreSQL (RDS)": ("Petabyte datasets are far beyond a single RDS instance",
+                             "Only viable for a small operational subset of the data"),
+        "Redis (ElastiCache)": ("Petabytes cannot be held in memory",
+                                "Only viable as a cache for a small hot subset"),
+    },
+    ("data_volume", "terabytes"): {
+        "Redis (ElastiCache)": ("Terabytes in memory cost far more than disk-based storage",
+                                "Works if only a small hot subset is cached"),
+    },
+    ("lock_in", "gcp"): {
+        "DynamoDB": ("DynamoDB is AWS-only - your stack runs on GCP",
+                     "Viable only if you are prepared to run and secure a second cloud"),
+    },
+    ("lock_in", "azure"): {
+        "DynamoDB": ("DynamoDB is AWS-only - your stack runs on Azure",
+                     "Viable only if you are prepared to run and secure a second cloud"),
+    },
+    ("region_count", "global"): {
+        "PostgreSQL (RDS)": ("A single writer region cannot give global users low-latency writes",
+                             "Works if writes can tolerate cross-region latency"),
+    },
+}
+
+# Sensitivity of extended constraints, reported only when set: (field, value) -> (impact, explanation)
+EXTENDED_SENSITIVITIES = {
+    ("region_count", "multi"): ("MEDIUM", "Multiple regions favor options with managed cross-region replication"),
+    ("region_count", "global"): ("HIGH", "Global writes eliminate single-writer databases"),
+    ("data_volume", "terabytes"): ("MEDIUM", "Terabytes rule out in-memory storage as the primary store"),
+    ("data_volume", "hundreds_of_tb"): ("HIGH", "Hundreds of TB need storage that scales out without limits"),
+    ("data_volume", "petabytes"): ("HIGH", "Petabytes need storage that scales out without limits"),
+    ("read_write_ratio", "read_heavy"): ("LOW", "Read-heavy loads scale with replicas or caches on any option"),
+    ("read_write_ratio", "write_heavy"): ("MEDIUM", "Heavy writes favor horizontally scaled writers"),
+    ("compliance", "gdpr"): ("MEDIUM", "GDPR constrains where replicas and backups may live"),
+    ("compliance", "hipaa"): ("MEDIUM", "HIPAA limits you to eligible services and adds audit work"),
+    ("compliance", "pci"): ("MEDIUM", "PCI DSS adds encryption and access-control requirements to every store"),
+    ("compliance", "fedramp"): ("HIGH", "FedRAMP limits you to authorized services and regions"),
+    ("lock_in", "aws"): ("MEDIUM", "An AWS stack favors AWS-native services"),
+    ("lock_in", "gcp"): ("HIGH", "A GCP stack rules out AWS-only services"),
+    ("lock_in", "azure"): ("HIGH", "An Azure stack rules out AWS-only services"),
+    ("lock_in", "postgres"): ("MEDIUM", "Existing PostgreSQL skills and code favor staying relational"),
+    ("lock_in", "mongodb"): ("MEDIUM", "Existing MongoDB skills and code favor staying on documents"),
+}
+
+
+def extended_fit_risk(option_key: str, extended: Dict[str, str]) -> Optional[Tuple[str, str]]:
+    """(reasoning, context_warning) of the first extended value that makes a built-in option risky"""
+    for field, value in extended.items():
+        risk = EXTENDED_FIT_RISKS.get((field, value), {}).get(option_key)
+        if risk is not None:
+            return risk
+    return None
+
 
 # ============================================================================
 # CONSTRAINT FIT ASSESSOR
@@ -30,16 +96,26 @@ class ConstraintFitAssessor:
         constraints_dict = self.constraints.to_dict()
         
         if option_key == "PostgreSQL (RDS)":
-            return self._assess_postgres()
+            return self._with_extended_risks(option_key, self._assess_postgres())
         elif option_key == "DynamoDB":
-            return self._assess_dynamodb()
+            return self._with_extended_risks(option_key, self._assess_dynamodb())
         elif option_key == "MongoDB Atlas":
-            return self._assess_mongodb()
+            return self._with_extended_risks(option_key, self._assess_mongodb())
         elif option_key == "Redis (ElastiCache)":
-            return self._assess_redis()
+            return self._with_extended_risks(option_key, self._assess_redis())
+        
+        # Options contributed by a loaded plugin bring their own fit logic
+        provider = loaded_provider(option_key)
+        if provider is not None:
+            return provider.assess_fit(self.constraints)
         
         return "moderate_fit", "Evaluation pending", ""
     
+    def _with_extended_risks(self, option_key: str, fit: Tuple[str, str, str]) -> Tuple[str, str, str]:
+        """Downgrades a fit to risky when an extended constraint rules the option out"""
+        risk = extended_fit_risk(option_key, self.constraints.extended_dict())
+        return ("risky_fit",) + risk if risk is not None else fit
+    
     def _assess_postgres(self) -> Tuple[str, str, str]:
         c = self.constraints.to_dict()
         
@@ -269,6 +345,11 @@ class ConstraintSensitivityAnalyzer:
                 "Eventual consistency acceptable - opens up high-performance options"
             )
         
+        # Extended constraints only count once they are set
+        for field, value in self.constraints.extended_dict().items():
+            if (field, value) in EXTENDED_SENSITIVITIES:
+                sensitivities[field] = EXTENDED_SENSITIVITIES[(field, value)]
+        
         return sensitivities
 
 
@@ -334,8 +415,9 @@ class CrossOptionComparator:
 class WhatIfScenarioAnalyzer:
     """Analyzes how options perform under changed conditions"""
     
-    def __init__(self, constraints: Constraints):
+    def __init__(self, constraints: Constraints, options: Optional[Dict[str, Dict]] = None):
         self.constraints = constraints
+        self.options = options  # None: the default catalog
     
     def analyze_scenario(self, scenario: str) -> Dict[str, str]:
         """
@@ -347,35 +429,89 @@ class WhatIfScenarioAnalyzer:
         """
         
         if scenario == "traffic_10x":
-            return self._scenario_traffic_spike()
+            results = self._scenario_traffic_spike()
         elif scenario == "team_doubles":
-            return self._scenario_team_growth()
+            results = self._scenario_team_growth()
         elif scenario == "budget_cuts":
-            return self._scenario_budget_cuts()
+            results = self._scenario_budget_cuts()
         elif scenario == "latency_critical":
-            return self._scenario_latency_critical()
+            results = self._scenario_latency_critical()
+        else:
+            return {}
         
-        return {}
+        if self.options is None:
+            return results
+        return self._for_options(scenario, results)
+    
+    def _for_options(self, scenario: str, results: Dict[str, str]) -> Dict[str, str]:
+        """Restricts results to the compared options, with plugin responses taking precedence"""
+        for option_name in self.options:
+            provider = loaded_provider(option_name)
+            response = provider.scenario_response(scenario, self.constraints) if provider else None
+            if response:
+                results[option_name] = response
+        return {name: text for name, text in results.items() if name in self.options}
     
     def _scenario_traffic_spike(self) -> Dict[str, str]:
+        """Simulates a 10x arrival ramp from the profile's scale"""
+        options = self.options if self.options is not None else get_database_options()
+        scaling_models = get_scaling_models()
+        peak_rps = 10 * SCALE_BASE_RPS[self.constraints.scale.value]
+        results = simulate_traffic_spike(self.constraints.to_dict(), multiplier=10, options=self.options)
+        
         return {
-            "PostgreSQL (RDS)": 
-                "⚠️ **Struggles** - Requires manual scaling, potential downtime for vertical "
-                "scaling. Read replicas help but write bottleneck remains.",
-            
-            "DynamoDB": 
-                "✅ **Excels** - Auto-scales seamlessly. Costs increase but performance "
-                "remains consistent. No intervention needed.",
-            
-            "MongoDB Atlas": 
-                "✅ **Handles Well** - Auto-scaling enabled. May need shard rebalancing "
-                "but generally transparent. Some manual tuning beneficial.",
-            
-            "Redis (ElastiCache)": 
-                "⚠️ **Depends** - If used for caching, helps other databases handle spike. "
-                "If primary store, memory limits hit quickly. Manual scaling needed."
+            option_name: self._describe_traffic_spike(
+                metrics,
+                options[option_name],
+                scaling_models[options[option_name]["scaling_model"]],
+                peak_rps
+            )
+            for option_name, metrics in results.items()
         }
     
+    def _describe_traffic_spike(self, m: Dict[str, float], option_data: Dict,
+                                scaling: Dict, peak_rps: float) -> str:
+        if m["failed_pct"] >= 1 or m["memory_exceeded_s"] > 0:
+            verdict = "❌ **Struggles**"
+        elif m["saturated_s"] > 0:
+            verdict = "⚠️ **Strained**"
+        elif m["worst_p99_ms"] > 2 * m["baseline_p99_ms"]:
+            verdict = "✅ **Handles Well**"
+        else:
+            verdict = "✅ **Excels**"
+        
+        text = (
+            f"{verdict} - At {peak_rps:,.0f} req/s: p50 {m['p50_ms']:.1f} ms / p99 {m['p99_ms']:.1f} ms "
+            f"once scaled (baseline p99 {m['baseline_p99_ms']:.1f} ms, worst p99 "
+            f"{m['worst_p99_ms']:,.1f} ms during the ramp). Initial capacity saturates at "
+            f"~{m['saturation_rps']:,.0f} req/s"
+        )
+        
+        if m["saturated_s"] > 0:
+            text += (
+                f"; {m['saturated_s']:.0f}s over capacity while {option_data['scaling_model']} "
+                f"scaling catches up ({scaling['resize_delay_s']}s per step"
+            )
+            if scaling["failover_s"]:
+                text += f", {scaling['failover_s']}s failover"
+            text += ")"
+        else:
+            text += "; scaling stays ahead of the ramp"
+        
+        if m["failed_pct"] > 0:
+            text += f", {m['failed_pct']:.1f}% of requests timed out"
+        text += "."
+        
+        if m["memory_exceeded_s"] > 0:
+            text += (
+                f" Working set exceeded RAM for {m['memory_exceeded_s']:.0f}s - evictions, "
+                "or write failures if used as primary store."
+            )
+        if option_data["type"] == "cache":
+            text += " As a cache it also absorbs reads the primary database would otherwise take."
+        
+        return text
+    
     def _scenario_team_growth(self) -> Dict[str, str]:
         return {
             "PostgreSQL (RDS)": 
@@ -0,0 +1,199 @@
+"""
+Multi-database architecture search for The Referee
+- Per-constraint coverage scoring
+- Branch-and-bound enumeration of 2- and 3-option architectures
+- Dominated-combination pruning
+"""
+
+import heapq
+from itertools import combinations, product
+import numpy as np
+from typing import Dict, List, Tuple
+from constraints import Constraints
+from evaluator import (
+    CONSTRAINT_SECTIONS,
+    active_rules,
+    evaluate_constraint,
+    evaluate_options,
+    score_evaluation
+)
+
+# Every extra component costs coverage: two databases mean two systems to
+# operate, monitor and keep in sync.
+INTEGRATION_PENALTY = 1.0
+
+# Option types that cannot hold an architecture's system of record on their own
+COMPLEMENT_TYPES = ["cache"]
+
+# ============================================================================
+# ARCHITECTURE SEARCHER
+# ============================================================================
+
+class ArchitectureSearcher:
+    """Ranks combinations of options by how well they cover the constraints together"""
+
+    def __init__(self, constraints: Constraints, options: Dict[str, Dict]):
+        self.constraints = constraints
+        self.options = options
+        self.rules = active_rules()  # One rule set for the whole search
+        self.coverage = self._score_coverage()
+        self.stats = {"visited": 0, "pruned": 0}
+
+    def _score_coverage(self) -> Dict[str, Dict[str, float]]:
+        """Scores every option against every constraint in isolation"""
+        c = self.constraints.to_dict()
+        return {
+            option_name: {
+                key: score_evaluation(evaluate_constraint(option_name, option_data, key, c[key], self.rules))
+                for key in CONSTRAINT_SECTIONS
+            }
+            for option_name, option_data in self.options.items()
+        }
+
+    def search(self, sizes: Tuple[int, ...] = (2, 3), top_k: int = 5) -> List[Dict]:
+        """
+        Returns the top_k architectures, best combined coverage first.
+        An architecture's coverage of a constraint is the best coverage any
+        of its members offers; each member beyond the first costs
+        INTEGRATION_PENALTY. A combination is dominated - and never returned -
+        when dropping a member leaves one the search could return (a size in
+        sizes, with a primary store) that covers every constraint as well.
+        Branches whose coverage bound cannot beat the current top_k are cut.
+        """
+        self.stats = {"visited": 0, "pruned": 0}
+        keys = list(CONSTRAINT_SECTIONS)
+
+        # Options with identical coverage and role are interchangeable, so the
+        # search runs over equivalence classes (each usable as often as it has
+        # members) and expands them at the end.
+        classes: Dict[Tuple, List[str]] = {}
+        for option_name, scores in self.coverage.items():
+            signature = (tuple(scores[key] for key in keys), self._is_primary(option_name))
+            classes.setdefault(signature, []).append(option_name)
+
+        # Best classes first so good bounds are found early
+        signatures = sorted(classes, key=lambda signature: sum(signature[0]), reverse=True)
+        matrix = np.array([signature[0] for signature in signatures], dtype=float).reshape(-1, len(keys))
+        primaries = np.array([signature[1] for signature in signatures], dtype=bool)
+        capacity = [len(classes[signature]) for signature in signatures]
+
+        # suffix_best[i, k]: best coverage of constraint k among classes i onwards
+        suffix_best = np.full((len(signatures) + 1, len(keys)), -np.inf)
+        for i in range(len(signatures) - 1, -1, -1):
+            suffix_best[i] = np.maximum(matrix[i], suffix_best[i + 1])
+
+        min_size, max_size = min(sizes), max(sizes)
+        best: List[Tuple[float, int, Tuple[int, ...]]] = []  # min-heap of (score, tiebreak, classes)
+
+        def beaten(bound: float) -> bool:
+            return len(best) >= top_k and bound <= best[0][0]
+
+        def offer(score: float, members: Tuple[int, ...]) -> None:
+            entry = (score, -self.stats["visited"] - len(best), members)
+            if len(best) < top_k:
+                heapq.heappush(best, entry)
+            elif score > best[0][0]:
+                heapq.heapreplace(best, entry)
+
+        def returnable(members: Tuple[int, ...]) -> bool:
+            return len(members) in sizes and bool(primaries[list(members)].any())
+
+        def dominated(members: Tuple[int, ...], covered: np.ndarray) -> bool:
+            for position in range(len(members)):
+                rest = members[:position] + members[position + 1:]
+                if returnable(rest) and (matrix[list(rest)].max(axis=0) >= covered).all():
+                    return True
+            return False
+
+        def next_start(i: int, members: Tuple[int, ...]) -> int:
+            """Where the next member's class search starts: i again while the class has unused options"""
+            return i if members.count(i) < capacity[i] else i + 1
+
+        def expand_last(start: int, members: Tuple[int, ...], covered: np.ndarray) -> None:
+            """Scores every final member at once instead of branching on each"""
+            block = matrix[start:]
+            self.stats["visited"] += len(block)
+            scores = np.maximum(block, covered).sum(axis=1) - INTEGRATION_PENALTY * len(members)
+            valid = primaries[start:] | primaries[list(members)].any()
+            if len(best) >= top_k:
+                valid &= scores > best[0][0]
+            self.stats["pruned"] += int(len(block) - valid.sum())
+
+            offered = 0
+            for offset in np.flatnonzero(valid)[np.argsort(-scores[valid], kind="stable")]:
+                extended = members + (start + int(offset),)
+                if dominated(extended, np.maximum(covered, block[offset])):
+                    self.stats["pruned"] += 1
+                    continue
+                offer(float(scores[offset]), extended)
+                offered += 1
+                if offered == top_k:
+                    return
+
+        def expand(start: int, members: Tuple[int, ...], covered: np.ndarray) -> None:
+            # A member that adds no coverage makes every combination through
+            # it dominated by the same one without it - when that one is
+            # returnable: it keeps a primary and a size the search returns
+            can_skip_redundant = bool(primaries[list(members)].any()) and all(
+                size - 1 in sizes for size in sizes if size > len(members)
+            )
+            for i in range(start, len(signatures)):
+                if beaten(np.maximum(covered, suffix_best[i]).sum()
+                          - INTEGRATION_PENALTY * (max(len(members) + 1, min_size) - 1)):
+                    # Later classes only offer less coverage - cut the whole tail
+                    self.stats["pruned"] += len(signatures) - i
+                    return
+
+                self.stats["visited"] += 1
+                if can_skip_redundant and not (matrix[i] > covered).any():
+                    self.stats["pruned"] += 1
+                    continue
+
+                extended = members + (i,)
+                merged = np.maximum(covered, matrix[i])
+                if returnable(extended) and not dominated(extended, merged):
+                    offer(float(merged.sum()) - INTEGRATION_PENALTY * (len(extended) - 1), extended)
+
+                if len(extended) == max_size - 1:
+                    expand_last(next_start(i, extended), extended, merged)
+                elif len(extended) < max_size:
+                    expand(next_start(i, extended), extended, merged)
+
+        expand(0, (), np.full(len(keys), -np.inf))
+
+        architectures = []
+        for score, _, members in sorted(best, key=lambda entry: entry[0], reverse=True):
+            per_class = [combinations(classes[signatures[i]], members.count(i)) for i in dict.fromkeys(members)]
+            for picked in product(*per_class):
+                architectures.append(self._describe([name for names in picked for name in names], score))
+                if len(architectures) == top_k:
+                    return architectures
+        return architectures
+
+    def _is_primary(self, option_name: str) -> bool:
+        return self.options[option_name]["type"] not in COMPLEMENT_TYPES
+
+    def _describe(self, members: List[str], score: float) -> Dict:
+        """Builds the trade-off summary for one architecture"""
+        coverage = {}
+        for key in CONSTRAINT_SECTIONS:
+            covering = max(members, key=lambda name: self.coverage[name][key])
+            coverage[key] = (self.coverage[covering][key], covering)
+
+        trade_offs = {"hidden_costs": [], "avoid_when": []}
+        for name in members:
+            evaluation = evaluate_options(name, self.options[name], self.constraints, self.rules)
+            for category in trade_offs:
+                trade_offs[category].extend(f"{name}: {message}" for message in evaluation[category])
+
+        return {
+            "members": members,
+            "roles": {
+                name: "primary store" if self._is_primary(name) else "complement"
+                for name in members
+            },
+            "score": score,
+            "coverage": coverage,
+            "gaps": [key for key, (value, _) in coverage.items() if value < 0],
+            "trade_offs": trade_offs
+        }
@@ -0,0 +1,180 @@
+"""
+Batch reports for The Referee
+- Streams a service inventory CSV (one row of constraints per service)
+- Deduplicates identical profiles: each distinct profile is analyzed once
+- Fans analyses out over a process pool
+- Writes one decision summary per service plus a portfolio roll-up
+
+Inventory columns: service, budget, performance_priority, scale, team_skill,
+time_to_market, data_complexity, consistency (extra columns are ignored).
+
+Usage:
+    python batch.py inventory.csv reports/ [--workers N] [--full]
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+import pipeline
+
+SERVICE_COLUMN = "service"
+
+# ============================================================================
+# INVENTORY
+# ============================================================================
+
+def iter_inventory(path: str) -> Iterator[Tuple[int, str, Optional[str], str]]:
+    """
+    Streams (line number, service, profile key, error) per inventory row.
+    Rows that don't describe a valid profile come back with an error and no key.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in [SERVICE_COLUMN] + pipeline.PROFILE_KEYS if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Inventory is missing columns: {', '.join(missing)}")
+
+        for row in reader:
+            service = (row[SERVICE_COLUMN] or "").strip()
+            values = {key: (row[key] or "").strip().lower() for key in pipeline.PROFILE_KEYS}
+            try:
+                key = pipeline.profile_key(pipeline.profile_from_dict(values))
+            except ValueError as error:
+                yield reader.line_num, service, None, str(error)
+                continue
+            yield reader.line_num, service, key, ""
+
+
+def _slug(service: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", service).strip("-") or "service"
+
+
+# ============================================================================
+# BATCH RUN
+# ============================================================================
+
+def _analyze_key(key: str) -> Dict:
+    return pipeline.analyze(pipeline.profile_from_key(key))
+
+
+def run_batch(inventory: str, out_dir: str, workers: int = None, full: bool = False) -> Dict:
+    """
+    Analyzes every service in the inventory and writes:
+
+    - services/<service>.md: the app's decision summary (or the full report)
+    - summary.md / summary.csv: per-service fit levels and per-option fit counts
+    """
+    from options import get_database_options
+    from report import FIT_LABELS, render_export, render_markdown
+
+    options = get_database_options()
+    generated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    os.makedirs(os.path.join(out_dir, "services"), exist_ok=True)
+
+    services: List[Tuple[str, str]] = []  # (service, profile key), inventory order
+    errors: List[str] = []
+    futures = {}
+
+    # Submit each distinct profile as soon as it is first seen in the stream
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for line, service, key, error in iter_inventory(inventory):
+            if error:
+                errors.append(f"line {line} ({service or 'unnamed'}): {error}")
+                continue
+            services.append((service, key))
+            if key not in futures:
+                futures[key] = executor.submit(_analyze_key, key)
+        results = {key: future.result() for key, future in futures.items()}
+
+    # Reports, with unique file names even when service names collide
+    used = Counter()
+    fit_counts = {name: Counter() for name in options}
+    rows = []
+    for service, key in services:
+        result = results[key]
+        slug = _slug(service)
+        used[slug] += 1
+        filename = slug if used[slug] == 1 else f"{slug}-{used[slug]}"
+
+        if full:
+            content = render_markdown(result, options)
+        else:
+            content = render_export(result, generated, title=f"Database Decision Analysis: {service}")
+        with open(os.path.join(out_dir, "services", f"{filename}.md"), "w", encoding="utf-8") as f:
+            f.write(content)
+
+        fits = {name: result["fits"][name][0] for name in options}
+        for name, level in fits.items():
+            fit_counts[name][level] += 1
+        rows.append((service, key, filename, fits))
+
+    _write_summary(out_dir, generated, rows, fit_counts, errors, FIT_LABELS)
+    return {"services": len(services), "profiles": len(results), "errors": errors}
+
+
+def _write_summary(out_dir: str, generated: str, rows: List, fit_counts: Dict[str, Counter],
+                   errors: List[str], fit_labels: Dict[str, str]) -> None:
+    option_names = list(fit_counts)
+    levels = list(fit_labels)
+
+    lines = [
+        "# Portfolio Database Decision Summary",
+        f"**Generated:** {generated}",
+        "",
+        f"{len(rows)} services, {len({key for _, key, _, _ in rows})} distinct constraint profiles.",
+        "",
+        "## Fit Levels per Option",
+        "",
+        "| Option | " + " | ".join(fit_labels[level] for level in levels) + " |",
+        "|---" * (len(levels) + 1) + "|"
+    ]
+    for name in option_names:
+        lines.append(f"| {name} | " + " | ".join(str(fit_counts[name][level]) for level in levels) + " |")
+
+    lines += [
+        "",
+        "## Services",
+        "",
+        "| Service | Profile | " + " | ".join(option_names) + " |",
+        "|---" * (len(option_names) + 2) + "|"
+    ]
+    for service, key, filename, fits in rows:
+        cells = " | ".join(fit_labels[fits[name]] for name in option_names)
+        lines.append(f"| [{service}](services/{filename}.md) | `{key}` | {cells} |")
+
+    if errors:
+        lines += ["", "## Skipped Rows", ""] + [f"- {error}" for error in errors]
+
+    with open(os.path.join(out_dir, "summary.md"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+    with open(os.path.join(out_dir, "summary.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([SERVICE_COLUMN, "profile", "report"] + option_names)
+        for service, key, filename, fits in rows:
+            writer.writerow([service, key, f"services/{filename}.md"] + [fits[name] for name in option_names])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run The Referee for every service in an inventory")
+    parser.add_argument("inventory", help="CSV with a service column and one column per constraint")
+    parser.add_argument("out_dir")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--full", action="store_true", help="Write full reports instead of decision summaries")
+    args = parser.parse_args()
+
+    counts = run_batch(args.inventory, args.out_dir, args.workers, args.full)
+    print(f"{counts['services']} services, {counts['profiles']} distinct profiles analyzed "
+          f"-> {os.path.join(args.out_dir, 'summary.md')}")
+    for error in counts["errors"]:
+        print(f"Skipped {error}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Startup benchmark for The Referee
+- Per-module import times, each in a fresh interpreter (python -X importtime)
+- Time to first render and time to first analysis (Streamlit AppTest)
+- Optional budget that fails the run, for CI and pod readiness checks
+
+Usage:
+    python bench_startup.py [--runs 3] [--budget-ms 1500] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from statistics import median
+from typing import Dict
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, "referee_tool.py")
+
+MODULES = [
+    "constraints", "options", "evaluator", "advanced_analysis", "explainer",
+    "simulator", "cost_model", "architecture_search", "trace_ingest",
+    "pipeline", "result_store", "metrics", "streamlit", "numpy", "referee_tool"
+]
+
+# ============================================================================
+# IMPORT TIMES
+# ============================================================================
+
+def _import_times_us(statement: str) -> Dict[str, int]:
+    """Cumulative import time of every top-level module a statement loads"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{result.stderr}")
+
+    # Lines look like: "import time:   self [us] | cumulative | [indent]name"
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        if "." not in name:
+            cumulative[name] = max(cumulative.get(name, 0), int(cumulative_us))
+    return cumulative
+
+
+def import_time_ms(module: str) -> Dict[str, float]:
+    """
+    Imports one module in a fresh interpreter. Returns its cumulative import
+    time and the three heaviest dependencies it pulled in; modules every
+    interpreter loads at startup (site, encodings, ...) are left out.
+    """
+    cumulative = _import_times_us(f"import {module}")
+    for name in _import_times_us("pass"):
+        cumulative.pop(name, None)
+
+    total_us = cumulative.pop(module, 0)
+    heaviest = sorted(cumulative.items(), key=lambda item: -item[1])[:3]
+    return {
+        "total_ms": total_us / 1000,
+        "heaviest": {name: us / 1000 for name, us in heaviest}
+    }
+
+
+# ============================================================================
+# RENDER TIMES
+# ============================================================================
+
+_RENDER_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.run()
+first_render = time.perf_counter() - start
+button = next(b for b in at.button if "Analyze" in b.label)
+start = time.perf_counter()
+button.click().run()
+analysis = time.perf_counter() - start
+print(json.dumps({{"first_render_ms": first_render * 1000, "analysis_ms": analysis * 1000,
+                  "errors": len(at.exception)}}))
+"""
+
+
+def render_times_ms() -> Dict[str, float]:
+    """Cold first render and first Analyze run, in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-c", _RENDER_SCRIPT.format(app=APP_PATH)],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Rendering the app failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(runs: int = 3) -> Dict:
+    """Median of several cold runs for every measurement"""
+    imports = {}
+    for module in MODULES:
+        samples = sorted((import_time_ms(module) for _ in range(runs)), key=lambda s: s["total_ms"])
+        imports[module] = samples[len(samples) // 2]
+
+    start = time.perf_counter()
+    renders = [render_times_ms() for _ in range(runs)]
+    return {
+        "runs": runs,
+        "imports": imports,
+        "first_render_ms": median(r["first_render_ms"] for r in renders),
+        "analysis_ms": median(r["analysis_ms"] for r in renders),
+        "errors": max(r["errors"] for r in renders),
+        "wall_s": time.perf_counter() - start
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure The Referee's startup time")
+    parser.add_argument("--runs", type=int, default=3, help="Cold runs per measurement (median reported)")
+    parser.add_argument("--budget-ms", type=float, help="Fail if time to first render exceeds this")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.runs)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'Module':<22}{'Import (ms)':>12}  Heaviest dependencies")
+        for module, timing in sorted(results["imports"].items(), key=lambda item: -item[1]["total_ms"]):
+            heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in timing["heaviest"].items())
+            print(f"{module:<22}{timing['total_ms']:>12.1f}  {heaviest}")
+        print(f"\nTime to first render: {results['first_render_ms']:.0f} ms")
+        print(f"First analysis:       {results['analysis_ms']:.0f} ms")
+
+    if results["errors"]:
+        print(f"App raised {results['errors']} exception(s)", file=sys.stderr)
+        sys.exit(1)
+    if args.budget_ms is not None and results["first_render_ms"] > args.budget_ms:
+        print(f"Time to first render {results['first_render_ms']:.0f} ms exceeds the "
+              f"{args.budget_ms:.0f} ms budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
-import streamlit as st
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional
 from enum import Enum
 
 # ============================================================================
@@ -40,6 +39,51 @@ class Consistency(Enum):
     EVENTUAL = "eventual"
     STRONG = "strong"
 
+# Extended constraints - optional, each with a neutral default that leaves
+# the analysis of the seven core fields unchanged
+
+class RegionCount(Enum):
+    SINGLE = "single"
+    MULTI = "multi"
+    GLOBAL = "global"
+
+class DataVolume(Enum):
+    GIGABYTES = "gigabytes"
+    TERABYTES = "terabytes"
+    HUNDREDS_OF_TB = "hundreds_of_tb"
+    PETABYTES = "petabytes"
+
+class ReadWriteRatio(Enum):
+    READ_HEAVY = "read_heavy"
+    BALANCED = "balanced"
+    WRITE_HEAVY = "write_heavy"
+
+class Compliance(Enum):
+    NONE = "none"
+    GDPR = "gdpr"
+    HIPAA = "hipaa"
+    PCI = "pci"
+    FEDRAMP = "fedramp"
+
+class StackLockIn(Enum):
+    NONE = "none"
+    AWS = "aws"
+    GCP = "gcp"
+    AZURE = "azure"
+    POSTGRES = "postgres"
+    MONGODB = "mongodb"
+
+# Extended field -> its default; the enum is the default's type
+EXTENDED_DEFAULTS = {
+    "region_count": RegionCount.SINGLE,
+    "data_volume": DataVolume.GIGABYTES,
+    "read_write_ratio": ReadWriteRatio.BALANCED,
+    "compliance": Compliance.NONE,
+    "lock_in": StackLockIn.NONE
+}
+
+EXTENDED_FIELDS = {field: type(default) for field, default in EXTENDED_DEFAULTS.items()}
+
 # ============================================================================
 # DATACLASS - Structured Constraints
 # ============================================================================
@@ -53,9 +97,22 @@ class Constraints:
     time_to_market: TimeToMarket
     data_complexity: DataComplexity
     consistency: Consistency
+    region_count: RegionCount = EXTENDED_DEFAULTS["region_count"]
+    data_volume: DataVolume = EXTENDED_DEFAULTS["data_volume"]
+    read_write_ratio: ReadWriteRatio = EXTENDED_DEFAULTS["read_write_ratio"]
+    compliance: Compliance = EXTENDED_DEFAULTS["compliance"]
+    lock_in: StackLockIn = EXTENDED_DEFAULTS["lock_in"]
+    
+    def extended_dict(self) -> Dict[str, str]:
+        """Extended fields that differ from their defaults - empty for a core profile"""
+        return {
+            field: getattr(self, field).value
+            for field, default in EXTENDED_DEFAULTS.items()
+            if getattr(self, field) is not default
+        }
     
     def to_dict(self) -> Dict[str, str]:
-        """Convert constraints to dictionary for easy access"""
+        """Convert the seven core constraints to a dictionary (extended ones: extended_dict())"""
         return {
             "budget": self.budget.value,
             "performance_priority": self.performance.value,
@@ -70,75 +127,129 @@ class Constraints:
 # UI FUNCTION - Streamlit Input Handling
 # ============================================================================
 
-def get_user_constraints() -> Constraints:
+# Sidebar widget label for each Constraints.to_dict() key
+CONSTRAINT_LABELS = {
+    "budget": "What's your budget level?",
+    "performance_priority": "What matters most for performance?",
+    "scale": "How big will your application scale?",
+    "team_skill": "What's your team's database expertise?",
+    "time_to_market": "How urgent is your launch?",
+    "data_complexity": "How complex is your data model?",
+    "consistency": "What are your consistency requirements?"
+}
+
+# Sidebar widget label for each extended field
+EXTENDED_LABELS = {
+    "region_count": "How many regions do you serve from?",
+    "data_volume": "How much data will you store?",
+    "read_write_ratio": "What's your read/write mix?",
+    "compliance": "Which compliance regime applies?",
+    "lock_in": "What is your existing stack built on?"
+}
+
+# Display names for extended values that aren't plain words
+EXTENDED_VALUE_LABELS = {
+    "hundreds_of_tb": "Hundreds of TB",
+    "gdpr": "GDPR",
+    "hipaa": "HIPAA",
+    "pci": "PCI DSS",
+    "fedramp": "FedRAMP",
+    "aws": "AWS",
+    "gcp": "GCP",
+    "postgres": "PostgreSQL",
+    "mongodb": "MongoDB"
+}
+
+
+def get_user_constraints(defaults: Optional[Dict[str, str]] = None) -> Constraints:
     """
     Captures user constraints through Streamlit UI components.
     Returns a structured Constraints dataclass object.
+    
+    Args:
+        defaults: Optional initial values keyed like Constraints.to_dict(),
+            e.g. a profile derived from a workload trace
     """
+    # Streamlit is only needed for the UI - headless users of Constraints skip it
+    import streamlit as st
+    
+    defaults = defaults or {}
     
     # Budget Constraint
     st.sidebar.subheader("💵 Budget")
     budget_val = st.sidebar.select_slider(
-        "What's your budget level?",
+        CONSTRAINT_LABELS["budget"],
         options=["low", "medium", "high"],
-        value="medium",
+        value=defaults.get("budget", "medium"),
         help="Low: Cost-sensitive, Medium: Balanced, High: Performance over cost"
     )
     
     # Performance Priority
     st.sidebar.subheader("⚡ Performance Priority")
     perf_val = st.sidebar.selectbox(
-        "What matters most for performance?",
+        CONSTRAINT_LABELS["performance_priority"],
         ["latency", "throughput", "balanced"],
-        index=2,
+        index=["latency", "throughput", "balanced"].index(defaults.get("performance_priority", "balanced")),
         help="Latency: Fast response times, Throughput: High volume processing, Balanced: Both"
     )
     
     # Scale
     st.sidebar.subheader("📈 Expected Scale")
     scale_val = st.sidebar.select_slider(
-        "How big will your application scale?",
+        CONSTRAINT_LABELS["scale"],
         options=["small", "medium", "massive"],
-        value="small",
+        value=defaults.get("scale", "small"),
         help="Small: <10K users, Medium: 10K-1M users, Massive: >1M users"
     )
     
     # Team Skill Level
     st.sidebar.subheader("👥 Team Skill Level")
     skill_val = st.sidebar.selectbox(
-        "What's your team's database expertise?",
+        CONSTRAINT_LABELS["team_skill"],
         ["beginner", "intermediate", "expert"],
-        index=0,
+        index=["beginner", "intermediate", "expert"].index(defaults.get("team_skill", "beginner")),
         help="Be honest - this affects operational complexity"
     )
     
     # Time to Market
     st.sidebar.subheader("⏰ Time to Market")
     time_val = st.sidebar.radio(
-        "How urgent is your launch?",
+        CONSTRAINT_LABELS["time_to_market"],
         ["urgent", "flexible"],
-        index=0,
+        index=["urgent", "flexible"].index(defaults.get("time_to_market", "urgent")),
         help="Urgent: Need to ship fast, Flexible: Can spend time on setup"
     )
     
     # Data Complexity
     st.sidebar.subheader("🗂️ Data Complexity")
     complexity_val = st.sidebar.selectbox(
-        "How complex is your data model?",
+        CONSTRAINT_LABELS["data_complexity"],
         ["simple", "moderate", "complex"],
-        index=1,
+        index=["simple", "moderate", "complex"].index(defaults.get("data_complexity", "moderate")),
         help="Simple: Key-value, Moderate: Relational, Complex: Multi-model/Graph"
     )
     
     # Consistency Requirements
     st.sidebar.subheader("🔒 Consistency Needs")
     consistency_val = st.sidebar.selectbox(
-        "What are your consistency requirements?",
+        CONSTRAINT_LABELS["consistency"],
         ["eventual", "strong"],
-        index=1,
+        index=["eventual", "strong"].index(defaults.get("consistency", "strong")),
         help="Eventual: Can tolerate slight delays, Strong: Must be immediately consistent"
     )
     
+    # Extended constraints - collapsed, since the defaults change nothing
+    extended = {}
+    with st.sidebar.expander("🧭 More constraints (optional)", expanded=False):
+        for field, enum in EXTENDED_FIELDS.items():
+            values = [member.value for member in enum]
+            extended[field] = enum(st.selectbox(
+                EXTENDED_LABELS[field],
+                values,
+                index=values.index(defaults.get(field, EXTENDED_DEFAULTS[field].value)),
+                format_func=lambda value: EXTENDED_VALUE_LABELS.get(value, value.replace("_", " ").capitalize())
+            ))
+    
     # Create and return Constraints dataclass
     return Constraints(
         budget=Budget(budget_val),
@@ -147,5 +258,6 @@ def get_user_constraints() -> Constraints:
         team_skill=TeamSkill(skill_val),
         time_to_market=TimeToMarket(time_val),
         data_complexity=DataComplexity(complexity_val),
-        consistency=Consistency(consistency_val)
+        consistency=Consistency(consistency_val),
+        **extended
     )
@@ -0,0 +1,139 @@
+"""
+Numeric cost projection for The Referee
+- Monthly cost per option driven by workload inputs
+- 36-month projection with compound growth
+- Vectorized over whole grids of workload values
+- Crossover detection between cost curves
+"""
+
+from itertools import combinations
+from typing import Dict, List
+import numpy as np
+
+SECONDS_PER_MONTH = 730 * 3600
+HORIZON_MONTHS = 36
+
+# ============================================================================
+# COST PROJECTION
+# ============================================================================
+
+def project_monthly_cost(
+    cost_model: Dict,
+    reads_per_sec,
+    writes_per_sec,
+    storage_gb,
+    item_kb=1.0,
+    monthly_growth=0.0,
+    secondary_indexes=0,
+    months: int = HORIZON_MONTHS
+) -> np.ndarray:
+    """
+    Projects monthly cost for one option's cost_model.
+
+    Every workload input may be a scalar or an array; inputs are broadcast
+    against each other, so passing a grid of reads_per_sec values computes
+    every curve in one pass. Returns an array of shape
+    broadcast(inputs).shape + (months,) in USD per month.
+    """
+    reads, writes, storage, item_kb, growth, indexes = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in
+          (reads_per_sec, writes_per_sec, storage_gb, item_kb, monthly_growth, secondary_indexes))
+    )
+
+    # Traffic and data volume compound at the same monthly rate
+    growth_curve = (1.0 + growth[..., None]) ** np.arange(months)
+
+    # Secondary indexes replicate writes and storage (GSIs on DynamoDB)
+    amplification = (1.0 + indexes * cost_model["index_amplification"])[..., None]
+    reads = reads[..., None] * growth_curve
+    writes = writes[..., None] * growth_curve * amplification
+    storage = storage[..., None] * growth_curve * amplification
+    item_kb = item_kb[..., None]
+
+    # Usage-based request pricing, billed in size-rounded units
+    read_units = np.ceil(item_kb / cost_model["read_unit_kb"])
+    write_units = np.ceil(item_kb / cost_model["write_unit_kb"])
+    request_cost = SECONDS_PER_MONTH / 1e6 * (
+        reads * read_units * cost_model["read_per_million"]
+        + writes * write_units * cost_model["write_per_million"]
+    )
+
+    storage_cost = storage * cost_model["storage_gb_month"]
+
+    # Instance-based pricing: enough instances for the tightest capacity limit
+    instances = np.zeros_like(reads)
+    for load, capacity_key in ((reads, "instance_reads_per_sec"),
+                               (writes, "instance_writes_per_sec"),
+                               (storage, "instance_storage_gb")):
+        capacity = cost_model[capacity_key]
+        if capacity:
+            instances = np.maximum(instances, np.ceil(load / capacity))
+    instances = np.maximum(instances, cost_model["min_instances"])
+    instance_cost = instances * cost_model["instance_monthly"]
+
+    return request_cost + storage_cost + instance_cost
+
+
+def find_crossovers(x, curves: Dict[str, np.ndarray]) -> List[Dict]:
+    """
+    Finds where one option's cost curve crosses another's along a 1-D axis
+    (months, or any swept workload value). Returns one entry per crossing
+    with the linearly interpolated x and which option is cheaper afterwards.
+
+    Curves that are exactly equal at grid points cross where they first meet,
+    if the cheaper option differs on either side of the tie; a tie they
+    leave in the same order is a touch, not a crossing.
+    """
+    x = np.asarray(x, dtype=float)
+    crossovers = []
+
+    for option_a, option_b in combinations(curves, 2):
+        diff = curves[option_a] - curves[option_b]
+        # Compare each point with the next one where the curves differ
+        unequal = np.flatnonzero(diff)
+        flips = np.flatnonzero(np.sign(diff[unequal[:-1]]) != np.sign(diff[unequal[1:]]))
+
+        for i, j in zip(unequal[flips], unequal[flips + 1]):
+            if j == i + 1:
+                fraction = diff[i] / (diff[i] - diff[j])
+                crossing = x[i] + fraction * (x[j] - x[i])
+            else:
+                crossing = x[i + 1]  # equal from x[i + 1] through x[j - 1]
+            crossovers.append({
+                "x": float(crossing),
+                "cheaper_before": option_a if diff[i] < 0 else option_b,
+                "cheaper_after": option_b if diff[i] < 0 else option_a
+            })
+
+    return sorted(crossovers, key=lambda crossover: crossover["x"])
+
+
+# ============================================================================
+# COST PROJECTOR
+# ============================================================================
+
+class CostProjector:
+    """Projects cost curves for every option that defines a cost_model"""
+
+    def __init__(self, options: Dict[str, Dict]):
+        self.options = {
+            name: data for name, data in options.items() if "cost_model" in data
+        }
+
+    def project(self, **workload) -> Dict[str, np.ndarray]:
+        """Returns option name -> monthly cost array (see project_monthly_cost)"""
+        return {
+            name: project_monthly_cost(data["cost_model"], **workload)
+            for name, data in self.options.items()
+        }
+
+    def sweep(self, parameter: str, values, month: int, **workload) -> Dict[str, np.ndarray]:
+        """
+        Cost at a given month across a grid of one workload parameter,
+        e.g. sweep("reads_per_sec", np.geomspace(10, 1e5, 200), month=12, ...).
+        """
+        workload[parameter] = np.asarray(values, dtype=float)
+        return {
+            name: curve[..., month]
+            for name, curve in self.project(**workload).items()
+        }
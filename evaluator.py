@@ -1,4 +1,406 @@
-def evaluate_options(option_name, option_data, constraints):
+"""
+Trade-off engine for The Referee
+- Rules and messages live in data files (rules/<section>.json), not code
+- Rule files are validated and compiled into a per-value index off the
+  request path, then swapped in atomically
+- Each section caches its output per (option, value); a reload only drops
+  the caches of sections whose file hash changed
+- Option plugins contribute their own sections, scoped to their option
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from constraints import (
+    Budget, Performance, Scale, TeamSkill,
+    TimeToMarket, DataComplexity, Consistency,
+    EXTENDED_DEFAULTS, EXTENDED_FIELDS
+)
+from metrics import CACHE_REQUESTS, RULE_RELOADS, RULES_AGE_SECONDS
+
+# ============================================================================
+# EVALUATION CATEGORIES
+# ============================================================================
+
+EVALUATION_CATEGORIES = ("strengths", "limitations", "hidden_costs", "avoid_when")
+
+# Numeric weight of one message in each category, used to turn an evaluation
+# into a comparable score (architecture search, Pareto views). The trade-off
+# engine itself stays qualitative - these weights never reach the UI text.
+EVALUATION_WEIGHTS = {
+    "strengths": 1.0,
+    "limitations": -1.0,
+    "hidden_costs": -0.5,
+    "avoid_when": -2.0
+}
+
+
+def _empty_evaluation():
+    return {category: [] for category in EVALUATION_CATEGORIES}
+
+
+# ============================================================================
+# RULE FILES
+# ============================================================================
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules")
+
+# Constraint key -> the enum its rules match, in the order sections are applied.
+# Each section only reads its own constraint value, so a section's output can
+# be evaluated (and cached) independently of the rest of the profile.
+CONSTRAINT_SECTIONS = {
+    "budget": Budget,
+    "performance_priority": Performance,
+    "scale": Scale,
+    "team_skill": TeamSkill,
+    "time_to_market": TimeToMarket,
+    "data_complexity": DataComplexity,
+    "consistency": Consistency
+}
+
+# Extended constraints (see constraints.EXTENDED_FIELDS), applied after the
+# core sections and only for fields that differ from their default - a
+# default value adds nothing, so rules may not match it. Each section is
+# cached on its own, so an analysis costs the same however large the
+# combined profile space gets.
+EXTENDED_SECTIONS = dict(EXTENDED_FIELDS)
+
+# Option-specific rules that apply under every profile, applied last
+GENERAL_SECTION = "general"
+
+# A rule adds its messages when every condition it has holds:
+#   value       constraint value(s) - required in constraint sections
+#   option      option name(s)          not_option  option name(s) excluded
+#   data        {field: value(s)} the option's data must match
+#   not_data    {field: value(s)} the option's data must not match
+RULE_CONDITIONS = ("value", "option", "not_option", "data", "not_data")
+
+RULES_WATCH_ENV = "REFEREE_RULES_WATCH"
+
+
+class RuleError(ValueError):
+    """A rule file that failed validation - the active rules stay in place"""
+
+
+def _as_values(value) -> frozenset:
+    return frozenset(value if isinstance(value, list) else [value])
+
+
+def _validate_rule(rule: Any, where: str, values: Optional[frozenset]) -> None:
+    if not isinstance(rule, dict):
+        raise RuleError(f"{where}: a rule must be an object")
+    unknown = set(rule) - set(RULE_CONDITIONS) - {"add"}
+    if unknown:
+        raise RuleError(f"{where}: unknown keys {sorted(unknown)}")
+
+    if values is None and "value" in rule:
+        raise RuleError(f"{where}: general rules cannot match a constraint value")
+    if values is not None:
+        if "value" not in rule:
+            raise RuleError(f"{where}: missing 'value'")
+        bad = _as_values(rule["value"]) - values
+        if bad:
+            raise RuleError(f"{where}: unknown values {sorted(bad)} (expected {sorted(values)})")
+
+    for key in ("option", "not_option"):
+        if key in rule and not all(isinstance(name, str) and name for name in _as_values(rule[key])):
+            raise RuleError(f"{where}: '{key}' must be an option name or a list of them")
+    for key in ("data", "not_data"):
+        if key in rule and not (isinstance(rule[key], dict) and rule[key]):
+            raise RuleError(f"{where}: '{key}' must map option fields to values")
+
+    add = rule.get("add")
+    if not isinstance(add, dict) or not add:
+        raise RuleError(f"{where}: 'add' must map categories to messages")
+    for category, messages in add.items():
+        if category not in EVALUATION_CATEGORIES:
+            raise RuleError(f"{where}: unknown category {category!r} (expected one of {EVALUATION_CATEGORIES})")
+        if not isinstance(messages, list) or not all(isinstance(m, str) and m.strip() for m in messages):
+            raise RuleError(f"{where}: '{category}' must be a list of non-empty messages")
+
+
+# ============================================================================
+# COMPILED RULES
+# ============================================================================
+
+class _Rule:
+    """One validated rule with its conditions as frozensets"""
+
+    __slots__ = ("options", "not_options", "data", "not_data", "additions")
+
+    def __init__(self, rule: Dict):
+        self.options = _as_values(rule["option"]) if "option" in rule else None
+        self.not_options = _as_values(rule.get("not_option", []))
+        self.data = tuple((field, _as_values(v)) for field, v in rule.get("data", {}).items())
+        self.not_data = tuple((field, _as_values(v)) for field, v in rule.get("not_data", {}).items())
+        self.additions = tuple((category, tuple(messages)) for category, messages in rule["add"].items())
+
+    def matches(self, option_name: str, option_data: Dict) -> bool:
+        if self.options is not None and option_name not in self.options:
+            return False
+        if option_name in self.not_options:
+            return False
+        if not all(option_data.get(field) in values for field, values in self.data):
+            return False
+        return not any(option_data.get(field) in values for field, values in self.not_data)
+
+
+class RuleSection:
+    """
+    One compiled rule file: rules indexed by the constraint value they match
+    (None for the general section), plus a cache of evaluated outputs.
+    The cache lives and dies with the section, so it is only dropped when
+    the section's file hash changes.
+    """
+
+    def __init__(self, name: str, digest: str, document: Dict):
+        self.name = name
+        self.digest = digest
+        self.description = document.get("description", "")
+        self.index: Dict[Optional[str], List[_Rule]] = {}
+        for rule in document["rules"]:
+            compiled = _Rule(rule)
+            for value in _as_values(rule.get("value")):
+                self.index.setdefault(value, []).append(compiled)
+
+        # Only the option fields some rule reads take part in the cache key
+        self.fields = tuple(sorted({
+            field for rule in document["rules"] for key in ("data", "not_data") for field in rule.get(key, {})
+        }))
+        self.cache: Dict[Tuple, Tuple[Tuple[str, Tuple[str, ...]], ...]] = {}
+
+    def evaluate(self, option_name: str, option_data: Dict, value: Optional[str]) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+        """((category, messages), ...) the section adds for one option and value"""
+        key = (option_name, value) + tuple(option_data.get(field) for field in self.fields)
+        cached = self.cache.get(key)
+        CACHE_REQUESTS.inc(cache="rule_sections", result="miss" if cached is None else "hit")
+        if cached is None:
+            cached = tuple(
+                addition
+                for rule in self.index.get(value, ())
+                if rule.matches(option_name, option_data)
+                for addition in rule.additions
+            )
+            self.cache[key] = cached
+        return cached
+
+
+def _section_values(name: str) -> frozenset:
+    """Values a section's rules may match"""
+    if name in EXTENDED_SECTIONS:
+        return frozenset(member.value for member in EXTENDED_SECTIONS[name]) - {EXTENDED_DEFAULTS[name].value}
+    return frozenset(member.value for member in CONSTRAINT_SECTIONS[name])
+
+
+def _compile_section(name: str, data: bytes, digest: str) -> RuleSection:
+    where = f"rules/{name}.json"
+    try:
+        document = json.loads(data)
+    except ValueError as error:
+        raise RuleError(f"{where}: invalid JSON ({error})") from None
+    if not isinstance(document, dict) or not isinstance(document.get("rules"), list):
+        raise RuleError(f"{where}: expected an object with a 'rules' list")
+
+    if name == GENERAL_SECTION:
+        values = None
+        if "constraint" in document:
+            raise RuleError(f"{where}: the general section has no constraint")
+    else:
+        values = _section_values(name)
+        if document.get("constraint") != name:
+            raise RuleError(f"{where}: 'constraint' must be {name!r}")
+
+    for i, rule in enumerate(document["rules"]):
+        _validate_rule(rule, f"{where} rule {i + 1}", values)
+    return RuleSection(name, digest, document)
+
+
+class RuleSet:
+    """Immutable set of compiled sections - swapped as a whole, never edited"""
+
+    def __init__(self, sections: Dict[str, RuleSection]):
+        self.sections = sections
+        self.digest = hashlib.sha256("".join(s.digest for s in sections.values()).encode()).hexdigest()
+        self.loaded_at = time.time()
+
+    @property
+    def version(self) -> str:
+        return self.digest[:12]
+
+
+def load_rule_set(directory: str = RULES_DIR, previous: Optional[RuleSet] = None) -> RuleSet:
+    """
+    Reads, validates and compiles every rule file. Sections whose file hash
+    matches one in previous are reused as-is, warm cache included.
+    Raises RuleError when any file is missing, unknown or invalid.
+    """
+    names = list(CONSTRAINT_SECTIONS) + list(EXTENDED_SECTIONS) + [GENERAL_SECTION]
+    found = {entry[:-5] for entry in os.listdir(directory) if entry.endswith(".json")}
+    if found != set(names):
+        missing, unknown = set(names) - found, found - set(names)
+        raise RuleError(f"{directory}: missing {sorted(missing)}, unknown {sorted(unknown)}")
+
+    sections = {}
+    for name in names:
+        with open(os.path.join(directory, f"{name}.json"), "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        reuse = previous.sections.get(name) if previous else None
+        sections[name] = reuse if reuse and reuse.digest == digest else _compile_section(name, data, digest)
+    return RuleSet(sections)
+
+
+def rules_signature(directory: str = RULES_DIR) -> Tuple:
+    """Cheap change check: (name, mtime, size) of every rule file"""
+    return tuple(sorted(
+        (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+        for entry in os.scandir(directory) if entry.name.endswith(".json")
+    ))
+
+
+# ============================================================================
+# OPTION RULES (PLUGINS)
+# ============================================================================
+
+# Sections contributed by option plugins (see plugins.py): option name ->
+# {section: RuleSection}. Each applies after the built-in section of the same
+# name, only to its own option, and is registered once when the plugin loads.
+_option_sections: Dict[str, Dict[str, RuleSection]] = {}
+
+
+def compile_option_rules(option_name: str, documents: Dict[str, List[Dict]]) -> Dict[str, RuleSection]:
+    """
+    Validates and compiles a plugin's rules: {section: [rule, ...]} in the
+    rules/*.json rule format. Every rule is scoped to option_name.
+    Raises RuleError when a rule doesn't validate.
+    """
+    sections = {}
+    for name, rules in documents.items():
+        where = f"{option_name} rules/{name}"
+        if name == GENERAL_SECTION:
+            values = None
+        elif name in CONSTRAINT_SECTIONS or name in EXTENDED_SECTIONS:
+            values = _section_values(name)
+        else:
+            expected = list(CONSTRAINT_SECTIONS) + list(EXTENDED_SECTIONS) + [GENERAL_SECTION]
+            raise RuleError(f"{where}: unknown section (expected one of {expected})")
+        if not isinstance(rules, list):
+            raise RuleError(f"{where}: expected a list of rules")
+
+        scoped = []
+        for i, rule in enumerate(rules):
+            _validate_rule(rule, f"{where} rule {i + 1}", values)
+            if _as_values(rule.get("option", option_name)) != {option_name}:
+                raise RuleError(f"{where} rule {i + 1}: plugin rules can only match {option_name!r}")
+            scoped.append({**rule, "option": option_name})
+
+        data = json.dumps(scoped, sort_keys=True).encode()
+        sections[name] = RuleSection(name, hashlib.sha256(data).hexdigest(), {"rules": scoped})
+    return sections
+
+
+def register_option_rules(option_name: str, sections: Dict[str, RuleSection]) -> None:
+    _option_sections[option_name] = sections
+
+
+# ============================================================================
+# ACTIVE RULES + HOT RELOAD
+# ============================================================================
+
+_active: Optional[RuleSet] = None
+_reload_lock = threading.Lock()
+RULES_AGE_SECONDS.set_function(lambda: time.time() - _active.loaded_at if _active is not None else float("nan"))
+
+
+def active_rules() -> RuleSet:
+    """
+    The rule set currently in force. Callers evaluating several options for
+    one request should take it once and pass it along, so a concurrent
+    reload never mixes two rule sets in one answer.
+    """
+    global _active
+    rules = _active
+    if rules is None:
+        with _reload_lock:
+            if _active is None:
+                _active = load_rule_set()
+            rules = _active
+    return rules
+
+
+def reload_rules() -> List[str]:
+    """
+    Recompiles the rule files and swaps the new set in with one assignment.
+    Returns the sections that changed; raises RuleError (keeping the active
+    rules) when the files don't validate.
+    """
+    global _active
+    with _reload_lock:
+        previous = _active
+        try:
+            rules = load_rule_set(previous=previous)
+        except RuleError:
+            RULE_RELOADS.inc(result="error")
+            raise
+        changed = [
+            name for name, section in rules.sections.items()
+            if previous is None or previous.sections[name] is not section
+        ]
+        _active = rules
+    RULE_RELOADS.inc(result="ok")
+    return changed
+
+
+class RuleWatcher(threading.Thread):
+    """Background thread that reloads the rules whenever a rule file changes"""
+
+    def __init__(self, interval: float = 2.0):
+        super().__init__(name="rule-watcher", daemon=True)
+        self.interval = interval
+        self.last_error: Optional[str] = None
+        self.last_changed: List[str] = []
+        self._signature = rules_signature()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            signature = rules_signature()
+            if signature == self._signature:
+                continue
+            self._signature = signature
+            try:
+                self.last_changed = reload_rules()
+                self.last_error = None
+            except (RuleError, OSError) as error:
+                self.last_error = str(error)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+def start_rule_watcher() -> Optional[RuleWatcher]:
+    """Watches RULES_DIR every $REFEREE_RULES_WATCH seconds (default 2, 0 disables)"""
+    interval = float(os.environ.get(RULES_WATCH_ENV, "2"))
+    if interval <= 0:
+        return None
+    watcher = RuleWatcher(interval)
+    watcher.start()
+    return watcher
+
+
+# ============================================================================
+# EVALUATION
+# ============================================================================
+
+def _apply(evaluation, additions):
+    for category, messages in additions:
+        evaluation[category].extend(messages)
+
+
+def evaluate_options(option_name, option_data, constraints, rules: Optional[RuleSet] = None):
     """
     Evaluates a database option against user constraints.
     Returns strengths, limitations, hidden costs, and when to avoid.
@@ -6,208 +408,58 @@ def evaluate_options(option_name, option_data, constraints):
     This is the TRADE-OFF ENGINE - the heart of The Referee.
     
     Args:
-        constraints: Can be either a dict or Constraints dataclass
+        constraints: Can be either a dict (core keys plus any extended ones) or Constraints dataclass
+        rules: Rule set to apply (default: the active one)
     """
     
     # Convert dataclass to dict if needed
     if hasattr(constraints, 'to_dict'):
-        constraints = constraints.to_dict()
-    
-    evaluation = {
-        "strengths": [],
-        "limitations": [],
-        "hidden_costs": [],
-        "avoid_when": []
-    }
-    
-    # ==========================
-    # BUDGET-DRIVEN EVALUATION
-    # ==========================
-    
-    if constraints["budget"] == "low":
-        if option_data["pricing_model"] == "usage_based":
-            evaluation["strengths"].append("Pay only for what you use - great for variable workloads")
-        else:
-            evaluation["limitations"].append("Always-on instance costs even during low usage")
-        
-        if option_name == "PostgreSQL (RDS)":
-            evaluation["hidden_costs"].append("Multi-AZ deployment doubles costs but often necessary for production")
-        
-        if option_name == "MongoDB Atlas":
-            evaluation["hidden_costs"].append("Memory usage can spike with poor indexing, increasing cluster size")
-        
-        if option_name == "Redis (ElastiCache)":
-            evaluation["hidden_costs"].append("High memory costs for large datasets - RAM is expensive")
-    
-    elif constraints["budget"] == "high":
-        if option_data["pricing_model"] == "instance_based":
-            evaluation["strengths"].append("Predictable costs with reserved instances available")
-        
-        if option_name == "PostgreSQL (RDS)":
-            evaluation["strengths"].append("Can afford performance insights, read replicas, and optimized instances")
-    
-    # ==========================
-    # PERFORMANCE-DRIVEN EVALUATION
-    # ==========================
-    
-    if constraints["performance_priority"] == "latency":
-        if option_name == "Redis (ElastiCache)":
-            evaluation["strengths"].append("Sub-millisecond latency for reads and writes")
-        elif option_name == "DynamoDB":
-            evaluation["strengths"].append("Single-digit millisecond latency at any scale")
-        else:
-            evaluation["limitations"].append("Higher latency than in-memory or pure key-value stores")
-    
-    elif constraints["performance_priority"] == "throughput":
-        if option_name == "DynamoDB":
-            evaluation["strengths"].append("Unlimited throughput with on-demand mode")
-        elif option_name == "MongoDB Atlas":
-            evaluation["strengths"].append("Horizontal scaling handles high write throughput well")
-        elif option_name == "PostgreSQL (RDS)":
-            evaluation["limitations"].append("Write throughput limited by single-master architecture")
-    
-    elif constraints["performance_priority"] == "balanced":
-        if option_name == "MongoDB Atlas":
-            evaluation["strengths"].append("Good balance of read/write performance with flexible queries")
-    
-    # ==========================
-    # SCALE-DRIVEN EVALUATION
-    # ==========================
-    
-    if constraints["scale"] == "small":
-        if option_data["setup_time"] == "fast":
-            evaluation["strengths"].append("Quick to set up - perfect for small scale")
-        
-        if option_name == "DynamoDB":
-            evaluation["avoid_when"].append("Your data access patterns are simple and cost matters more than auto-scaling")
-    
-    elif constraints["scale"] == "medium":
-        if option_data["scaling_model"] in ["horizontal", "automatic"]:
-            evaluation["strengths"].append("Scales smoothly as your user base grows")
+        constraints = {**constraints.to_dict(), **constraints.extended_dict()}
     
-    elif constraints["scale"] == "massive":
-        if option_name == "DynamoDB":
-            evaluation["strengths"].append("Proven at massive scale - handles millions of requests per second")
-        elif option_name == "MongoDB Atlas":
-            evaluation["strengths"].append("Sharding enables horizontal scaling to massive datasets")
-        elif option_name == "PostgreSQL (RDS)":
-            evaluation["limitations"].append("Vertical scaling has limits - eventual need for sharding or read replicas")
-            evaluation["hidden_costs"].append("Read replica lag and synchronization complexity at scale")
-        elif option_name == "Redis (ElastiCache)":
-            evaluation["hidden_costs"].append("Memory costs become prohibitive at massive scale")
-            evaluation["avoid_when"].append("You need to store terabytes of data - Redis is best for hot data")
+    sections = (rules or active_rules()).sections
+    plugin_sections = _option_sections.get(option_name, {})
+    evaluation = _empty_evaluation()
     
-    # ==========================
-    # TEAM SKILL EVALUATION
-    # ==========================
+    for constraint_key in CONSTRAINT_SECTIONS:
+        _apply(evaluation, sections[constraint_key].evaluate(option_name, option_data, constraints[constraint_key]))
+        if constraint_key in plugin_sections:
+            _apply(evaluation, plugin_sections[constraint_key].evaluate(option_name, option_data, constraints[constraint_key]))
     
-    if constraints["team_skill"] == "beginner":
-        if option_data["base_complexity"] == "beginner":
-            evaluation["strengths"].append("Gentle learning curve - good for teams new to databases")
-        else:
-            evaluation["limitations"].append("Requires database expertise for optimization and troubleshooting")
-        
-        if option_name == "PostgreSQL (RDS)":
-            evaluation["avoid_when"].append("Your team lacks SQL and query optimization experience")
-        
-        if option_name == "Redis (ElastiCache)":
-            evaluation["avoid_when"].append("Your team isn't familiar with caching strategies and data eviction policies")
-    
-    elif constraints["team_skill"] == "intermediate":
-        if option_name == "MongoDB Atlas":
-            evaluation["strengths"].append("Intuitive document model bridges SQL and NoSQL paradigms")
-    
-    elif constraints["team_skill"] == "expert":
-        if option_name == "PostgreSQL (RDS)":
-            evaluation["strengths"].append("Rich feature set rewards deep expertise - advanced indexing, partitioning, extensions")
-        
-        if option_data["base_complexity"] == "beginner":
-            evaluation["limitations"].append("May feel limiting if team wants fine-grained control")
-    
-    # ==========================
-    # TIME TO MARKET EVALUATION
-    # ==========================
-    
-    if constraints["time_to_market"] == "urgent":
-        if option_data["setup_time"] == "fast":
-            evaluation["strengths"].append("Minimal setup time - deploy and iterate quickly")
-        else:
-            evaluation["limitations"].append("Setup and configuration takes time away from feature development")
-        
-        if option_data["managed"]:
-            evaluation["strengths"].append("Fully managed - no time spent on database operations")
-    
-    elif constraints["time_to_market"] == "flexible":
-        if option_name == "PostgreSQL (RDS)":
-            evaluation["strengths"].append("Time to design proper schema and indexes pays off long-term")
-    
-    # ==========================
-    # DATA COMPLEXITY EVALUATION
-    # ==========================
-    
-    if constraints["data_complexity"] == "simple":
-        if option_name == "DynamoDB":
-            evaluation["strengths"].append("Perfect for simple key-value and single-table design")
-        elif option_name == "PostgreSQL (RDS)":
-            evaluation["avoid_when"].append("Your data model is just key-value - simpler databases cost less")
-    
-    elif constraints["data_complexity"] == "moderate":
-        if option_name == "MongoDB Atlas":
-            evaluation["strengths"].append("Document model handles moderate complexity without rigid schemas")
-        elif option_name == "PostgreSQL (RDS)":
-            evaluation["strengths"].append("Relational model enforces data integrity for moderate complexity")
-    
-    elif constraints["data_complexity"] == "complex":
-        if option_name == "PostgreSQL (RDS)":
-            evaluation["strengths"].append("JOINs, constraints, and transactions handle complex relationships well")
-        elif option_name == "DynamoDB":
-            evaluation["limitations"].append("Complex queries require multiple round-trips or denormalization")
-            evaluation["avoid_when"].append("You need complex JOINs or ad-hoc queries across multiple entities")
-        elif option_name == "MongoDB Atlas":
-            evaluation["limitations"].append("Lack of JOINs requires embedding or multiple queries for complex data")
-    
-    # ==========================
-    # CONSISTENCY EVALUATION
-    # ==========================
+    for constraint_key in EXTENDED_SECTIONS:
+        value = constraints.get(constraint_key)
+        if value is None or value == EXTENDED_DEFAULTS[constraint_key].value:
+            continue
+        _apply(evaluation, sections[constraint_key].evaluate(option_name, option_data, value))
+        if constraint_key in plugin_sections:
+            _apply(evaluation, plugin_sections[constraint_key].evaluate(option_name, option_data, value))
     
-    if constraints["consistency"] == "strong":
-        if option_data["consistency"] == "strong":
-            evaluation["strengths"].append("Strong consistency guarantees - no stale reads")
-        elif option_data["consistency"] == "eventual_or_strong":
-            evaluation["limitations"].append("Requires explicit strong consistency mode - comes with latency trade-off")
-        else:
-            evaluation["limitations"].append("Eventual consistency may cause race conditions in critical operations")
-    
-    elif constraints["consistency"] == "eventual":
-        if option_name == "DynamoDB":
-            evaluation["strengths"].append("Eventual consistency mode offers lower latency and higher throughput")
-    
-    # ==========================
-    # GENERAL STRENGTHS & RISKS
-    # ==========================
-    
-    # PostgreSQL specific
-    if option_name == "PostgreSQL (RDS)":
-        evaluation["strengths"].append("ACID compliance and mature ecosystem with extensive tooling")
-        evaluation["hidden_costs"].append("Schema migrations on large tables can cause downtime")
-        evaluation["hidden_costs"].append("Connection pooling (RDS Proxy) costs extra but often needed")
-    
-    # DynamoDB specific
-    if option_name == "DynamoDB":
-        evaluation["strengths"].append("Zero operational overhead - AWS handles everything")
-        evaluation["hidden_costs"].append("Global Secondary Indexes (GSIs) double storage and write costs")
-        evaluation["limitations"].append("Data modeling requires upfront planning - hard to change access patterns")
-    
-    # MongoDB specific
-    if option_name == "MongoDB Atlas":
-        evaluation["strengths"].append("Schema flexibility enables rapid iteration during development")
-        evaluation["hidden_costs"].append("Unplanned queries without proper indexes can crush performance")
-        evaluation["limitations"].append("Transactions across shards have performance overhead")
-    
-    # Redis specific
-    if option_name == "Redis (ElastiCache)":
-        evaluation["strengths"].append("Ideal for session storage, rate limiting, and leaderboards")
-        evaluation["limitations"].append("Data loss risk without proper persistence configuration")
-        evaluation["avoid_when"].append("You need it as your primary database - Redis is best as a complement")
+    _apply(evaluation, sections[GENERAL_SECTION].evaluate(option_name, option_data, None))
+    if GENERAL_SECTION in plugin_sections:
+        _apply(evaluation, plugin_sections[GENERAL_SECTION].evaluate(option_name, option_data, None))
     
     return evaluation
+
+
+def evaluate_constraint(option_name, option_data, constraint_key, value, rules: Optional[RuleSet] = None):
+    """
+    Evaluates a database option against a single constraint value.
+    Returns the same structure as evaluate_options, restricted to the
+    messages triggered by that one constraint.
+    """
+    evaluation = _empty_evaluation()
+    _apply(evaluation, (rules or active_rules()).sections[constraint_key].evaluate(option_name, option_data, value))
+    plugin_section = _option_sections.get(option_name, {}).get(constraint_key)
+    if plugin_section is not None:
+        _apply(evaluation, plugin_section.evaluate(option_name, option_data, value))
+    return evaluation
+
+
+def score_evaluation(evaluation):
+    """
+    Collapses an evaluation into a single number using EVALUATION_WEIGHTS.
+    Higher means the messages lean towards strengths.
+    """
+    return sum(
+        EVALUATION_WEIGHTS[category] * len(messages)
+        for category, messages in evaluation.items()
+    )
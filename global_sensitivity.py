@@ -0,0 +1,137 @@
+"""
+Global sensitivity analysis for The Referee
+- Treats the seven Constraints fields as independent inputs, uniform over
+  their enum values
+- First-order and total-effect Sobol indices of each option's fit score,
+  exact over the full profile cube (no sampling)
+- Vectorized over interactions.default_cube(): milliseconds once the cube exists
+
+For an option's score Y over the profile space:
+
+    first order   S_i = Var(E[Y | X_i]) / Var(Y)
+    total effect ST_i = E[Var(Y | X_~i)] / Var(Y)
+
+S_i is the share of variance a constraint explains on its own; ST_i adds
+every interaction it takes part in. A large ST_i - S_i means the constraint
+mostly matters in combination with others (see interactions.py for which).
+ConstraintSensitivityAnalyzer answers for one profile; this answers for
+the whole space.
+
+Usage:
+    python global_sensitivity.py [--metric fit|score] [--option NAME] [--json]
+"""
+
+import argparse
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pipeline
+
+# Row label for indices over every option at once
+ALL_OPTIONS = "All options"
+
+# ============================================================================
+# SOBOL INDICES
+# ============================================================================
+
+def sobol_indices(cube: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (variance, first order, total effect) of a (n_options,) + profile-shape
+    cube: variance per option, indices per option and constraint. Indices
+    are 0 for an option whose score never changes.
+    """
+    profile_axes = tuple(range(1, cube.ndim))
+    variance = cube.var(axis=profile_axes)
+    partial_first = np.empty((cube.shape[0], len(profile_axes)))
+    partial_total = np.empty_like(partial_first)
+
+    for field, axis in enumerate(profile_axes):
+        others = tuple(a for a in profile_axes if a != axis)
+        # Var of the conditional means / mean of the conditional variances
+        partial_first[:, field] = cube.mean(axis=others).var(axis=1)
+        partial_total[:, field] = cube.var(axis=axis).mean(axis=tuple(range(1, cube.ndim - 1)))
+
+    scale = np.divide(1.0, variance, out=np.zeros_like(variance), where=variance > 0)[:, None]
+    return variance, partial_first * scale, partial_total * scale
+
+
+class GlobalSensitivityAnalyzer:
+    """Sobol indices of every option over a profile cube"""
+
+    def __init__(self, option_names: List[str], cube: np.ndarray):
+        self.option_names = list(option_names)
+        self.fields = list(pipeline.PROFILE_FIELDS)
+        self.variance, self.first_order, self.total_effect = sobol_indices(cube)
+
+        # Across options: each option's indices weighted by its variance,
+        # i.e. the share of all fit variation in the portfolio
+        weights = self.variance / self.variance.sum() if self.variance.sum() > 0 else self.variance
+        self.overall_first_order = weights @ self.first_order
+        self.overall_total_effect = weights @ self.total_effect
+
+    def indices(self, option: Optional[str] = None) -> List[Dict]:
+        """
+        One row per constraint, strongest total effect first: first_order,
+        total_effect and interactions (their difference). option=None (or
+        ALL_OPTIONS) ranks constraints across every option.
+        """
+        if option in (None, ALL_OPTIONS):
+            first, total = self.overall_first_order, self.overall_total_effect
+        else:
+            o = self.option_names.index(option)
+            first, total = self.first_order[o], self.total_effect[o]
+
+        rows = [
+            {
+                "constraint": field,
+                "first_order": float(first[i]),
+                "total_effect": float(total[i]),
+                "interactions": float(max(total[i] - first[i], 0.0))
+            }
+            for i, field in enumerate(self.fields)
+        ]
+        return sorted(rows, key=lambda row: -row["total_effect"])
+
+    def inert(self) -> List[str]:
+        """Options whose score is the same for every profile (indices undefined)"""
+        return [name for name, variance in zip(self.option_names, self.variance) if variance == 0]
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    from interactions import METRICS, default_cube
+
+    parser = argparse.ArgumentParser(description="Sobol indices of fit over the whole profile space")
+    parser.add_argument("--metric", choices=METRICS, default="fit")
+    parser.add_argument("--option", help=f"One option (default: every option, then {ALL_OPTIONS!r})")
+    parser.add_argument("--json", action="store_true", help="Print indices as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    names, cube = default_cube(args.metric)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyzer = GlobalSensitivityAnalyzer(names, cube)
+    elapsed = time.perf_counter() - start
+
+    targets = [args.option] if args.option else analyzer.option_names + [ALL_OPTIONS]
+    results = {target: analyzer.indices(target) for target in targets}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.metric} cube built in {built:.2f}s; indices in {elapsed * 1000:.2f} ms")
+    for target, rows in results.items():
+        print(f"\n{target}")
+        print(f"    {'constraint':<22}{'first order':>12}{'total':>9}")
+        for row in rows:
+            print(f"    {row['constraint']:<22}{row['first_order']:>12.3f}{row['total_effect']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Decision history for The Referee
+- Local SQLite store of saved analyses: profile (extended constraints
+  included), scenario, catalog and rule versions, fit results, team and note
+- Indexed by time, team and each profile field
+- Bulk inserts in one transaction; aggregate queries run in SQL
+
+Usage:
+    python history.py stats [--days 90] [--by team]
+    python history.py bench 300000
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+import pipeline
+from constraints import EXTENDED_DEFAULTS
+
+HISTORY_PATH_ENV = "REFEREE_HISTORY"
+DEFAULT_PATH = "referee_history.db"
+
+SCHEMA_VERSION = 2
+QUARTER_DAYS = 91
+
+# Extended constraint columns (added in v2); a core profile stores the defaults
+EXTENDED_COLUMNS = list(EXTENDED_DEFAULTS)
+
+# Columns an aggregate may be grouped by; each has a covering time-window index
+GROUP_COLUMNS = ["team", "scenario"] + pipeline.PROFILE_KEYS + EXTENDED_COLUMNS
+
+# Fit results are interned: each distinct {option: fit_level} combination is
+# stored once in fit_sets and analyses reference it by id. Aggregates then
+# group whole analyses by (group, fit_set) straight from a covering
+# (created_at, group, fit_set) index and expand the few distinct combinations
+# in Python - no per-option rows to join.
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS fit_sets (
+    id INTEGER PRIMARY KEY,
+    fits TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    team TEXT NOT NULL DEFAULT '',
+    note TEXT NOT NULL DEFAULT '',
+    profile_index INTEGER NOT NULL,
+    {", ".join(f"{key} TEXT NOT NULL" for key in pipeline.PROFILE_KEYS)},
+    {", ".join(f"{field} TEXT NOT NULL DEFAULT '{EXTENDED_DEFAULTS[field].value}'" for field in EXTENDED_COLUMNS)},
+    scenario TEXT NOT NULL DEFAULT '',
+    catalog_version TEXT NOT NULL,
+    rules_version TEXT NOT NULL,
+    fit_set INTEGER NOT NULL REFERENCES fit_sets (id)
+);
+"""
+
+# v1 stored core fields only; its analyses read back with default extended values
+_MIGRATE_V1 = "DROP INDEX IF EXISTS analyses_profile;" + "".join(
+    f"ALTER TABLE analyses ADD COLUMN {field} TEXT NOT NULL DEFAULT '{EXTENDED_DEFAULTS[field].value}';"
+    for field in EXTENDED_COLUMNS
+)
+
+_INDEXES = f"""
+CREATE INDEX IF NOT EXISTS analyses_team ON analyses (team, created_at);
+CREATE INDEX IF NOT EXISTS analyses_profile ON analyses (profile_index, {", ".join(EXTENDED_COLUMNS)}, created_at);
+{"".join(f"CREATE INDEX IF NOT EXISTS analyses_window_{column} ON analyses (created_at, {column}, fit_set);" for column in GROUP_COLUMNS)}
+"""
+
+_COLUMNS = ["created_at", "team", "note", "profile_index"] + pipeline.PROFILE_KEYS + EXTENDED_COLUMNS + [
+    "scenario", "catalog_version", "rules_version", "fit_set"
+]
+_INSERT = f"INSERT INTO analyses ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+
+
+def _versions() -> Tuple[str, str]:
+    """Catalog and rule versions the current engine sources produce"""
+    return pipeline.catalog_version(), pipeline.rules_version()
+
+
+def _extended(row: Dict) -> Dict[str, str]:
+    """Non-default extended constraints of a stored row, like Constraints.extended_dict()"""
+    return {field: row[field] for field in EXTENDED_COLUMNS if row[field] != EXTENDED_DEFAULTS[field].value}
+
+# ============================================================================
+# DECISION HISTORY
+# ============================================================================
+
+class DecisionHistory:
+    """
+    SQLite-backed history of saved analyses. Each call opens its own
+    connection, so one instance can be shared across Streamlit sessions.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get(HISTORY_PATH_ENV, DEFAULT_PATH)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode = WAL")
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, 1, SCHEMA_VERSION):
+                raise ValueError(f"{self.path} has history schema v{version}, expected v{SCHEMA_VERSION}")
+            db.executescript(_SCHEMA)
+            if version == 1:
+                db.executescript(_MIGRATE_V1)
+            db.executescript(_INDEXES)
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:  # Commits on success, rolls back on error
+                yield db
+        finally:
+            db.close()
+
+    def record(self, constraints, fits: Dict[str, tuple], scenario: Optional[str] = None,
+               team: str = "", note: str = "", created_at: Optional[float] = None) -> int:
+        """Saves one analysis; fits maps option -> (fit_level, ...). Returns its id."""
+        with self._connect() as db:
+            row = self._row(db, _versions(), {}, {
+                "constraints": constraints, "fits": fits, "scenario": scenario,
+                "team": team, "note": note, "created_at": created_at
+            })
+            return db.execute(_INSERT, row).lastrowid
+
+    def record_many(self, records: Iterable[Dict]) -> int:
+        """
+        Bulk insert in a single transaction. Each record has constraints
+        (Constraints or its to_dict()), fits, and optionally scenario, team,
+        note and created_at (Unix seconds, default now). Returns the count.
+        """
+        versions, fit_sets = _versions(), {}
+        with self._connect() as db:
+            rows = (self._row(db, versions, fit_sets, record) for record in records)
+            return db.executemany(_INSERT, rows).rowcount
+
+    @staticmethod
+    def _row(db: sqlite3.Connection, versions: Tuple[str, str], fit_sets: Dict[str, int], record: Dict) -> List:
+        constraints = record["constraints"]
+        if isinstance(constraints, dict):
+            constraints = pipeline.profile_from_dict(constraints)
+        fits = json.dumps({
+            option: fit[0] if isinstance(fit, (tuple, list)) else fit
+            for option, fit in record["fits"].items()
+        })
+        if fits not in fit_sets:
+            db.execute("INSERT OR IGNORE INTO fit_sets (fits) VALUES (?)", (fits,))
+            fit_sets[fits] = db.execute("SELECT id FROM fit_sets WHERE fits = ?", (fits,)).fetchone()[0]
+        return [
+            record.get("created_at") or time.time(), record.get("team") or "", record.get("note") or "",
+            pipeline.profile_index(constraints), *constraints.to_dict().values(),
+            *(getattr(constraints, field).value for field in EXTENDED_COLUMNS),
+            record.get("scenario") or "", *versions, fit_sets[fits]
+        ]
+
+    def update_note(self, analysis_id: int, note: str) -> None:
+        with self._connect() as db:
+            db.execute("UPDATE analyses SET note = ? WHERE id = ?", (note, analysis_id))
+
+    def recent(self, limit: int = 20, team: Optional[str] = None) -> List[Dict]:
+        """Latest analyses, newest first; extended holds the non-default extended constraints"""
+        where, params = ("WHERE team = ?", [team]) if team else ("", [])
+        with self._connect() as db:
+            rows = [dict(row) for row in db.execute(
+                f"""SELECT a.*, s.fits FROM analyses a JOIN fit_sets s ON s.id = a.fit_set
+                    {where} ORDER BY created_at DESC LIMIT ?""", params + [limit]
+            )]
+        for row in rows:
+            row["fits"] = json.loads(row["fits"])
+            row["extended"] = _extended(row)
+        return rows
+
+    def fit_distribution(self, group_by: str = "team", since: Optional[float] = None,
+                         until: Optional[float] = None) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """
+        Fit-level counts per group per option in a time window:
+        {group value: {option: {fit_level: count}}}, e.g. by team over the
+        last quarter with since=time.time() - QUARTER_DAYS * 86400.
+        """
+        if group_by not in GROUP_COLUMNS:
+            raise ValueError(f"Cannot group by {group_by!r} (expected one of {GROUP_COLUMNS})")
+
+        query = f"""
+            SELECT {group_by}, fit_set, count(*) FROM analyses INDEXED BY analyses_window_{group_by}
+            WHERE created_at >= ? AND created_at < ?
+            GROUP BY {group_by}, fit_set
+        """
+        since = since if since is not None else 0.0
+        until = until if until is not None else float("inf")
+
+        distribution: Dict[str, Dict[str, Dict[str, int]]] = {}
+        with self._connect() as db:
+            counts = db.execute(query, (since, until)).fetchall()
+            fit_sets = {
+                fit_set: json.loads(fits)
+                for fit_set, fits in db.execute("SELECT id, fits FROM fit_sets")
+            }
+        for group, fit_set, n in counts:
+            options = distribution.setdefault(group, {})
+            for option, fit_level in fit_sets[fit_set].items():
+                levels = options.setdefault(option, {})
+                levels[fit_level] = levels.get(fit_level, 0) + n
+        return distribution
+
+    def profile_counts(self, since: Optional[float] = None, limit: int = 10) -> List[Dict]:
+        """Most frequently analyzed profiles (extended constraints included) in a time window"""
+        columns = ", ".join(pipeline.PROFILE_KEYS + EXTENDED_COLUMNS)
+        with self._connect() as db:
+            rows = [dict(row) for row in db.execute(
+                f"""SELECT {columns}, count(*) AS analyses
+                    FROM analyses WHERE created_at >= ?
+                    GROUP BY profile_index, {", ".join(EXTENDED_COLUMNS)} ORDER BY analyses DESC LIMIT ?""",
+                (since or 0.0, limit)
+            )]
+        for row in rows:
+            row["extended"] = _extended(row)
+        return rows
+
+    def count(self) -> int:
+        with self._connect() as db:
+            return db.execute("SELECT count(*) FROM analyses").fetchone()[0]
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _synthetic_records(n: int, days: int = 365, teams: int = 40) -> Iterable[Dict]:
+    """Random analyses spread over the past year, with fits from the real engine"""
+    from advanced_analysis import ConstraintFitAssessor
+    from options import get_database_options
+
+    profiles = list(pipeline.iter_profiles())
+    names = list(get_database_options())
+    fits = {
+        i: {name: ConstraintFitAssessor(c).assess_fit(name)[0] for name in names}
+        for i, c in enumerate(profiles)
+    }
+    now = time.time()
+    for _ in range(n):
+        i = random.randrange(len(profiles))
+        yield {
+            "constraints": profiles[i],
+            "fits": fits[i],
+            "scenario": random.choice([None] + list(pipeline.SCENARIOS.values())),
+            "team": f"team-{random.randrange(teams):02d}",
+            "created_at": now - random.random() * days * 86400
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or benchmark the decision history")
+    parser.add_argument("--db", help=f"History database (default: ${HISTORY_PATH_ENV} or {DEFAULT_PATH})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stats = subparsers.add_parser("stats", help="Fit-level distribution over a time window")
+    stats.add_argument("--days", type=float, default=QUARTER_DAYS)
+    stats.add_argument("--by", default="team", choices=GROUP_COLUMNS)
+    bench = subparsers.add_parser("bench", help="Bulk-insert synthetic analyses and time the queries")
+    bench.add_argument("records", type=int)
+    args = parser.parse_args()
+
+    history = DecisionHistory(args.db)
+
+    if args.command == "bench":
+        start = time.perf_counter()
+        history.record_many(_synthetic_records(args.records))
+        print(f"Inserted {args.records:,} analyses in {time.perf_counter() - start:.2f}s "
+              f"({history.count():,} stored)")
+        since = time.time() - QUARTER_DAYS * 86400
+        for label, query in (
+            ("fit distribution by team, last quarter", lambda: history.fit_distribution("team", since)),
+            ("fit distribution by scale, last quarter", lambda: history.fit_distribution("scale", since)),
+            ("top profiles, last quarter", lambda: history.profile_counts(since)),
+            ("20 most recent for one team", lambda: history.recent(20, "team-07"))
+        ):
+            start = time.perf_counter()
+            query()
+            print(f"{label}: {(time.perf_counter() - start) * 1000:.1f} ms")
+        return
+
+    distribution = history.fit_distribution(args.by, time.time() - args.days * 86400)
+    for group, options in sorted(distribution.items()):
+        print(f"{args.by} = {group or '(none)'}")
+        for option, levels in options.items():
+            counts = ", ".join(f"{level} {n}" for level, n in sorted(levels.items()))
+            print(f"    {option}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
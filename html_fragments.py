@@ -0,0 +1,240 @@
+"""
+HTML fragments for The Referee UI
+- Option cards, fit badges, sensitivity cards, comparison alerts, scenario
+  and architecture cards, rendered from templates compiled once at import
+- Every fragment is memoized on its data inputs: a profile seen before
+  (or an option whose card didn't change) costs a dictionary lookup
+- Blocks combine fragments so a page section is a single Streamlit write
+
+Inputs are frozen into tuples for the cache key; the public functions take
+the pipeline's own structures (fits, evaluations, sensitivities, ...).
+"""
+
+import html
+from functools import lru_cache
+from string import Template
+from typing import Dict, List, Tuple
+
+# Rendered fragments kept per kind - a few hundred profiles' worth
+FRAGMENT_CACHE_SIZE = 4096
+
+FIT_BADGES = {
+    "strong_fit": '<span class="fit-badge-strong">🟢 Strong Fit</span>',
+    "moderate_fit": '<span class="fit-badge-moderate">🟡 Moderate Fit</span>',
+    "risky_fit": '<span class="fit-badge-risky">🔴 Risky Fit</span>'
+}
+
+IMPACT_COLORS = {
+    "HIGH": "rgba(244, 151, 142, 0.7)",
+    "MEDIUM": "rgba(249, 199, 79, 0.7)",
+    "LOW": "rgba(163, 201, 168, 0.7)"
+}
+
+# Catalog fields shown on an option card, in display order
+CARD_FIELDS = ("description", "type", "scaling_model", "pricing_model", "consistency", "setup_time", "base_complexity")
+
+EVALUATION_SECTIONS = (
+    ("strengths", "✅ Strengths"),
+    ("hidden_costs", "💸 Hidden Costs"),
+    ("limitations", "⚠️ Limitations"),
+    ("avoid_when", "❌ When NOT to Choose")
+)
+
+# ============================================================================
+# TEMPLATES
+# ============================================================================
+
+_FIT_OVERVIEW_ITEM = Template('<div style="margin: 0.3rem 1rem 0.3rem 0;"><strong>$name</strong><br>$badge</div>')
+_FIT_OVERVIEW = Template('<div class="glass-card" style="display: flex; flex-wrap: wrap;">$items</div><br>')
+
+_CONTEXT_WARNING = Template('<div class="glass-alert-warning"><strong>⚠️ Context Switch Warning:</strong> $warning</div>')
+_SECTION = Template("<p><strong>$title</strong></p><ul>$items</ul>")
+_TRADE_OFFS = Template(
+    '<div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem;">'
+    "<div>$strengths$hidden_costs</div><div>$limitations$avoid_when</div>"
+    "</div>"
+)
+_TRADE_OFFS_PENDING = '<p style="color: #8E8D8A;"><em>Evaluating trade-offs...</em></p>'
+_OPTION_CARD = Template(
+    '<div class="glass-card">'
+    '<h3 style="color: #6A5D7B !important;">$name</h3>'
+    '<div style="margin: 1rem 0;">$badge</div>'
+    '<p style="color: #666; font-size: 1.1rem; margin: 1rem 0;"><em>$reasoning</em></p>'
+    "$warning"
+    "<p><em>$description</em></p>"
+    '<div style="display: grid; grid-template-columns: 1fr 1fr; gap: 0 1rem; color: #8E8D8A; font-size: 0.9rem;">'
+    "<div><strong>Type:</strong> $type</div><div><strong>Scaling:</strong> $scaling_model</div>"
+    "<div><strong>Pricing:</strong> $pricing_model</div><div><strong>Consistency:</strong> $consistency</div>"
+    "<div><strong>Setup Time:</strong> $setup_time</div><div><strong>Complexity:</strong> $base_complexity</div>"
+    "</div><hr>"
+    "$trade_offs"
+    "</div>"
+)
+
+_METRIC_CARD = Template(
+    '<div class="metric-glass-card" style="background: $color;">'
+    '<div class="metric-label">$name</div>'
+    '<div class="metric-value">$impact</div>'
+    '<div class="metric-label" style="font-size: 0.8rem;">Impact</div>'
+    "</div>"
+)
+_GRID = Template('<div style="display: grid; grid-template-columns: repeat($columns, 1fr); gap: 1rem;">$items</div>')
+_INFO_ALERT = Template('<div class="glass-alert-info">$text</div>')
+_TITLED_INFO_ALERT = Template('<div class="glass-alert-info"><strong>$title:</strong> $text</div>')
+
+_RESULT_CARD = Template(
+    '<div class="glass-card">'
+    '<h4 style="color: #6A5D7B !important;">$title</h4>'
+    '<p style="color: #666;">$text</p>'
+    "</div>"
+)
+_ARCHITECTURE_CARD = Template(
+    '<div class="glass-card">'
+    '<h4 style="color: #6A5D7B !important;">$members</h4>'
+    '<p style="color: #666;"><strong>Covered by:</strong></p>'
+    '<ul style="color: #666;">$covered_by</ul>'
+    '<p style="color: #666;"><strong>Uncovered constraints:</strong> $gaps</p>'
+    "</div>"
+)
+
+
+def _title(name: str) -> str:
+    return name.replace("_", " ").title()
+
+
+# ============================================================================
+# FIT OVERVIEW + OPTION CARDS
+# ============================================================================
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _fit_overview(levels: Tuple[Tuple[str, str], ...]) -> str:
+    items = "".join(_FIT_OVERVIEW_ITEM.substitute(name=name, badge=FIT_BADGES[level]) for name, level in levels)
+    return _FIT_OVERVIEW.substitute(items=items)
+
+
+def fit_overview(fits: Dict[str, Tuple[str, str, str]]) -> str:
+    """Every option's fit badge in one row"""
+    return _fit_overview(tuple((name, fit[0]) for name, fit in fits.items()))
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _section(title: str, messages: Tuple[str, ...]) -> str:
+    items = "".join(f"<li>{html.escape(message, quote=False)}</li>" for message in messages)
+    return _SECTION.substitute(title=title, items=items)
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _option_card(name: str, card_fields: Tuple[str, ...], fit: Tuple[str, str, str],
+                 evaluation: Tuple[Tuple[str, ...], ...]) -> str:
+    fit_level, reasoning, context_warning = fit
+    if evaluation:
+        trade_offs = _TRADE_OFFS.substitute({
+            category: _section(title, messages)
+            for (category, title), messages in zip(EVALUATION_SECTIONS, evaluation)
+        })
+    else:
+        trade_offs = _TRADE_OFFS_PENDING
+    return _OPTION_CARD.substitute(
+        dict(zip(CARD_FIELDS, card_fields)),
+        name=name,
+        badge=FIT_BADGES[fit_level],
+        reasoning=reasoning,
+        warning=_CONTEXT_WARNING.substitute(warning=context_warning) if context_warning else "",
+        trade_offs=trade_offs
+    )
+
+
+def option_card(option_name: str, option_data: Dict, fit: Tuple[str, str, str], evaluation: Dict = None) -> str:
+    """One option card; without an evaluation it is a placeholder"""
+    frozen = tuple(tuple(evaluation[category]) for category, _ in EVALUATION_SECTIONS) if evaluation else ()
+    return _option_card(option_name, tuple(option_data[field] for field in CARD_FIELDS), tuple(fit), frozen)
+
+
+def option_cards(options: Dict[str, Dict], fits: Dict[str, Tuple[str, str, str]],
+                 evaluations: Dict[str, Dict]) -> str:
+    """Every evaluated card as one block, in fits order"""
+    return "".join(
+        option_card(name, options[name], fits[name], evaluations[name]) for name in fits
+    )
+
+
+# ============================================================================
+# SENSITIVITY + COMPARISONS
+# ============================================================================
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _sensitivity_cards(ranked: Tuple[Tuple[str, str], ...]) -> str:
+    cards = "".join(
+        _METRIC_CARD.substitute(color=IMPACT_COLORS[impact], name=_title(name), impact=impact)
+        for name, impact in ranked
+    )
+    return _GRID.substitute(columns=len(ranked), items=cards)
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _sensitivity_alerts(high: Tuple[Tuple[str, str], ...]) -> str:
+    return "<br>" + "".join(_TITLED_INFO_ALERT.substitute(title=_title(name), text=text) for name, text in high)
+
+
+def sensitivity_block(sorted_sensitivities: List[Tuple[str, Tuple[str, str]]], cards: int = 4) -> str:
+    """
+    Metric cards for the top constraints followed by an explanation of each
+    HIGH-impact one - sorted_sensitivities as report.sorted_sensitivities()
+    """
+    top = tuple((name, impact) for name, (impact, _) in sorted_sensitivities[:cards])
+    high = tuple((name, text) for name, (impact, text) in sorted_sensitivities if impact == "HIGH")
+    return _sensitivity_cards(top) + _sensitivity_alerts(high)
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _alerts(messages: Tuple[str, ...]) -> str:
+    return "".join(_INFO_ALERT.substitute(text=message) for message in messages)
+
+
+def comparison_alerts(comparisons: List[str]) -> str:
+    """Every direct comparison as an info alert"""
+    return _alerts(tuple(comparisons))
+
+
+# ============================================================================
+# SCENARIOS + ARCHITECTURES
+# ============================================================================
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _scenario_cards(results: Tuple[Tuple[str, str], ...]) -> str:
+    cards = "".join(_RESULT_CARD.substitute(title=name, text=text) for name, text in results)
+    return _GRID.substitute(columns=2, items=cards)
+
+
+def scenario_cards(scenario_results: Dict[str, str]) -> str:
+    """What-if results as cards in two columns"""
+    return _scenario_cards(tuple(scenario_results.items()))
+
+
+@lru_cache(maxsize=FRAGMENT_CACHE_SIZE)
+def _architecture_card(members: str, covered_by: Tuple[Tuple[str, str], ...], gaps: str) -> str:
+    return _ARCHITECTURE_CARD.substitute(
+        members=members,
+        covered_by="".join(f"<li><strong>{key}:</strong> {member}</li>" for key, member in covered_by),
+        gaps=gaps
+    )
+
+
+def architecture_card(architecture: Dict) -> str:
+    """One multi-database architecture (see architecture_search.ArchitectureSearcher)"""
+    members = " + ".join(f"{name} <em>({role})</em>" for name, role in architecture["roles"].items())
+    covered_by = tuple(
+        (_title(key), member) for key, (score, member) in architecture["coverage"].items() if score > 0
+    )
+    gaps = ", ".join(_title(key) for key in architecture["gaps"]) or "None"
+    return _architecture_card(members, covered_by, gaps)
+
+
+def cache_info() -> Dict[str, Tuple[int, int]]:
+    """(hits, misses) per fragment kind"""
+    caches = {
+        "fit_overview": _fit_overview, "option_card": _option_card, "section": _section,
+        "sensitivity_cards": _sensitivity_cards, "sensitivity_alerts": _sensitivity_alerts,
+        "alerts": _alerts, "scenario_cards": _scenario_cards, "architecture_card": _architecture_card
+    }
+    return {kind: (cache.cache_info().hits, cache.cache_info().misses) for kind, cache in caches.items()}
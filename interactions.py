@@ -0,0 +1,157 @@
+"""
+Constraint interaction analysis for The Referee
+- Sweeps the full profile space into a NumPy cube (option x one axis per constraint)
+- Two-way interaction effects for every pair of constraints and value combination
+- Interaction strength matrix and strongest interactions per option
+
+The interaction effect of values (a, b) of constraints (A, B) on an option is
+how far its mean fit with A=a and B=b sits from what the two marginal effects
+predict on their own:
+
+    mean(A=a, B=b) - mean(A=a) - mean(B=b) + mean(all)
+
+Zero means the constraints act independently; large values are the tensions
+(or synergies) the Referee Insight's hand-picked trade-offs describe.
+"""
+
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pipeline
+
+# Fit levels as numbers - higher fits better
+FIT_SCORES = {"strong_fit": 2.0, "moderate_fit": 1.0, "risky_fit": 0.0}
+
+METRICS = ("fit", "score")
+
+# ============================================================================
+# PROFILE CUBE
+# ============================================================================
+
+def cube_shape() -> Tuple[int, ...]:
+    return tuple(len(enum) for enum in pipeline.PROFILE_FIELDS.values())
+
+
+def build_cube(metric: str = "fit", options: Optional[Dict[str, Dict]] = None) -> Tuple[List[str], np.ndarray]:
+    """
+    Evaluates every profile and returns (option names, cube) where cube has
+    shape (n_options,) + cube_shape(), indexed by enum member position.
+
+    - fit: FIT_SCORES of ConstraintFitAssessor's fit level
+    - score: evaluator.score_evaluation() of the trade-off messages
+    """
+    from options import get_database_options
+    from advanced_analysis import ConstraintFitAssessor
+    from evaluator import evaluate_options, score_evaluation
+
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric {metric!r} (expected one of {METRICS})")
+
+    options = options if options is not None else get_database_options()
+    names = list(options)
+    values = np.empty((len(names), pipeline.profile_count()))
+
+    for index, constraints in enumerate(pipeline.iter_profiles()):
+        if metric == "fit":
+            assessor = ConstraintFitAssessor(constraints)
+            values[:, index] = [FIT_SCORES[assessor.assess_fit(name)[0]] for name in names]
+        else:
+            values[:, index] = [
+                score_evaluation(evaluate_options(name, options[name], constraints)) for name in names
+            ]
+
+    # iter_profiles() order is row-major over PROFILE_FIELDS, so a reshape is exact
+    return names, values.reshape((len(names),) + cube_shape())
+
+
+def fit_cube_from_store(store) -> Tuple[List[str], np.ndarray]:
+    """Fit cube read straight from a precomputed ResultStore (no analysis runs)"""
+    from result_store import FIT_LEVELS
+
+    scores = np.array([FIT_SCORES[level] for level in FIT_LEVELS])
+    cube = scores[store.records["fit_code"]].T  # (n_options, n_profiles)
+    return list(store.option_names), cube.reshape((len(store.option_names),) + cube_shape())
+
+
+@lru_cache(maxsize=8)
+def default_cube(metric: str = "fit", rules_version: Optional[str] = None) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """
+    Cube for the default catalog, built once per process - read from the
+    precomputed result file when a current one is configured. Score cubes
+    depend on the evaluator rules: pass the active rules version so a hot
+    reload builds a new cube while fit cubes stay cached.
+    """
+    store = pipeline.current_store()
+    names, cube = fit_cube_from_store(store) if metric == "fit" and store else build_cube(metric)
+    cube.setflags(write=False)
+    return tuple(names), cube
+
+
+# ============================================================================
+# INTERACTION ANALYZER
+# ============================================================================
+
+class InteractionAnalyzer:
+    """Two-way interaction effects over a profile cube"""
+
+    def __init__(self, option_names: List[str], cube: np.ndarray):
+        self.option_names = list(option_names)
+        self.cube = cube
+        self.fields = list(pipeline.PROFILE_FIELDS)
+        self.values = {
+            field: [member.value for member in enum]
+            for field, enum in pipeline.PROFILE_FIELDS.items()
+        }
+
+    def _axis(self, field: str) -> int:
+        return 1 + self.fields.index(field)
+
+    def marginal(self, field: str) -> np.ndarray:
+        """Mean per value of one constraint: (n_options, n_values)"""
+        axis = self._axis(field)
+        others = tuple(a for a in range(1, self.cube.ndim) if a != axis)
+        return self.cube.mean(axis=others)
+
+    def pair_means(self, field_a: str, field_b: str) -> np.ndarray:
+        """Mean per value combination: (n_options, n_values_a, n_values_b)"""
+        axis_a, axis_b = self._axis(field_a), self._axis(field_b)
+        others = tuple(a for a in range(1, self.cube.ndim) if a not in (axis_a, axis_b))
+        means = self.cube.mean(axis=others)
+        return means if axis_a < axis_b else means.swapaxes(1, 2)
+
+    def interaction(self, field_a: str, field_b: str) -> np.ndarray:
+        """Interaction effects: (n_options, n_values_a, n_values_b)"""
+        grand = self.cube.mean(axis=tuple(range(1, self.cube.ndim)))
+        return (
+            self.pair_means(field_a, field_b)
+            - self.marginal(field_a)[:, :, None]
+            - self.marginal(field_b)[:, None, :]
+            + grand[:, None, None]
+        )
+
+    def strength(self) -> np.ndarray:
+        """RMS interaction per constraint pair: (n_options, n_fields, n_fields), symmetric"""
+        strength = np.zeros((len(self.option_names), len(self.fields), len(self.fields)))
+        for i, j in combinations(range(len(self.fields)), 2):
+            effects = self.interaction(self.fields[i], self.fields[j])
+            strength[:, i, j] = strength[:, j, i] = np.sqrt((effects ** 2).mean(axis=(1, 2)))
+        return strength
+
+    def top_interactions(self, limit: int = 10, option: Optional[str] = None) -> List[Dict]:
+        """Strongest individual value combinations, across options or for one"""
+        options = [option] if option else self.option_names
+        found = []
+        for field_a, field_b in combinations(self.fields, 2):
+            effects = self.interaction(field_a, field_b)
+            for name in options:
+                o = self.option_names.index(name)
+                for a, value_a in enumerate(self.values[field_a]):
+                    for b, value_b in enumerate(self.values[field_b]):
+                        found.append({
+                            "option": name,
+                            "constraints": (field_a, field_b),
+                            "values": (value_a, value_b),
+                            "effect": float(effects[o, a, b])
+                        })
+        return sorted(found, key=lambda item: -abs(item["effect"]))[:limit]
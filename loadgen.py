@@ -0,0 +1,357 @@
+"""
+Synthetic load generator for The Referee
+- Replays a realistic constraint-profile mix through the headless pipeline
+- Open-loop (Poisson arrivals at a fixed rate) or closed-loop (fixed concurrency)
+- Thread or process workers
+- Reports throughput, latency percentiles, CPU and RSS over time
+- Can drive the Streamlit script itself through its AppTest harness
+
+Usage:
+    python loadgen.py --concurrency 8 --rate 20 40 80 --duration 30
+    python loadgen.py --target app --concurrency 4 --requests 200
+    python loadgen.py --profiles recorded.jsonl --executor process --json
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+import numpy as np
+from constraints import CONSTRAINT_LABELS
+import pipeline
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, "referee_tool.py")
+
+# Relative frequency of each constraint value in a typical engineering org:
+# most teams are small-to-medium, intermediate, and not latency-bound.
+PROFILE_WEIGHTS = {
+    "budget": {"low": 4, "medium": 5, "high": 1},
+    "performance_priority": {"latency": 3, "throughput": 2, "balanced": 5},
+    "scale": {"small": 5, "medium": 4, "massive": 1},
+    "team_skill": {"beginner": 3, "intermediate": 5, "expert": 2},
+    "time_to_market": {"urgent": 6, "flexible": 4},
+    "data_complexity": {"simple": 3, "moderate": 5, "complex": 2},
+    "consistency": {"eventual": 4, "strong": 6}
+}
+
+SAMPLE_INTERVAL_S = 1.0
+
+# ============================================================================
+# PROFILE MIX
+# ============================================================================
+
+class ProfileMix:
+    """Draws constraint profiles (Constraints.to_dict() form) from a weighted mix"""
+
+    def __init__(self, profiles: List[Dict[str, str]], weights: List[float], seed: Optional[int] = None):
+        self.profiles = profiles
+        self.weights = weights
+        self.random = random.Random(seed)
+
+    @classmethod
+    def from_field_weights(cls, field_weights: Dict[str, Dict[str, float]] = PROFILE_WEIGHTS,
+                           seed: Optional[int] = None) -> "ProfileMix":
+        """Every profile, weighted by the product of its field weights"""
+        profiles, weights = [], []
+        for constraints in pipeline.iter_profiles():
+            profile = constraints.to_dict()
+            weight = 1.0
+            for field, value in profile.items():
+                weight *= field_weights[field][value]
+            profiles.append(profile)
+            weights.append(weight)
+        return cls(profiles, weights, seed)
+
+    @classmethod
+    def from_file(cls, path: str, seed: Optional[int] = None) -> "ProfileMix":
+        """JSON Lines of to_dict() profiles, each with an optional "weight" """
+        profiles, weights = [], []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    profile = json.loads(line)
+                    weights.append(float(profile.pop("weight", 1.0)))
+                    profiles.append(profile)
+        return cls(profiles, weights, seed)
+
+    def draw(self) -> Dict[str, str]:
+        return self.random.choices(self.profiles, self.weights)[0]
+
+
+# ============================================================================
+# TARGETS (module-level so process workers can run them)
+# ============================================================================
+
+_worker = threading.local()
+
+
+def run_pipeline(profile: Dict[str, str]) -> float:
+    """Full headless analysis; returns service time in seconds"""
+    start = time.perf_counter()
+    pipeline.run_analysis(pipeline.profile_from_dict(profile))
+    return time.perf_counter() - start
+
+
+def run_cached_pipeline(profile: Dict[str, str]) -> float:
+    """pipeline.analyze(): served from $REFEREE_RESULTS when it is current"""
+    start = time.perf_counter()
+    pipeline.analyze(pipeline.profile_from_dict(profile))
+    return time.perf_counter() - start
+
+
+def run_app(profile: Dict[str, str]) -> float:
+    """
+    One Analyze click through the Streamlit script. Each worker keeps one
+    AppTest session, so consecutive requests are reruns of the same session.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    app = getattr(_worker, "app", None)
+    if app is None:
+        app = _worker.app = AppTest.from_file(APP_PATH, default_timeout=120)
+        app.run()
+
+    widgets = {widget.label: widget for widget in [*app.select_slider, *app.selectbox, *app.radio]}
+    for key, label in CONSTRAINT_LABELS.items():
+        widgets[label].set_value(profile[key])
+    next(button for button in app.button if "Analyze" in button.label).click().run()
+
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return time.perf_counter() - start
+
+
+TARGETS = {"pipeline": run_pipeline, "cached": run_cached_pipeline, "app": run_app}
+
+# AppTest sessions share Streamlit's runtime singleton, so app workers need a process each
+PROCESS_ONLY_TARGETS = {"app"}
+
+# ============================================================================
+# RESOURCE SAMPLING
+# ============================================================================
+
+def _process_tree_usage():
+    """(cpu_seconds, rss_bytes) for this process and its direct children"""
+    try:
+        pid = os.getpid()
+        ticks = os.sysconf("SC_CLK_TCK")
+        page = os.sysconf("SC_PAGE_SIZE")
+        cpu = rss = 0
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+            except OSError:
+                continue  # Exited while scanning
+            # fields[0] is state (stat field 3): ppid 4, utime 14, stime 15, rss 24
+            if int(entry) == pid or int(fields[1]) == pid:
+                cpu += int(fields[11]) + int(fields[12])
+                rss += int(fields[21])
+        return cpu / ticks, rss * page
+    except (OSError, ValueError, AttributeError):
+        import resource  # No /proc: own usage only, peak instead of current RSS
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_utime + usage.ru_stime, usage.ru_maxrss * 1024
+
+
+class ResourceSampler:
+    """Samples completed requests, CPU utilisation and RSS at a fixed interval"""
+
+    def __init__(self, completed: List, interval: float = SAMPLE_INTERVAL_S):
+        self.completed = completed
+        self.interval = interval
+        self.samples: List[Dict[str, float]] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="loadgen-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._start = time.perf_counter()
+        self._last = (self._start, *_process_tree_usage())
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        now = time.perf_counter()
+        cpu, rss = _process_tree_usage()
+        last_time, last_cpu, _ = self._last
+        self._last = (now, cpu, rss)
+        self.samples.append({
+            "t": round(now - self._start, 3),
+            "completed": len(self.completed),
+            "cpu_pct": round(100 * (cpu - last_cpu) / max(now - last_time, 1e-9), 1),
+            "rss_mb": round(rss / 2 ** 20, 1)
+        })
+
+
+# ============================================================================
+# LOAD GENERATOR
+# ============================================================================
+
+class LoadGenerator:
+    """
+    Sends profiles from a ProfileMix to a target at a fixed concurrency.
+
+    With a rate, arrivals are open-loop Poisson: each request is scheduled
+    in advance and its latency is measured from its scheduled time, so time
+    spent waiting for a free worker counts (no coordinated omission). Without
+    a rate, the generator is closed-loop and keeps every worker busy.
+    """
+
+    def __init__(self, mix: ProfileMix, target: str = "pipeline", concurrency: int = 4,
+                 executor: str = "thread"):
+        self.mix = mix
+        self.target = TARGETS[target]
+        self.concurrency = concurrency
+        use_processes = executor == "process" or target in PROCESS_ONLY_TARGETS
+        self.executor_type = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+
+    def run(self, rate: Optional[float] = None, duration: Optional[float] = None,
+            requests: Optional[int] = None, warmup: int = 0) -> Dict:
+        if duration is None and requests is None:
+            raise ValueError("Give a duration, a number of requests, or both")
+
+        completed: List[tuple] = []  # (latency_s, service_s) - list.append is thread-safe
+        errors: List[str] = []
+        futures = []
+        slots = threading.Semaphore(self.concurrency)
+
+        with self.executor_type(max_workers=self.concurrency) as executor:
+            for _ in range(warmup):
+                executor.submit(self.target, self.mix.draw()).result()
+
+            sampler = ResourceSampler(completed)
+            sampler.start()
+            start = time.perf_counter()
+            scheduled = start
+
+            while (requests is None or len(futures) < requests) and (duration is None or scheduled - start < duration):
+                if rate:
+                    scheduled += random.expovariate(rate)
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                else:
+                    slots.acquire()
+                    scheduled = time.perf_counter()
+                    if duration is not None and scheduled - start >= duration:
+                        break
+
+                future = executor.submit(self.target, self.mix.draw())
+                future.add_done_callback(
+                    lambda f, scheduled=scheduled: self._record(f, scheduled, completed, errors, slots)
+                )
+                futures.append(future)
+
+            # Sample before leaving the pool, while worker processes still exist.
+            # Done-callbacks can run just after wait() returns, so also wait for them.
+            wait(futures)
+            while len(completed) + len(errors) < len(futures):
+                time.sleep(0.001)
+            elapsed = time.perf_counter() - start
+            sampler.stop()
+
+        return self._report(completed, errors, elapsed, rate, sampler.samples)
+
+    def _record(self, future, scheduled: float, completed: List, errors: List, slots) -> None:
+        try:
+            service = future.result()
+            completed.append((time.perf_counter() - scheduled, service))
+        except Exception as error:
+            errors.append(f"{type(error).__name__}: {error}")
+        slots.release()
+
+    def _report(self, completed: List, errors: List, elapsed: float,
+                rate: Optional[float], samples: List[Dict]) -> Dict:
+        latencies = np.array([latency for latency, _ in completed]) * 1000
+        services = np.array([service for _, service in completed]) * 1000
+
+        def percentiles(values: np.ndarray) -> Dict[str, float]:
+            if not len(values):
+                return {}
+            points = np.percentile(values, [50, 90, 99, 99.9])
+            return {
+                "p50": round(float(points[0]), 2),
+                "p90": round(float(points[1]), 2),
+                "p99": round(float(points[2]), 2),
+                "p999": round(float(points[3]), 2),
+                "max": round(float(values.max()), 2)
+            }
+
+        return {
+            "target_rate": rate,
+            "concurrency": self.concurrency,
+            "requests": len(completed) + len(errors),
+            "errors": len(errors),
+            "error_samples": sorted(set(errors))[:5],
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(len(completed) / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": percentiles(latencies),
+            "service_ms": percentiles(services),
+            "peak_rss_mb": max((sample["rss_mb"] for sample in samples), default=0.0),
+            "mean_cpu_pct": round(float(np.mean([s["cpu_pct"] for s in samples])), 1) if samples else 0.0,
+            "timeline": samples
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a profile mix through The Referee")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="pipeline",
+                        help="pipeline: full analysis; cached: pipeline.analyze(); app: Streamlit script")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, nargs="+",
+                        help="Open-loop arrivals per second; several values run one stage each")
+    parser.add_argument("--duration", type=float, help="Seconds per stage")
+    parser.add_argument("--requests", type=int, help="Requests per stage")
+    parser.add_argument("--warmup", type=int, default=0, help="Unmeasured requests before each stage")
+    parser.add_argument("--profiles", help="JSON Lines profile mix (default: built-in weights)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true", help="Print full results (with timelines) as JSON")
+    args = parser.parse_args()
+
+    if args.duration is None and args.requests is None:
+        args.duration = 10.0
+    random.seed(args.seed)
+    mix = ProfileMix.from_file(args.profiles, args.seed) if args.profiles else ProfileMix.from_field_weights(seed=args.seed)
+    generator = LoadGenerator(mix, args.target, args.concurrency, args.executor)
+
+    results = []
+    for rate in args.rate or [None]:
+        result = generator.run(rate, args.duration, args.requests, args.warmup)
+        results.append(result)
+        if not args.json:
+            offered = f"{rate:g} rps offered" if rate else "closed loop"
+            latency = result["latency_ms"]
+            print(f"[{offered}, concurrency {args.concurrency}] "
+                  f"{result['throughput_rps']:.1f} rps, {result['errors']} errors | "
+                  f"latency p50 {latency.get('p50', 0):.1f} p99 {latency.get('p99', 0):.1f} "
+                  f"max {latency.get('max', 0):.1f} ms | "
+                  f"CPU {result['mean_cpu_pct']:.0f}% | peak RSS {result['peak_rss_mb']:.0f} MB")
+            for error in result["error_samples"]:
+                print(f"    {error}")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    # Run through the importable module so workers unpickle targets as
+    # loadgen.run_*, not __main__.run_* (AppTest replaces __main__ in workers)
+    import loadgen
+    loadgen.main()
@@ -0,0 +1,329 @@
+"""
+In-process metrics for The Referee
+- Counters, gauges and fixed-bucket histograms with labels
+- Per-thread shards: the hot path never takes a lock
+- Prometheus text exposition format, served on a local HTTP endpoint
+
+Usage:
+    REFEREE_METRICS_PORT=9464 streamlit run referee_tool.py
+    curl localhost:9464/metrics
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+METRICS_PORT_ENV = "REFEREE_METRICS_PORT"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a cached lookup (~10 us) to a cold traffic simulation (~1 s)
+LATENCY_BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+# Registered shards before finished threads are folded in on registration
+RETIRE_THRESHOLD = 64
+
+# ============================================================================
+# SHARDED STORAGE
+# ============================================================================
+
+class _Shards:
+    """
+    One dict per writer thread. A thread only ever mutates its own shard, so
+    increments need no lock; the lock is taken once per thread (to register
+    its shard) and on every scrape. Shards of finished threads are folded
+    into a retired total so short-lived script threads don't accumulate:
+    on every scrape, and whenever a registration takes the live list past
+    twice its size after the last fold (so memory stays bounded with no
+    scrapes, at amortized constant cost per thread).
+    """
+
+    def __init__(self, merge: Callable, zero: Callable):
+        self._merge = merge
+        self._zero = zero
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live: List[Tuple[threading.Thread, Dict]] = []
+        self._retired: Dict = {}
+        self._retire_at = RETIRE_THRESHOLD
+
+    def local(self) -> Dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._live.append((threading.current_thread(), shard))
+                if len(self._live) >= self._retire_at:
+                    self._retire_finished()
+                    self._retire_at = max(RETIRE_THRESHOLD, 2 * len(self._live))
+            return shard
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            self._retire_finished()
+            total = {key: self._copy(value) for key, value in self._retired.items()}
+            for _, shard in self._live:
+                self._fold(total, shard.copy())
+        return total
+
+    def _retire_finished(self) -> None:
+        """Folds shards of finished threads into the retired total (lock held)"""
+        live = []
+        for thread, shard in self._live:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._fold(self._retired, shard)
+        self._live = live
+
+    def _fold(self, total: Dict, shard: Dict) -> None:
+        for key, value in shard.items():
+            total[key] = self._merge(total.get(key, self._zero()), value)
+
+    def _copy(self, value):
+        return list(value) if isinstance(value, list) else value
+
+
+# ============================================================================
+# METRIC TYPES
+# ============================================================================
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count; inc() is lock-free"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._shards = _Shards(lambda a, b: a + b, float)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        shard = self._shards.local()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._shards.snapshot().get(self._key(labels), 0.0)
+
+    def samples(self):
+        return [
+            (f"{self.name}_total", dict(zip(self.labels, key)), value)
+            for key, value in sorted(self._shards.snapshot().items())
+        ]
+
+
+class Gauge(_Metric):
+    """Point-in-time value, either set directly or read from a callback at scrape"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = float(value)  # single assignment - atomic
+
+    def set_function(self, function: Callable[[], float], **labels) -> None:
+        self._functions[self._key(labels)] = function
+
+    def samples(self):
+        values = dict(self._values)
+        for key, function in list(self._functions.items()):
+            values[key] = float(function())
+        return [
+            (self.name, dict(zip(self.labels, key)), value)
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Fixed-bucket distribution; observe() is lock-free"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., count above the last bucket, sum]
+        self._shards = _Shards(
+            lambda a, b: [x + y for x, y in zip(a, b)],
+            lambda: [0.0] * (len(self.buckets) + 2)
+        )
+
+    def observe(self, value: float, **labels) -> None:
+        shard = self._shards.local()
+        key = self._key(labels)
+        cells = shard.get(key)
+        if cells is None:
+            cells = shard[key] = [0.0] * (len(self.buckets) + 2)
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        samples = []
+        for key, cells in sorted(self._shards.snapshot().items()):
+            labels = dict(zip(self.labels, key))
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), cells[:-1]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, cells[-1]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+# ============================================================================
+# REGISTRY AND EXPOSITION
+# ============================================================================
+
+class Registry:
+    """Named collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    label_text = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+                    name = f"{name}{{{label_text}}}"
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def start_http_server(port: int, address: str = "127.0.0.1",
+                      registry: Optional[Registry] = None) -> ThreadingHTTPServer:
+    """Serves registry.render() at /metrics from a daemon thread"""
+    registry = registry or REGISTRY
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes are frequent - keep them out of the app log
+
+    server = ThreadingHTTPServer((address, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="referee-metrics", daemon=True).start()
+    return server
+
+
+# ============================================================================
+# ANALYSIS METRICS
+# ============================================================================
+
+REGISTRY = Registry()
+
+PAGE_RUNS = REGISTRY.counter(
+    "referee_page_runs", "Streamlit script runs of the Referee page"
+)
+ANALYSES = REGISTRY.counter(
+    "referee_analyses", "Analyses served, by constraint profile", ["profile"]
+)
+OPTION_EVALUATIONS = REGISTRY.counter(
+    "referee_option_evaluations", "Option evaluations computed, by option", ["option"]
+)
+SCENARIO_RUNS = REGISTRY.counter(
+    "referee_scenario_runs", "What-if scenarios computed, by scenario", ["scenario"]
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "referee_cache_requests", "Result cache lookups, by cache and hit/miss", ["cache", "result"]
+)
+RULE_RELOADS = REGISTRY.counter(
+    "referee_rule_reloads", "Rule file reloads, by outcome", ["result"]
+)
+RULES_AGE_SECONDS = REGISTRY.gauge(
+    "referee_rules_age_seconds", "Seconds since the active rule set was loaded (NaN before the first load)"
+)
+ANALYSIS_CACHE_ENTRIES = REGISTRY.gauge(
+    "referee_analysis_cache_entries", "Completed analyses held in the in-memory LRU"
+)
+ANALYSIS_SECONDS = REGISTRY.histogram(
+    "referee_analysis_seconds", "End-to-end analysis latency, by source", ["source"]
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "referee_stage_seconds", "Analysis stage latency", ["stage"]
+)
@@ -2,6 +2,15 @@ def get_database_options():
     """
     Defines all available database options with their characteristics.
     Each option is treated as valid - no strawmen.
+    
+    cost_model holds list-price approximations in USD for cost_model.py:
+    per-instance monthly price and capacity (None = not capacity-bound),
+    storage per GB-month, request prices per million units for usage-based
+    pricing, and how much each secondary index amplifies writes and storage.
+    
+    performance_model feeds the traffic simulator: mean and coefficient of
+    variation of request service time, requests/second one node (or
+    partition) sustains and RAM per node for in-memory stores.
     """
     
     options = {
@@ -15,7 +24,26 @@ def get_database_options():
             "setup_time": "medium",
             "consistency": "strong",
             "good_for": ["complex queries", "transactions", "relational data"],
-            "challenges": ["scaling writes", "cost at scale", "schema migrations"]
+            "challenges": ["scaling writes", "cost at scale", "schema migrations"],
+            "cost_model": {
+                "instance_monthly": 380.0,
+                "min_instances": 2,
+                "instance_reads_per_sec": 8000,
+                "instance_writes_per_sec": 2000,
+                "instance_storage_gb": 16000,
+                "storage_gb_month": 0.115,
+                "read_per_million": 0.0,
+                "write_per_million": 0.0,
+                "read_unit_kb": 4,
+                "write_unit_kb": 1,
+                "index_amplification": 0.3
+            },
+            "performance_model": {
+                "service_time_ms": 5.0,
+                "service_time_cv": 1.0,
+                "node_capacity_rps": 8000,
+                "memory_gb_per_node": None
+            }
         },
         
         "DynamoDB": {
@@ -28,7 +56,26 @@ def get_database_options():
             "setup_time": "fast",
             "consistency": "eventual_or_strong",
             "good_for": ["key-value", "high throughput", "simple queries"],
-            "challenges": ["complex queries", "data modeling", "cost unpredictability"]
+            "challenges": ["complex queries", "data modeling", "cost unpredictability"],
+            "cost_model": {
+                "instance_monthly": 0.0,
+                "min_instances": 0,
+                "instance_reads_per_sec": None,
+                "instance_writes_per_sec": None,
+                "instance_storage_gb": None,
+                "storage_gb_month": 0.25,
+                "read_per_million": 0.125,
+                "write_per_million": 0.625,
+                "read_unit_kb": 4,
+                "write_unit_kb": 1,
+                "index_amplification": 1.0
+            },
+            "performance_model": {
+                "service_time_ms": 4.0,
+                "service_time_cv": 0.6,
+                "node_capacity_rps": 3000,
+                "memory_gb_per_node": None
+            }
         },
         
         "MongoDB Atlas": {
@@ -41,7 +88,26 @@ def get_database_options():
             "setup_time": "fast",
             "consistency": "tunable",
             "good_for": ["flexible schema", "nested data", "rapid development"],
-            "challenges": ["data consistency", "query optimization", "memory usage"]
+            "challenges": ["data consistency", "query optimization", "memory usage"],
+            "cost_model": {
+                "instance_monthly": 420.0,
+                "min_instances": 3,
+                "instance_reads_per_sec": 6000,
+                "instance_writes_per_sec": 3000,
+                "instance_storage_gb": 4000,
+                "storage_gb_month": 0.08,
+                "read_per_million": 0.0,
+                "write_per_million": 0.0,
+                "read_unit_kb": 4,
+                "write_unit_kb": 1,
+                "index_amplification": 0.3
+            },
+            "performance_model": {
+                "service_time_ms": 6.0,
+                "service_time_cv": 1.2,
+                "node_capacity_rps": 6000,
+                "memory_gb_per_node": None
+            }
         },
         
         "Redis (ElastiCache)": {
@@ -54,8 +120,86 @@ def get_database_options():
             "setup_time": "medium",
             "consistency": "strong",
             "good_for": ["caching", "session store", "real-time analytics"],
-            "challenges": ["data persistence", "memory costs", "not primary database"]
+            "challenges": ["data persistence", "memory costs", "not primary database"],
+            "cost_model": {
+                "instance_monthly": 235.0,
+                "min_instances": 2,
+                "instance_reads_per_sec": 100000,
+                "instance_writes_per_sec": 80000,
+                "instance_storage_gb": 13,
+                "storage_gb_month": 0.0,
+                "read_per_million": 0.0,
+                "write_per_million": 0.0,
+                "read_unit_kb": 4,
+                "write_unit_kb": 1,
+                "index_amplification": 0.0
+            },
+            "performance_model": {
+                "service_time_ms": 0.3,
+                "service_time_cv": 0.5,
+                "node_capacity_rps": 100000,
+                "memory_gb_per_node": 13
+            }
         }
     }
     
     return options
+
+
+def get_scaling_models():
+    """
+    Scaling behaviour behind each scaling_model value in the catalog.
+    Used by the traffic simulator to decide when and how fast capacity grows.
+    
+    - scale_out_at: utilisation (traffic or memory) that triggers scaling
+    - resize_delay_s: seconds from trigger until new capacity is live
+    - failover_s: seconds of zero capacity at the end of a resize
+    - step_factor: capacity multiplier per completed scaling step
+    - max_steps: scaling steps available before hitting the ceiling
+    - initial_headroom: minimum capacity as a multiple of base traffic (None = sized per node)
+    - in_memory: working set must fit in RAM across nodes
+    """
+    
+    scaling_models = {
+        "vertical": {
+            "scale_out_at": 0.8,
+            "resize_delay_s": 600,
+            "failover_s": 60,
+            "step_factor": 2.0,
+            "max_steps": 3,
+            "initial_headroom": None,
+            "in_memory": False
+        },
+        
+        "automatic": {
+            "scale_out_at": 0.5,
+            "resize_delay_s": 30,
+            "failover_s": 0,
+            "step_factor": 2.0,
+            "max_steps": 12,
+            "initial_headroom": 2.0,
+            "in_memory": False
+        },
+        
+        "horizontal": {
+            "scale_out_at": 0.7,
+            "resize_delay_s": 300,
+            "failover_s": 0,
+            "step_factor": 1.5,
+            "max_steps": 8,
+            "initial_headroom": None,
+            "in_memory": False
+        },
+        
+        "vertical_and_horizontal": {
+            "scale_out_at": 0.75,
+            "resize_delay_s": 420,
+            "failover_s": 20,
+            "step_factor": 2.0,
+            "max_steps": 4,
+            "initial_headroom": None,
+            "in_memory": True
+        }
+    }
+    
+    return scaling_models
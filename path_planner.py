@@ -0,0 +1,401 @@
+"""
+Counterfactual path planner for The Referee
+- Treats the profile space as a graph: one edge per single-field change,
+  weighted by what that change costs a team in practice (CHANGE_COSTS)
+- A* from the current profile to the cheapest profiles that meet a target
+  fit, e.g. "PostgreSQL (RDS) strong fit" or "no risky fits"
+- Fits come from the precomputed fit cube (plugin options: a fit table over
+  the core profiles, computed once per option), with extended constraints
+  applied on demand per visited profile - the planner never enumerates
+  the extended space
+
+The Context Switch Warning says when a fit degrades; a plan says what it
+takes to get it back.
+
+Usage:
+    python path_planner.py low-latency-small-beginner-urgent-complex-strong "PostgreSQL (RDS)=strong_fit"
+    python path_planner.py <profile key> no_risky [--lock team_skill] [--limit 3] [--json]
+"""
+
+import argparse
+import heapq
+import json
+import math
+import time
+from functools import lru_cache
+from itertools import count
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from advanced_analysis import ConstraintFitAssessor, extended_fit_risk
+from constraints import EXTENDED_DEFAULTS, EXTENDED_FIELDS, Constraints
+from interactions import FIT_SCORES, default_cube
+import numpy as np
+import pipeline
+
+# Every field the planner can change, core then extended, in dataclass order
+PLAN_FIELDS = {**pipeline.PROFILE_FIELDS, **EXTENDED_FIELDS}
+
+# Cost of moving a field one member towards the end / start of its enum
+# (None: not a change a team can make). Categorical fields jump to any value
+# at the first cost.
+CHANGE_COSTS = {
+    "budget": (4, 1),            # raise the budget / spend less
+    "performance": (2, 2),
+    "scale": (2, 6),             # plan for more / cap growth (e.g. shard by tenant)
+    "team_skill": (8, None),     # upskill or hire; skill isn't given back
+    "time_to_market": (1, 3),    # relax / tighten the deadline
+    "data_complexity": (1, 5),   # richer model / denormalize
+    "consistency": (1, 3),       # demand strong / accept eventual
+    "region_count": (1, 5),      # expand / serve fewer regions
+    "data_volume": (1, 6),       # grow / archive cold data
+    "read_write_ratio": (3, 3),  # add caching / batch writes
+    "compliance": (20, 20),      # effectively fixed - lock it to be sure
+    "lock_in": (10, 10)          # migrate the existing stack
+}
+
+CATEGORICAL_FIELDS = {"performance", "compliance", "lock_in"}
+
+# Plans costing more than this are not searched
+MAX_COST = 40
+
+# Alternatives costing more than this above the cheapest plan are not searched
+PLAN_SLACK = 8
+
+FIT_LEVELS = ["strong_fit", "moderate_fit", "risky_fit"]
+
+
+class Target(NamedTuple):
+    description: str
+    met: Callable[[Dict[str, str]], bool]  # {option: fit level} -> reached?
+    blocking: Optional[Tuple[str, ...]]    # options that fail the target when risky (None: every option)
+
+
+# ============================================================================
+# TARGETS
+# ============================================================================
+# A target must stay met when any fit improves - the planner's heuristic
+# relies on it
+
+def fit_target(option: str, level: str = "strong_fit") -> Target:
+    """The option reaches at least this fit level"""
+    if level not in FIT_LEVELS:
+        raise ValueError(f"Unknown fit level {level!r} (expected one of {FIT_LEVELS})")
+    accepted = set(FIT_LEVELS[:FIT_LEVELS.index(level) + 1])
+    return Target(
+        f"{option} {level.replace('_', ' ')}",
+        lambda fits: fits.get(option) in accepted,
+        (option,) if "risky_fit" not in accepted else ()
+    )
+
+
+def no_risky_target() -> Target:
+    """No option is a risky fit"""
+    return Target("no risky fits", lambda fits: "risky_fit" not in fits.values(), None)
+
+
+def parse_target(text: str) -> Target:
+    """'no_risky' or '<option>=<fit level>' (level defaults to strong_fit)"""
+    if text.strip() == "no_risky":
+        return no_risky_target()
+    option, _, level = text.partition("=")
+    return fit_target(option.strip(), level.strip() or "strong_fit")
+
+
+# ============================================================================
+# PLANNER
+# ============================================================================
+
+@lru_cache(maxsize=1)
+def fit_level_cube() -> Tuple[Tuple[str, ...], np.ndarray]:
+    """interactions.default_cube("fit") with fit level names instead of scores"""
+    names, cube = default_cube("fit")
+    levels = {score: level for level, score in FIT_SCORES.items()}
+    return names, np.vectorize(levels.get, otypes=[object])(cube)
+
+
+@lru_cache(maxsize=32)
+def core_fit_levels(option: str) -> np.ndarray:
+    """
+    Fit level of an option outside the fit cube (e.g. a loaded plugin) for
+    every core profile, shaped like one row of fit_level_cube()
+    """
+    shape = fit_level_cube()[1].shape[1:]
+    levels = np.empty(pipeline.profile_count(), dtype=object)
+    for index, constraints in enumerate(pipeline.iter_profiles()):
+        levels[index] = ConstraintFitAssessor(constraints).assess_fit(option)[0]
+    return levels.reshape(shape)
+
+
+def _shortest(sources: Dict, neighbors: Callable) -> Dict:
+    """Dijkstra from {node: cost}; neighbors(node) yields (next node, step cost)"""
+    distances = dict(sources)
+    tie = count()
+    frontier = [(cost, next(tie), node) for node, cost in sources.items()]
+    heapq.heapify(frontier)
+    while frontier:
+        cost, _, node = heapq.heappop(frontier)
+        if cost > distances[node]:
+            continue
+        for neighbor, step_cost in neighbors(node):
+            if cost + step_cost < distances.get(neighbor, math.inf):
+                distances[neighbor] = cost + step_cost
+                heapq.heappush(frontier, (cost + step_cost, next(tie), neighbor))
+    return distances
+
+
+class PathPlanner:
+    """
+    Minimum-cost constraint changes from one profile to profiles meeting a
+    target. A node is a tuple of member positions over PLAN_FIELDS.
+
+    Options outside the fit cube are assessed once per core profile; like
+    the built-in options, their fits are assumed never to improve when an
+    extended constraint is set (the heuristic relies on it).
+    """
+
+    def __init__(self, start: Constraints, options: Optional[Dict[str, Dict]] = None,
+                 locked: Iterable[str] = ()):
+        self.members = {field: list(enum) for field, enum in PLAN_FIELDS.items()}
+        self.start = tuple(self.members[field].index(getattr(start, field)) for field in PLAN_FIELDS)
+        self.core_size = len(pipeline.PROFILE_FIELDS)
+        self.default_extended = tuple(self.members[field].index(default) for field, default in EXTENDED_DEFAULTS.items())
+
+        # Unset extended fields sit at their least demanding value, so moving
+        # off them never improves a fit - only search the ones already set
+        searched = (set(pipeline.PROFILE_FIELDS) | set(start.extended_dict())) - set(locked)
+        self.fields = [(position, field) for position, field in enumerate(PLAN_FIELDS) if field in searched]
+        self.edges = {field: self._field_edges(field) for _, field in self.fields}
+
+        names, cube = fit_level_cube()
+        if options is None:
+            self.option_names, self.cube = list(names), cube
+        else:
+            self.option_names = list(options)
+            self.cube = np.stack([
+                cube[names.index(name)] if name in names else core_fit_levels(name) for name in self.option_names
+            ])
+        self.assessed = [name for name in self.option_names if name not in names]
+        self._fits: Dict[Tuple[int, ...], Dict[str, str]] = {}
+
+    def _field_edges(self, field: str) -> Dict[int, List[Tuple[int, int]]]:
+        """member position -> [(next position, cost)] for one field"""
+        up, down = CHANGE_COSTS[field]
+        positions = range(len(self.members[field]))
+        if field in CATEGORICAL_FIELDS:
+            return {p: [(q, up) for q in positions if q != p] for p in positions}
+        return {
+            p: [(q, cost) for q, cost in ((p + 1, up), (p - 1, down)) if cost is not None and 0 <= q < len(positions)]
+            for p in positions
+        }
+
+    def constraints(self, node: Tuple[int, ...]) -> Constraints:
+        return Constraints(**{field: self.members[field][p] for field, p in zip(PLAN_FIELDS, node)})
+
+    def fits(self, node: Tuple[int, ...]) -> Dict[str, str]:
+        """{option: fit level} of a node - from the fit cube, adjusted for extended constraints"""
+        fits = self._fits.get(node)
+        if fits is None:
+            fits = dict(zip(self.option_names, self.cube[(slice(None),) + node[:self.core_size]]))
+            if node[self.core_size:] != self.default_extended:
+                # Extended values only ever downgrade a built-in fit to risky;
+                # options outside the cube are asked directly
+                constraints = self.constraints(node)
+                extended = constraints.extended_dict()
+                for name in fits:
+                    if extended_fit_risk(name, extended) is not None:
+                        fits[name] = "risky_fit"
+                if self.assessed:
+                    assessor = ConstraintFitAssessor(constraints)
+                    fits.update((name, assessor.assess_fit(name)[0]) for name in self.assessed)
+            self._fits[node] = fits
+        return fits
+
+    # ------------------------------------------------------------------------
+    # Heuristic: core and extended fields change through disjoint edges, so
+    # a lower bound for each adds up. Both are shortest distances in relaxed
+    # graphs - admissible and consistent.
+    # ------------------------------------------------------------------------
+
+    def _core_distances(self, target: Target) -> Dict[Tuple[int, ...], float]:
+        """
+        Cost from each core profile to the nearest core profile meeting the
+        target, ignoring extended fields (which can only make fits worse):
+        Dijkstra backwards from every goal over the fit cube.
+        """
+        goals = {
+            core: 0 for core in np.ndindex(self.cube.shape[1:])
+            if target.met(dict(zip(self.option_names, self.cube[(slice(None),) + core])))
+        }
+        reverse: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        for position, field in self.fields:
+            if position < self.core_size:
+                for p, moves in self.edges[field].items():
+                    for q, cost in moves:
+                        reverse.setdefault((position, q), []).append((p, cost))
+
+        def predecessors(core):
+            for position in range(self.core_size):
+                for p, cost in reverse.get((position, core[position]), ()):
+                    yield core[:position] + (p,) + core[position + 1:], cost
+
+        return _shortest(goals, predecessors)
+
+    def _clearing_costs(self, target: Target) -> Dict[int, Dict[int, float]]:
+        """
+        Extended position -> {member position: cost to move the field to a
+        value that rules out none of the target's blocking options}
+        """
+        blocking = self.option_names if target.blocking is None else target.blocking
+        searched = dict(self.fields)
+        costs = {}
+        for position, field in enumerate(PLAN_FIELDS):
+            if position < self.core_size:
+                continue
+            safe = {
+                p: 0 for p, member in enumerate(self.members[field])
+                if member is EXTENDED_DEFAULTS[field]
+                or not any(extended_fit_risk(name, {field: member.value}) for name in blocking)
+            }
+            if field in searched.values():
+                reverse: Dict[int, List[Tuple[int, int]]] = {}
+                for p, moves in self.edges[field].items():
+                    for q, cost in moves:
+                        reverse.setdefault(q, []).append((p, cost))
+                costs[position] = _shortest(safe, lambda q: reverse.get(q, ()))
+            else:
+                costs[position] = safe
+        return costs
+
+    def _heuristic(self, target: Target) -> Callable[[Tuple[int, ...]], float]:
+        core_distances = self._core_distances(target)
+        clearing = self._clearing_costs(target)
+
+        def heuristic(node):
+            extended = sum(clearing[position].get(node[position], math.inf) for position in clearing)
+            return core_distances.get(node[:self.core_size], math.inf) + extended
+        return heuristic
+
+    # ------------------------------------------------------------------------
+
+    def _overshoots(self, node: Tuple[int, ...], plan_node: Tuple[int, ...]) -> bool:
+        """True when node makes every change of plan_node, at least as far"""
+        for (_, field), start, planned, other in zip(enumerate(PLAN_FIELDS), self.start, plan_node, node):
+            if planned == start:
+                continue
+            if field in CATEGORICAL_FIELDS:
+                if other != planned:
+                    return False
+            elif (other - start) * (planned - start) <= 0 or abs(other - start) < abs(planned - start):
+                return False
+        return True
+
+    def _plan(self, node: Tuple[int, ...], cost: float) -> Dict:
+        changes = []
+        for field, before, after in zip(PLAN_FIELDS, self.start, node):
+            if before == after:
+                continue
+            up, down = CHANGE_COSTS[field]
+            if field in CATEGORICAL_FIELDS:
+                step_cost = up
+            else:
+                step_cost = (after - before) * up if after > before else (before - after) * down
+            changes.append({
+                "field": field,
+                "from": self.members[field][before].value,
+                "to": self.members[field][after].value,
+                "cost": step_cost
+            })
+        return {
+            "cost": cost,
+            "changes": changes,
+            "profile": pipeline.profile_key(self.constraints(node)),
+            "fits": self.fits(node)
+        }
+
+    def plan(self, target: Target, limit: int = 3, max_cost: int = MAX_COST) -> List[Dict]:
+        """
+        Up to limit cheapest plans reaching the target, cheapest first: cost,
+        changes [{field, from, to, cost}], resulting profile key and fits.
+        Alternatives stay within PLAN_SLACK of the cheapest plan, and one
+        that makes every change of a cheaper plan (at least as far) is left
+        out. The current profile is a zero-cost plan when it already meets
+        the target.
+        """
+        heuristic = self._heuristic(target)
+        tie = count()
+        frontier = [(heuristic(self.start), 0, next(tie), self.start)]
+        best = {self.start: 0}
+        plan_nodes: List[Tuple[int, ...]] = []
+        plans: List[Dict] = []
+
+        while frontier and len(plans) < limit:
+            estimate, cost, _, node = heapq.heappop(frontier)
+            if estimate > max_cost:
+                break
+            if cost > best[node]:
+                continue
+            if target.met(self.fits(node)):
+                if not any(self._overshoots(node, plan_node) for plan_node in plan_nodes):
+                    plan_nodes.append(node)
+                    plans.append(self._plan(node, cost))
+                    max_cost = min(max_cost, plans[0]["cost"] + PLAN_SLACK)
+                continue  # going past a reached target only adds cost
+
+            for position, field in self.fields:
+                for value, step_cost in self.edges[field][node[position]]:
+                    neighbor = node[:position] + (value,) + node[position + 1:]
+                    neighbor_cost = cost + step_cost
+                    if neighbor_cost < best.get(neighbor, math.inf):
+                        estimate = neighbor_cost + heuristic(neighbor)
+                        if estimate <= max_cost:
+                            best[neighbor] = neighbor_cost
+                            heapq.heappush(frontier, (estimate, neighbor_cost, next(tie), neighbor))
+        return plans
+
+
+def describe_plan(plan: Dict) -> str:
+    """One line per plan, e.g. 'time to market urgent → flexible · team skill ... (cost 9)'"""
+    if not plan["changes"]:
+        return "Already there - no changes needed"
+    steps = " · ".join(
+        f"{change['field'].replace('_', ' ')} {change['from']} → {change['to']}" for change in plan["changes"]
+    )
+    return f"{steps} (cost {plan['cost']})"
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Cheapest constraint changes that reach a target fit")
+    parser.add_argument("profile", help="Profile key, e.g. low-latency-small-beginner-urgent-complex-strong")
+    parser.add_argument("target", help="'no_risky' or '<option>=<fit level>', e.g. 'DynamoDB=strong_fit'")
+    parser.add_argument("--lock", action="append", default=[], choices=list(PLAN_FIELDS),
+                        help="Field the plan must not change (repeatable)")
+    parser.add_argument("--limit", type=int, default=3)
+    parser.add_argument("--max-cost", type=int, default=MAX_COST)
+    parser.add_argument("--json", action="store_true", help="Print plans as JSON")
+    args = parser.parse_args()
+
+    try:
+        start, target = pipeline.profile_from_key(args.profile), parse_target(args.target)
+    except ValueError as error:
+        parser.error(str(error))
+
+    started = time.perf_counter()
+    plans = PathPlanner(start, locked=args.lock).plan(target, args.limit, args.max_cost)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(plans, indent=2))
+        return
+
+    print(f"{len(plans)} plans to {target.description} in {elapsed * 1000:.2f} ms")
+    for plan in plans:
+        print(f"\n{describe_plan(plan)}\n    → {plan['profile']}")
+    if not plans:
+        print(f"No plan within cost {args.max_cost} - unlock fields or raise --max-cost")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""
+Headless analysis pipeline for The Referee
+- Enumerates the core constraint profile space (972 profiles)
+- Runs every analysis stage without Streamlit
+- Serves precomputed results when a result file is available
+- Profiles with extended constraints (over a million combinations) are
+  never enumerated: each is analyzed on first request and memoized
+"""
+
+import hashlib
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from constraints import (
+    Constraints, Budget, Performance, Scale, TeamSkill,
+    TimeToMarket, DataComplexity, Consistency, EXTENDED_DEFAULTS, EXTENDED_FIELDS
+)
+from metrics import (
+    ANALYSES, ANALYSIS_CACHE_ENTRIES, ANALYSIS_SECONDS, CACHE_REQUESTS,
+    OPTION_EVALUATIONS, SCENARIO_RUNS, STAGE_SECONDS
+)
+
+# Constraints fields and their enums, in dataclass order
+PROFILE_FIELDS = {
+    "budget": Budget,
+    "performance": Performance,
+    "scale": Scale,
+    "team_skill": TeamSkill,
+    "time_to_market": TimeToMarket,
+    "data_complexity": DataComplexity,
+    "consistency": Consistency
+}
+
+# Constraints.to_dict() keys, in the same order
+PROFILE_KEYS = [
+    "budget", "performance_priority", "scale", "team_skill",
+    "time_to_market", "data_complexity", "consistency"
+]
+
+# Separates the extended part of a profile key: <core key>~field:value~...
+EXTENDED_KEY_SEPARATOR = "~"
+
+# UI label -> WhatIfScenarioAnalyzer scenario key
+SCENARIOS = {
+    "Traffic increases 10x": "traffic_10x",
+    "Team size doubles": "team_doubles",
+    "Budget cuts 30%": "budget_cuts",
+    "Latency becomes critical": "latency_critical"
+}
+
+# Modules whose source determines every analysis output
+ENGINE_MODULES = [
+    "options.py", "evaluator.py", "advanced_analysis.py",
+    "explainer.py", "simulator.py"
+]
+
+# Rule and message data files read by evaluator.py (see evaluator.RULES_DIR)
+ENGINE_RULES_DIR = "rules"
+
+# Engine modules that define the option catalog rather than rules
+CATALOG_MODULES = ["options.py"]
+
+RESULTS_PATH_ENV = "REFEREE_RESULTS"
+
+# Computed analyses kept in memory when no result file is available
+ANALYSIS_CACHE_SIZE = 2048
+
+# ============================================================================
+# PROFILE SPACE
+# ============================================================================
+
+def iter_profiles() -> Iterator[Constraints]:
+    """Yields every constraint profile, in profile_index order"""
+    for values in itertools.product(*PROFILE_FIELDS.values()):
+        yield Constraints(*values)
+
+
+def profile_count() -> int:
+    count = 1
+    for enum in PROFILE_FIELDS.values():
+        count *= len(enum)
+    return count
+
+
+def profile_space_size() -> int:
+    """Core profiles x every combination of extended constraint values"""
+    count = profile_count()
+    for enum in EXTENDED_FIELDS.values():
+        count *= len(enum)
+    return count
+
+
+def profile_index(constraints: Constraints) -> int:
+    """Mixed-radix position of a profile's core fields in iter_profiles() order"""
+    index = 0
+    for field, enum in PROFILE_FIELDS.items():
+        members = list(enum)
+        index = index * len(members) + members.index(getattr(constraints, field))
+    return index
+
+
+def profile_from_index(index: int) -> Constraints:
+    """Inverse of profile_index()"""
+    values = []
+    for enum in reversed(PROFILE_FIELDS.values()):
+        members = list(enum)
+        index, position = divmod(index, len(members))
+        values.append(members[position])
+    return Constraints(*reversed(values))
+
+
+def extended_values() -> List[Tuple[str, str]]:
+    """Every non-default (field, value) of the extended constraints"""
+    return [
+        (field, member.value)
+        for field, enum in EXTENDED_FIELDS.items()
+        for member in enum if member is not EXTENDED_DEFAULTS[field]
+    ]
+
+
+def sweep_count() -> int:
+    """Core profiles, then the core profiles again once per extended value"""
+    return profile_count() * (1 + len(extended_values()))
+
+
+def sweep_profile(index: int) -> Constraints:
+    """
+    Profile at a position of the one-at-a-time sweep: the first
+    profile_count() are the core profiles, each block after that sets one
+    extended value on top of them. Covers every extended rule section
+    without enumerating the combined space.
+    """
+    block, core_index = divmod(index, profile_count())
+    constraints = profile_from_index(core_index)
+    if block:
+        field, value = extended_values()[block - 1]
+        setattr(constraints, field, EXTENDED_FIELDS[field](value))
+    return constraints
+
+
+def profile_from_dict(values: Dict[str, str]) -> Constraints:
+    """Inverse of Constraints.to_dict(), plus any extended fields present"""
+    return Constraints(
+        *(enum(values[key]) for key, enum in zip(PROFILE_KEYS, PROFILE_FIELDS.values())),
+        **{field: enum(values[field]) for field, enum in EXTENDED_FIELDS.items() if field in values}
+    )
+
+
+def profile_key(constraints: Constraints, extended: bool = True) -> str:
+    """
+    Stable, human-readable identifier such as 'low-latency-small-...'.
+    Non-default extended fields follow as '~field:value' (extended=False:
+    the core key only). A core profile's key never changes.
+    """
+    key = "-".join(value for value in constraints.to_dict().values())
+    if extended:
+        key += "".join(
+            f"{EXTENDED_KEY_SEPARATOR}{field}:{value}" for field, value in constraints.extended_dict().items()
+        )
+    return key
+
+
+def profile_from_key(key: str) -> Constraints:
+    """Inverse of profile_key(); raises ValueError for malformed keys"""
+    core, *extensions = key.split(EXTENDED_KEY_SEPARATOR)
+    values = core.split("-")
+    if len(values) != len(PROFILE_KEYS):
+        raise ValueError(f"Expected {len(PROFILE_KEYS)} values in profile key {key!r}")
+
+    extended = dict(extension.partition(":")[::2] for extension in extensions)
+    unknown = set(extended) - set(EXTENDED_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown extended constraints {sorted(unknown)} in profile key {key!r}")
+    return profile_from_dict({**dict(zip(PROFILE_KEYS, values)), **extended})
+
+
+def engine_sources() -> List[str]:
+    """ENGINE_MODULES plus every rule data file"""
+    base = os.path.dirname(os.path.abspath(__file__))
+    rule_files = sorted(
+        os.path.join(ENGINE_RULES_DIR, name)
+        for name in os.listdir(os.path.join(base, ENGINE_RULES_DIR)) if name.endswith(".json")
+    )
+    return ENGINE_MODULES + rule_files
+
+
+def engine_digest(modules: Optional[List[str]] = None) -> str:
+    """Hash of the engine sources - changes whenever any rule or message changes"""
+    digest = hashlib.sha256()
+    base = os.path.dirname(os.path.abspath(__file__))
+    for module in modules or engine_sources():
+        with open(os.path.join(base, module), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def catalog_version() -> str:
+    """Short hash of the option catalog"""
+    return engine_digest(CATALOG_MODULES)[:12]
+
+
+def rules_version() -> str:
+    """Short hash of the rule modules (everything in the engine but the catalog)"""
+    return engine_digest([m for m in engine_sources() if m not in CATALOG_MODULES])[:12]
+
+
+# ============================================================================
+# ANALYSIS
+# ============================================================================
+
+def iter_analysis(constraints: Constraints, options: Optional[Dict[str, Dict]] = None,
+                  scenarios: Optional[List[str]] = None, rules=None) -> Iterator[Tuple[str, Any]]:
+    """
+    Runs the analysis stages in display order, yielding (stage, value) as
+    each one completes so callers can render progressively:
+
+    - ("fits", {option: (fit_level, reasoning, context_warning)})
+    - ("evaluation", (option, {category: [messages]})) - once per option
+    - ("sensitivities", {constraint: (impact, explanation)})
+    - ("comparisons", [statements])
+    - ("scenario", (scenario key, {option: result})) - once per scenario
+    - ("insight", Referee Insight markdown)
+    """
+    # Imported here so processes serving precomputed results never load the engine
+    from options import get_database_options
+    from evaluator import active_rules, evaluate_options
+    from advanced_analysis import (
+        ConstraintFitAssessor,
+        ConstraintSensitivityAnalyzer,
+        CrossOptionComparator,
+        WhatIfScenarioAnalyzer
+    )
+    from explainer import generate_referee_insight
+
+    catalog = options if options is not None else get_database_options()
+    scenarios = scenarios if scenarios is not None else list(SCENARIOS.values())
+    rules = rules or active_rules()  # Pinned so a hot reload never splits one analysis
+
+    # Fits are cheap and drive the badges, so they come first
+    with STAGE_SECONDS.time(stage="fit"):
+        fit_assessor = ConstraintFitAssessor(constraints)
+        fits = {option_name: fit_assessor.assess_fit(option_name) for option_name in catalog}
+    yield "fits", fits
+
+    # Stage timers never span a yield - only compute time is recorded
+    evaluations = {}
+    evaluate_seconds = 0.0
+    for option_name, option_data in catalog.items():
+        start = time.perf_counter()
+        evaluations[option_name] = evaluate_options(option_name, option_data, constraints, rules)
+        evaluate_seconds += time.perf_counter() - start
+        OPTION_EVALUATIONS.inc(option=option_name)
+        yield "evaluation", (option_name, evaluations[option_name])
+    STAGE_SECONDS.observe(evaluate_seconds, stage="evaluate")
+
+    with STAGE_SECONDS.time(stage="sensitivity"):
+        sensitivities = ConstraintSensitivityAnalyzer(constraints).analyze_sensitivity()
+    yield "sensitivities", sensitivities
+
+    with STAGE_SECONDS.time(stage="comparisons"):
+        comparisons = CrossOptionComparator(constraints).generate_comparisons()
+    yield "comparisons", comparisons
+
+    # A custom comparison set (e.g. with plugin options) gets its own scenario results
+    scenario_analyzer = WhatIfScenarioAnalyzer(constraints, options)
+    for scenario in scenarios:
+        with STAGE_SECONDS.time(stage=f"scenario:{scenario}"):
+            scenario_results = scenario_analyzer.analyze_scenario(scenario)
+        SCENARIO_RUNS.inc(scenario=scenario)
+        yield "scenario", (scenario, scenario_results)
+
+    with STAGE_SECONDS.time(stage="insight"):
+        insight = generate_referee_insight(evaluations, constraints.to_dict(), catalog)
+    yield "insight", insight
+
+
+def collect_analysis(constraints: Constraints, stages: Iterable[Tuple[str, Any]]) -> Dict:
+    """Assembles iter_analysis() stages into the run_analysis() result"""
+    result = {"constraints": {**constraints.to_dict(), **constraints.extended_dict()}, "evaluations": {}, "scenarios": {}}
+    for stage, value in stages:
+        if stage == "evaluation":
+            result["evaluations"][value[0]] = value[1]
+        elif stage == "scenario":
+            result["scenarios"][value[0]] = value[1]
+        else:
+            result[stage] = value
+    return result
+
+
+def run_analysis(constraints: Constraints, options: Optional[Dict[str, Dict]] = None,
+                 scenarios: Optional[List[str]] = None) -> Dict:
+    """
+    Runs every analysis stage for one profile, exactly as referee_tool.main()
+    does, and returns plain data:
+
+    - constraints: Constraints.to_dict() plus non-default extended fields
+    - evaluations: option -> {category: [messages]}
+    - fits: option -> (fit_level, reasoning, context_warning)
+    - sensitivities: constraint -> (impact, explanation)
+    - comparisons: [statements]
+    - scenarios: scenario key -> {option: result}
+    - insight: Referee Insight markdown
+    """
+    return collect_analysis(constraints, iter_analysis(constraints, options, scenarios))
+
+
+_store = None
+_store_rules = None
+
+
+def current_store():
+    """
+    The precomputed ResultStore named by $REFEREE_RESULTS, or None when it is
+    unset, missing or was built from different engine sources. Rechecked
+    whenever the rule files change on disk (hot reload).
+    """
+    global _store, _store_rules
+    from evaluator import rules_signature
+    path = os.environ.get(RESULTS_PATH_ENV)
+
+    signature = rules_signature()
+    if signature != _store_rules:
+        _store, _store_rules = None, signature
+
+    if path and _store is None and os.path.exists(path):
+        from result_store import ResultStore
+        store = ResultStore.open(path)
+        _store = store if store.digest == engine_digest() else False
+
+    return _store or None
+
+
+def _stored_stages(result: Dict, scenarios: Optional[List[str]]) -> Iterator[Tuple[str, Any]]:
+    """A precomputed result replayed in iter_analysis() stage order"""
+    yield "fits", result["fits"]
+    for item in result["evaluations"].items():
+        yield "evaluation", item
+    yield "sensitivities", result["sensitivities"]
+    yield "comparisons", result["comparisons"]
+    for scenario in (scenarios if scenarios is not None else result["scenarios"]):
+        yield "scenario", (scenario, result["scenarios"][scenario])
+    yield "insight", result["insight"]
+
+
+_analysis_cache: "OrderedDict[Tuple, Dict]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+ANALYSIS_CACHE_ENTRIES.set_function(lambda: len(_analysis_cache))
+
+
+def _cache_key(constraints: Constraints, scenarios: Optional[List[str]], rules,
+               options: Optional[Dict[str, Dict]] = None) -> Tuple:
+    return (
+        profile_key(constraints), None if scenarios is None else tuple(scenarios), rules.version,
+        None if options is None else tuple(options)
+    )
+
+
+def analysis_cached(constraints: Constraints, scenarios: Optional[List[str]] = None,
+                    options: Optional[Dict[str, Dict]] = None) -> bool:
+    """True when stream_analysis() can replay this analysis instead of computing it"""
+    if options is None and not constraints.extended_dict() and current_store():
+        return True
+    from evaluator import active_rules
+    return _cache_key(constraints, scenarios, active_rules(), options) in _analysis_cache
+
+
+def stream_analysis(constraints: Constraints, scenarios: Optional[List[str]] = None,
+                    options: Optional[Dict[str, Dict]] = None) -> Iterator[Tuple[str, Any]]:
+    """
+    iter_analysis(), replayed from the precomputed result file named by
+    $REFEREE_RESULTS when it exists and was built from the current engine
+    sources - otherwise from an in-memory LRU of completed analyses (keyed
+    by profile, scenarios, rule set and compared options), computing only
+    on a miss. The result file only covers the default catalog (options=None)
+    over the core profile space.
+    """
+    precomputable = options is None and not constraints.extended_dict()
+    store = current_store() if precomputable else None
+    if precomputable and os.environ.get(RESULTS_PATH_ENV):
+        CACHE_REQUESTS.inc(cache="result_store", result="hit" if store else "miss")
+
+    key = None
+    if store:
+        stages, source = _stored_stages(store.lookup(constraints), scenarios), "result_store"
+    else:
+        from evaluator import active_rules
+        rules = active_rules()
+        key = _cache_key(constraints, scenarios, rules, options)
+        with _analysis_cache_lock:
+            cached = _analysis_cache.get(key)
+            if cached is not None:
+                _analysis_cache.move_to_end(key)
+        CACHE_REQUESTS.inc(cache="analysis", result="miss" if cached is None else "hit")
+        if cached is not None:
+            stages, source = _stored_stages(cached, None), "memory"
+        else:
+            stages, source = iter_analysis(constraints, options, scenarios, rules), "computed"
+
+    # Only time spent producing stages counts, not the caller's rendering
+    elapsed = 0.0
+    completed = []
+    while True:
+        start = time.perf_counter()
+        stage = next(stages, None)
+        elapsed += time.perf_counter() - start
+        if stage is None:
+            break
+        if source == "computed":
+            completed.append(stage)
+        yield stage
+
+    # Reached only when the caller consumed every stage - abandoned
+    # (cancelled) analyses are never cached
+    if source == "computed":
+        with _analysis_cache_lock:
+            _analysis_cache[key] = collect_analysis(constraints, completed)
+            while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+                _analysis_cache.popitem(last=False)
+
+    ANALYSES.inc(profile=profile_key(constraints, extended=False))  # Bounded label cardinality
+    ANALYSIS_SECONDS.observe(elapsed, source=source)
+
+
+def analyze(constraints: Constraints, options: Optional[Dict[str, Dict]] = None) -> Dict:
+    """Same result as run_analysis(), served like stream_analysis()"""
+    return collect_analysis(constraints, stream_analysis(constraints, options=options))
@@ -0,0 +1,261 @@
+"""
+Option plugins for The Referee
+- An OptionProvider supplies one database option: catalog metadata,
+  trade-off rules, fit logic and what-if scenario responses
+- Providers are discovered from the "referee.options" entry point group and
+  a local plugins directory without importing them
+- A provider is imported only when its option joins the comparison set
+
+Local plugins are modules in $REFEREE_PLUGINS (default: plugins/) that
+declare a string literal OPTION and an OptionProvider subclass named
+Provider. Installed packages register "<option name> = module:Provider"
+under the entry point group instead.
+
+Usage:
+    python plugins.py            # list discovered plugins
+    python plugins.py --check    # also load and validate each one
+"""
+
+import argparse
+import ast
+import importlib.util
+import os
+import sys
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+ENTRY_POINT_GROUP = "referee.options"
+PLUGINS_DIR_ENV = "REFEREE_PLUGINS"
+DEFAULT_PLUGINS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plugins")
+
+
+class PluginError(ValueError):
+    """A plugin that could not be discovered, imported or validated"""
+
+
+# ============================================================================
+# PROVIDER INTERFACE
+# ============================================================================
+
+class OptionProvider:
+    """
+    One pluggable database option. Subclasses set name and implement
+    metadata() and assess_fit(); rules() and scenario_response() are optional.
+    """
+
+    name = ""
+
+    def metadata(self) -> Dict:
+        """Catalog entry with the same fields as options.get_database_options()"""
+        raise NotImplementedError
+
+    def rules(self) -> Dict[str, List[Dict]]:
+        """
+        Trade-off rules per section ({"budget": [rule, ...], "general": [...]})
+        in the rules/*.json format; they only ever match this option. The
+        built-in rules also apply, through the option's data fields.
+        """
+        return {}
+
+    def assess_fit(self, constraints) -> Tuple[str, str, str]:
+        """(fit_level, reasoning, context_warning), as ConstraintFitAssessor.assess_fit()"""
+        raise NotImplementedError
+
+    def scenario_response(self, scenario: str, constraints) -> Optional[str]:
+        """
+        What-if result for a scenario key (see pipeline.SCENARIOS), or None.
+        traffic_10x is simulated from the metadata when this returns None.
+        """
+        return None
+
+
+# ============================================================================
+# DISCOVERY
+# ============================================================================
+
+class PluginSpec(NamedTuple):
+    option: str
+    origin: str  # "entry point" or the module path
+    target: str  # "module:attr" for entry points, the class name for modules
+
+
+def _declared_option(path: str) -> Optional[str]:
+    """The module's OPTION string literal, read without importing it"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and node.targets[0].id == "OPTION"
+                and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)):
+            return node.value.value
+    return None
+
+
+def _scan_directory(directory: str) -> Dict[str, PluginSpec]:
+    specs = {}
+    if not os.path.isdir(directory):
+        return specs
+    for entry in sorted(os.listdir(directory)):
+        if not entry.endswith(".py") or entry.startswith("_"):
+            continue
+        path = os.path.join(directory, entry)
+        option = _declared_option(path)
+        if option:
+            specs[option] = PluginSpec(option, path, "Provider")
+    return specs
+
+
+def _scan_entry_points() -> Dict[str, PluginSpec]:
+    from importlib.metadata import entry_points
+    return {
+        entry_point.name: PluginSpec(entry_point.name, "entry point", entry_point.value)
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP)
+    }
+
+
+_available: Optional[Dict[str, PluginSpec]] = None
+_providers: Dict[str, OptionProvider] = {}
+_metadata: Dict[str, Dict] = {}
+_lock = threading.Lock()
+
+
+def available_options(refresh: bool = False) -> Dict[str, PluginSpec]:
+    """
+    Plugin options by name, discovered once per process. Local modules
+    override installed entry points of the same name; names already in the
+    built-in catalog are ignored.
+    """
+    global _available
+    if _available is None or refresh:
+        from options import get_database_options
+        directory = os.environ.get(PLUGINS_DIR_ENV, DEFAULT_PLUGINS_DIR)
+        specs = {**_scan_entry_points(), **_scan_directory(directory)}
+        builtin = get_database_options()
+        _available = {name: spec for name, spec in specs.items() if name not in builtin}
+    return _available
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def _import_provider(spec: PluginSpec) -> OptionProvider:
+    if spec.origin == "entry point":
+        from importlib.metadata import EntryPoint
+        factory = EntryPoint(spec.option, spec.target, ENTRY_POINT_GROUP).load()
+    else:
+        module_name = "referee_plugin_" + os.path.splitext(os.path.basename(spec.origin))[0]
+        module_spec = importlib.util.spec_from_file_location(module_name, spec.origin)
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+        factory = getattr(module, spec.target, None)
+        if factory is None:
+            raise PluginError(f"{spec.origin}: no {spec.target} class")
+    return factory()
+
+
+def _validate_metadata(option: str, metadata: Dict) -> None:
+    """Checks a catalog entry against the fields of a built-in one"""
+    from options import get_database_options, get_scaling_models
+    reference = next(iter(get_database_options().values()))
+
+    missing = [field for field in reference if field not in metadata]
+    for field in ("cost_model", "performance_model"):
+        if isinstance(metadata.get(field), dict):
+            missing += [f"{field}.{key}" for key in reference[field] if key not in metadata[field]]
+    if missing:
+        raise PluginError(f"{option}: metadata is missing {missing}")
+    if metadata["scaling_model"] not in get_scaling_models():
+        raise PluginError(f"{option}: unknown scaling_model {metadata['scaling_model']!r}")
+
+
+def load_provider(option: str) -> OptionProvider:
+    """
+    Imports, validates and registers the provider of one plugin option (once
+    per process). Raises PluginError when it is unknown or invalid.
+    """
+    provider = _providers.get(option)
+    if provider is not None:
+        return provider
+
+    from evaluator import RuleError, compile_option_rules, register_option_rules
+    with _lock:
+        if option in _providers:
+            return _providers[option]
+        spec = available_options().get(option)
+        if spec is None:
+            raise PluginError(f"No plugin provides {option!r}")
+        try:
+            provider = _import_provider(spec)
+        except PluginError:
+            raise
+        except Exception as error:
+            raise PluginError(f"{option}: failed to load from {spec.origin} ({error})") from error
+
+        if not isinstance(provider, OptionProvider):
+            raise PluginError(f"{option}: {spec.target} is not an OptionProvider")
+        provider.name = option
+        metadata = dict(provider.metadata())
+        _validate_metadata(option, metadata)
+        try:
+            sections = compile_option_rules(option, provider.rules())
+        except RuleError as error:
+            raise PluginError(str(error)) from None
+
+        register_option_rules(option, sections)
+        _metadata[option] = metadata
+        _providers[option] = provider
+    return provider
+
+
+def loaded_provider(option: str) -> Optional[OptionProvider]:
+    """The provider of a plugin option that is already loaded - never imports"""
+    return _providers.get(option)
+
+
+def comparison_options(plugin_options: Iterable[str] = ()) -> Dict[str, Dict]:
+    """
+    The built-in catalog plus the named plugin options, loading only those
+    providers. Pass the result as options= to the pipeline.
+    """
+    from options import get_database_options
+    options = get_database_options()
+    for option in plugin_options:
+        load_provider(option)
+        options[option] = _metadata[option]
+    return options
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="List (and validate) option plugins")
+    parser.add_argument("--check", action="store_true", help="Load every plugin and validate it")
+    args = parser.parse_args()
+
+    # Providers subclass plugins.OptionProvider - use that module, not __main__
+    import plugins
+
+    specs = plugins.available_options()
+    if not specs:
+        print(f"No plugins found (entry point group {ENTRY_POINT_GROUP!r}, "
+              f"directory {os.environ.get(PLUGINS_DIR_ENV, DEFAULT_PLUGINS_DIR)})")
+        return
+
+    failed = 0
+    for option, spec in specs.items():
+        status = ""
+        if args.check:
+            try:
+                plugins.load_provider(option)
+                status = " - ok"
+            except plugins.PluginError as error:
+                status, failed = f" - {error}", failed + 1
+        print(f"{option}: {spec.origin} ({spec.target}){status}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
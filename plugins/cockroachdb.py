@@ -0,0 +1,113 @@
+"""
+Example option plugin: CockroachDB Serverless
+
+Discovered through its OPTION literal and imported only when the option is
+added to the comparison set. Copy this file to add your own option.
+"""
+
+from plugins import OptionProvider
+
+OPTION = "CockroachDB Serverless"
+
+
+class Provider(OptionProvider):
+
+    def metadata(self):
+        return {
+            "description": "Distributed SQL database with serializable transactions",
+            "type": "relational",
+            "managed": True,
+            "base_complexity": "intermediate",
+            "pricing_model": "usage_based",
+            "scaling_model": "automatic",
+            "setup_time": "fast",
+            "consistency": "strong",
+            "good_for": ["distributed transactions", "multi-region", "relational data"],
+            "challenges": ["write latency", "hot ranges", "feature gaps vs PostgreSQL"],
+            "cost_model": {
+                "instance_monthly": 0.0,
+                "min_instances": 0,
+                "instance_reads_per_sec": None,
+                "instance_writes_per_sec": None,
+                "instance_storage_gb": None,
+                "storage_gb_month": 0.5,
+                "read_per_million": 0.2,
+                "write_per_million": 1.0,
+                "read_unit_kb": 4,
+                "write_unit_kb": 1,
+                "index_amplification": 0.5
+            },
+            "performance_model": {
+                "service_time_ms": 8.0,
+                "service_time_cv": 0.8,
+                "node_capacity_rps": 4000,
+                "memory_gb_per_node": None
+            }
+        }
+
+    def rules(self):
+        return {
+            "performance_priority": [
+                {"value": "latency", "add": {"limitations": [
+                    "Consensus replication adds write latency - expect more than single-node PostgreSQL"
+                ]}}
+            ],
+            "scale": [
+                {"value": "massive", "add": {"strengths": [
+                    "Ranges split and rebalance automatically - SQL without manual sharding"
+                ]}}
+            ],
+            "data_complexity": [
+                {"value": "complex", "add": {"limitations": [
+                    "PostgreSQL-compatible, but some extensions and features are unsupported"
+                ]}}
+            ],
+            "consistency": [
+                {"value": "strong", "add": {"strengths": [
+                    "Serializable isolation by default, even across regions"
+                ]}}
+            ],
+            "general": [
+                {"add": {
+                    "hidden_costs": ["Full table scans burn request units quickly - index your access paths"],
+                    "avoid_when": ["Workloads hammer a few hot keys (sequential IDs, counters)"]
+                }}
+            ]
+        }
+
+    def assess_fit(self, constraints):
+        c = constraints.to_dict()
+
+        if (c["consistency"] == "strong" and c["scale"] in ["medium", "massive"] and
+                c["team_skill"] in ["intermediate", "expert"]):
+            return (
+                "strong_fit",
+                "Relational model and strong consistency that scale out without sharding",
+                "Fit degrades if write latency becomes the top priority"
+            )
+
+        if c["performance_priority"] == "latency" or c["team_skill"] == "beginner":
+            return (
+                "risky_fit",
+                "Distributed transactions add latency and new failure modes to reason about",
+                "Hot keys and contention retries need experience to diagnose"
+            )
+
+        return (
+            "moderate_fit",
+            "PostgreSQL-style SQL with automatic scaling and pay-per-use pricing",
+            "Watch request-unit costs for scan-heavy queries"
+        )
+
+    def scenario_response(self, scenario, constraints):
+        return {
+            "team_doubles":
+                "✅ **Better** - More engineers to tune schemas and indexes for distribution; "
+                "no sharding layer to operate.",
+            "budget_cuts":
+                "✅ **Flexible** - Usage-based pricing scales down with traffic; spend limits "
+                "cap the monthly bill.",
+            "latency_critical":
+                "❌ **Struggles** - Consensus writes typically take 10ms+ across zones. Would "
+                "need a caching layer for hot reads."
+        }.get(scenario)
@@ -0,0 +1,213 @@
+"""
+Profile diff for The Referee
+- Compares the analyses of two constraint profiles, e.g. "today" and "in a year"
+- Per option: fit level change plus added and removed strengths,
+  limitations, hidden costs and avoid-when items
+- Sensitivity, comparison and Referee Insight changes
+- Works on cached per-profile results (pipeline.analyze): set differences
+  over messages, no re-analysis
+
+Usage:
+    python profile_diff.py low-balanced-small-beginner-urgent-simple-eventual \\
+                           medium-balanced-massive-intermediate-flexible-simple-eventual [--json]
+"""
+
+import argparse
+import json
+from typing import Dict, List, Optional, Tuple
+from constraints import EXTENDED_DEFAULTS, Constraints
+from evaluator import EVALUATION_CATEGORIES
+import pipeline
+
+# Fit levels from best to worst, to tell improvements from regressions
+FIT_ORDER = ["strong_fit", "moderate_fit", "risky_fit"]
+
+# ============================================================================
+# DIFF
+# ============================================================================
+
+def _changes(before: List[str], after: List[str]) -> Tuple[List[str], List[str]]:
+    """(added, removed) messages, each in its own list's order"""
+    before_set, after_set = set(before), set(after)
+    return [m for m in after if m not in before_set], [m for m in before if m not in after_set]
+
+
+def _insight_sections(insight: str) -> Dict[str, List[str]]:
+    from search_index import insight_messages
+
+    sections: Dict[str, List[str]] = {}
+    for section, line in insight_messages(insight):
+        sections.setdefault(section, []).append(line)
+    return sections
+
+
+def diff_results(before: Dict, after: Dict) -> Dict:
+    """
+    Differences between two run_analysis() results:
+
+    - constraints: {field: (before, after)} for the fields that changed
+    - options: {option: {fit: (before, after), reasoning, added, removed}},
+      added/removed mapping category -> messages; options only present on
+      one side have None for the missing fit
+    - sensitivities: {constraint: ((impact, text) before, after)} that changed,
+      None on the side where the constraint is not reported
+    - comparisons: {added, removed}
+    - insight: {section: {added, removed}} for sections that changed
+    """
+    # Extended fields are only listed when set; unset means the default
+    constraints = {}
+    for field in dict.fromkeys(list(before["constraints"]) + list(after["constraints"])):
+        default = EXTENDED_DEFAULTS[field].value if field in EXTENDED_DEFAULTS else None
+        old, new = before["constraints"].get(field, default), after["constraints"].get(field, default)
+        if old != new:
+            constraints[field] = (old, new)
+
+    options = {}
+    for option_name in dict.fromkeys(list(before["fits"]) + list(after["fits"])):
+        fit_before, fit_after = before["fits"].get(option_name), after["fits"].get(option_name)
+        evaluation_before = before["evaluations"].get(option_name, {})
+        evaluation_after = after["evaluations"].get(option_name, {})
+
+        added, removed = {}, {}
+        for category in EVALUATION_CATEGORIES:
+            added[category], removed[category] = _changes(
+                evaluation_before.get(category, []), evaluation_after.get(category, [])
+            )
+        options[option_name] = {
+            "fit": (fit_before[0] if fit_before else None, fit_after[0] if fit_after else None),
+            "reasoning": (fit_before[1] if fit_before else None, fit_after[1] if fit_after else None),
+            "added": {category: messages for category, messages in added.items() if messages},
+            "removed": {category: messages for category, messages in removed.items() if messages}
+        }
+
+    sensitivities = {
+        key: (before["sensitivities"].get(key), after["sensitivities"].get(key))
+        for key in dict.fromkeys(list(before["sensitivities"]) + list(after["sensitivities"]))
+        if tuple(before["sensitivities"].get(key) or ()) != tuple(after["sensitivities"].get(key) or ())
+    }
+
+    comparisons_added, comparisons_removed = _changes(before["comparisons"], after["comparisons"])
+
+    insight = {}
+    sections_before, sections_after = _insight_sections(before["insight"]), _insight_sections(after["insight"])
+    for section in dict.fromkeys(list(sections_before) + list(sections_after)):
+        added, removed = _changes(sections_before.get(section, []), sections_after.get(section, []))
+        if added or removed:
+            insight[section] = {"added": added, "removed": removed}
+
+    return {
+        "before": before["constraints"],
+        "after": after["constraints"],
+        "constraints": constraints,
+        "options": options,
+        "sensitivities": sensitivities,
+        "comparisons": {"added": comparisons_added, "removed": comparisons_removed},
+        "insight": insight
+    }
+
+
+def diff_profiles(before: Constraints, after: Constraints, options: Optional[Dict[str, Dict]] = None) -> Dict:
+    """diff_results() of two profiles, each served from the result file or analysis cache"""
+    return diff_results(pipeline.analyze(before, options), pipeline.analyze(after, options))
+
+
+def fit_direction(change: Tuple[Optional[str], Optional[str]]) -> str:
+    """"better", "worse", "same", "added" or "removed" for a (before, after) fit pair"""
+    before, after = change
+    if before is None:
+        return "added"
+    if after is None:
+        return "removed"
+    if before == after:
+        return "same"
+    return "better" if FIT_ORDER.index(after) < FIT_ORDER.index(before) else "worse"
+
+
+def is_empty(option_diff: Dict) -> bool:
+    """True when an option's fit and messages are the same for both profiles"""
+    return option_diff["fit"][0] == option_diff["fit"][1] and not option_diff["added"] and not option_diff["removed"]
+
+
+# ============================================================================
+# MARKDOWN
+# ============================================================================
+
+def render_diff_markdown(diff: Dict, before_label: str = "Before", after_label: str = "After") -> str:
+    """The diff as Markdown, unchanged options and sections left out"""
+    from report import FIT_LABELS
+
+    lines = [f"# Profile Diff: {before_label} → {after_label}", "", "## Constraint Changes", ""]
+    if diff["constraints"]:
+        lines += [
+            f"- **{field.replace('_', ' ').title()}:** {old} → {new}"
+            for field, (old, new) in diff["constraints"].items()
+        ]
+    else:
+        lines.append("- Same profile")
+
+    lines += ["", "## Options", ""]
+    for option_name, option_diff in diff["options"].items():
+        if is_empty(option_diff):
+            lines.append(f"### {option_name} - no change")
+            continue
+        old, new = option_diff["fit"]
+        labels = [FIT_LABELS[level] if level else "—" for level in (old, new)]
+        lines.append(f"### {option_name}: {labels[0]} → {labels[1]} ({fit_direction(option_diff['fit'])})")
+        if old != new and option_diff["reasoning"][1]:
+            lines.append(f"*{option_diff['reasoning'][1]}*")
+        for category in EVALUATION_CATEGORIES:
+            for message in option_diff["added"].get(category, []):
+                lines.append(f"- ➕ {category.replace('_', ' ')}: {message}")
+            for message in option_diff["removed"].get(category, []):
+                lines.append(f"- ➖ {category.replace('_', ' ')}: {message}")
+        lines.append("")
+
+    if diff["sensitivities"]:
+        lines += ["## Sensitivity Changes", ""]
+        for key, (old, new) in diff["sensitivities"].items():
+            lines.append(f"- **{key.replace('_', ' ').title()}:** {old[0] if old else '—'} → {new[0] if new else '—'}"
+                         + (f" - {new[1]}" if new else ""))
+        lines.append("")
+
+    if diff["comparisons"]["added"] or diff["comparisons"]["removed"]:
+        lines += ["## Comparison Changes", ""]
+        lines += [f"- ➕ {m}" for m in diff["comparisons"]["added"]]
+        lines += [f"- ➖ {m}" for m in diff["comparisons"]["removed"]]
+        lines.append("")
+
+    if diff["insight"]:
+        lines += ["## Referee Insight Changes", ""]
+        for section, changes in diff["insight"].items():
+            lines.append(f"**{section or 'General'}**")
+            lines += [f"- ➕ {m}" for m in changes["added"]]
+            lines += [f"- ➖ {m}" for m in changes["removed"]]
+            lines.append("")
+
+    return "\n".join(lines).rstrip() + "\n"
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the analyses of two constraint profiles")
+    parser.add_argument("before", help="Profile key, e.g. low-balanced-small-beginner-urgent-simple-eventual")
+    parser.add_argument("after", help="Profile key to compare against")
+    parser.add_argument("--json", action="store_true", help="Print the diff as JSON")
+    args = parser.parse_args()
+
+    try:
+        before, after = pipeline.profile_from_key(args.before), pipeline.profile_from_key(args.after)
+    except ValueError as error:
+        parser.error(str(error))
+
+    diff = diff_profiles(before, after)
+    if args.json:
+        print(json.dumps(diff, indent=2, ensure_ascii=False))
+    else:
+        print(render_diff_markdown(diff, args.before, args.after))
+
+
+if __name__ == "__main__":
+    main()
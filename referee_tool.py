@@ -3,18 +3,27 @@ The Referee - Tech Stack Decision Tool
 Main Streamlit application - UI orchestration only
 """
 
+import html
+import os
+import time
 import streamlit as st
 from datetime import datetime
 from constraints import get_user_constraints
+from html_fragments import architecture_card, comparison_alerts, fit_overview, option_card, option_cards, scenario_cards, sensitivity_block
 from options import get_database_options
-from evaluator import evaluate_options
-from advanced_analysis import (
-    ConstraintFitAssessor,
-    ConstraintSensitivityAnalyzer,
-    CrossOptionComparator,
-    WhatIfScenarioAnalyzer
-)
-from explainer import generate_referee_insight
+from plugins import PluginError, available_options, comparison_options
+from metrics import METRICS_PORT_ENV, PAGE_RUNS, start_http_server
+
+# Analysis modules (and NumPy) are imported where they are first needed, so
+# server start and the first render only pay for the sidebar and page shell.
+
+# Theme stylesheet, served at /app/static/ (see .streamlit/config.toml)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# Live mode waits this long before computing an uncached profile. A newer
+# widget change inside the window interrupts the run (runner.fastReruns), so
+# a slider drag only pays for the profile it settles on.
+LIVE_DEBOUNCE_SECONDS = 0.15
 
 # ============================================================================
 # PAGE CONFIG
@@ -29,264 +38,530 @@ st.set_page_config(
 # ============================================================================
 # GLASSMORPHISM + PASTEL UI THEME
 # ============================================================================
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700;800&display=swap');
-    
-    * {
-        font-family: 'Inter', sans-serif;
-    }
-    
-    .main {
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-    }
-    
-    [data-testid="stSidebar"] {
-        background: rgba(249, 229, 216, 0.7);
-        backdrop-filter: blur(10px);
-        border-right: 1px solid rgba(255, 255, 255, 0.3);
-    }
-    
-    h1, h2, h3, h4, h5, h6 {
-        color: #6A5D7B !important;
-        font-weight: 700;
-    }
-    
-    h1 {
-        background: linear-gradient(135deg, #6A5D7B 0%, #8B7E99 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-    }
-    
-    .glass-card {
-        background: rgba(255, 255, 255, 0.6);
-        backdrop-filter: blur(15px);
-        border-radius: 20px;
-        padding: 2rem;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        border: 1px solid rgba(255, 255, 255, 0.4);
-        transition: all 0.3s ease;
-        animation: fadeIn 0.6s ease-out;
-    }
-    
-    .glass-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 12px 40px rgba(0, 0, 0, 0.15);
-    }
-    
-    @keyframes fadeIn {
-        from { opacity: 0; transform: translateY(20px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    
-    .hero-section {
-        background: linear-gradient(135deg, rgba(200, 184, 219, 0.6), rgba(163, 201, 168, 0.6));
-        backdrop-filter: blur(20px);
-        border-radius: 25px;
-        padding: 3rem;
-        text-align: center;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        border: 1px solid rgba(255, 255, 255, 0.3);
-        margin-bottom: 2rem;
-        animation: heroFadeIn 1s ease-out;
-    }
-    
-    @keyframes heroFadeIn {
-        from { opacity: 0; transform: scale(0.95); }
-        to { opacity: 1; transform: scale(1); }
-    }
-    
-    .hero-logo {
-        font-size: 4rem;
-        animation: bounce 2s infinite;
-    }
-    
-    @keyframes bounce {
-        0%, 100% { transform: translateY(0); }
-        50% { transform: translateY(-10px); }
-    }
-    
-    .hero-title {
-        color: white !important;
-        font-size: 3.5rem;
-        font-weight: 900;
-        margin: 1rem 0;
-        text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.2);
-    }
-    
-    .hero-subtitle {
-        color: white;
-        font-size: 1.5rem;
-        font-weight: 400;
-        opacity: 0.95;
-    }
-    
-    .stButton>button {
-        background: linear-gradient(135deg, #A3C9A8 0%, #B8D4BE 100%);
-        color: white;
-        border-radius: 15px;
-        height: 3.5em;
-        width: 100%;
-        font-size: 1.1em;
-        font-weight: 700;
-        border: none;
-        box-shadow: 0 4px 15px rgba(163, 201, 168, 0.4);
-        transition: all 0.3s ease;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-    
-    .stButton>button:hover {
-        background: linear-gradient(135deg, #9EB5A5 0%, #B0C8B7 100%);
-        transform: translateY(-3px);
-        box-shadow: 0 6px 20px rgba(163, 201, 168, 0.5);
-    }
-    
-    .metric-glass-card {
-        background: linear-gradient(135deg, rgba(200, 184, 219, 0.7), rgba(212, 196, 232, 0.7));
-        backdrop-filter: blur(15px);
-        padding: 1.8rem;
-        border-radius: 20px;
-        color: white;
-        text-align: center;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        border: 1px solid rgba(255, 255, 255, 0.3);
-        transition: all 0.3s ease;
-        animation: fadeInUp 0.6s ease-out;
-    }
+@st.cache_resource
+def theme_stylesheet_link() -> str:
+    """
+    <link> to the theme stylesheet served from /app/static/: each rerun
+    sends this one tag, and the browser fetches and caches the file itself.
+    The modified time busts the browser cache when the file changes.
+    """
+    version = int(os.path.getmtime(os.path.join(STATIC_DIR, "referee.css")))
+    return f'<link rel="stylesheet" href="app/static/referee.css?v={version}">'
+
+st.markdown(theme_stylesheet_link(), unsafe_allow_html=True)
+
+# ============================================================================
+# ANALYSIS RENDERING
+# ============================================================================
+
+def insight_sections(insight: str):
+    """Yields the Referee Insight one section at a time for st.write_stream"""
+    sections = insight.split("\n---\n")
+    for i, section in enumerate(sections):
+        yield section if i == 0 else "\n---\n" + section
+
+# ============================================================================
+# METRICS ENDPOINT
+# ============================================================================
+
+@st.cache_resource
+def start_metrics_server():
+    """Serves /metrics once per process when $REFEREE_METRICS_PORT is set"""
+    port = os.environ.get(METRICS_PORT_ENV)
+    return start_http_server(int(port)) if port else None
+
+# ============================================================================
+# RULE HOT RELOAD
+# ============================================================================
+
+@st.cache_resource
+def start_rule_watcher():
+    """Reloads rules/*.json in the background once per process (see evaluator.py)"""
+    from evaluator import start_rule_watcher as start_watcher
     
-    @keyframes fadeInUp {
-        from { opacity: 0; transform: translateY(30px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
+    return start_watcher()
+
+# ============================================================================
+# CONSTRAINT INTERACTIONS
+# ============================================================================
+
+@st.cache_resource
+def load_interactions(metric: str, rules_version: str = None):
+    """Interaction analyzer and strength matrix, computed once per process (and rule set)"""
+    from interactions import InteractionAnalyzer, default_cube
     
-    .metric-glass-card:hover {
-        transform: translateY(-8px) scale(1.03);
-        box-shadow: 0 12px 40px rgba(200, 184, 219, 0.4);
-    }
+    analyzer = InteractionAnalyzer(*default_cube(metric, rules_version))
+    return analyzer, analyzer.strength()
+
+
+@st.cache_resource
+def load_global_sensitivity(metric: str, rules_version: str = None):
+    """Sobol indices over the same cube as the interactions, once per process (and rule set)"""
+    from global_sensitivity import GlobalSensitivityAnalyzer
+    from interactions import default_cube
     
-    .metric-value {
-        font-size: 3rem;
-        font-weight: 900;
-        margin: 0.5rem 0;
-        text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.1);
-    }
+    return GlobalSensitivityAnalyzer(*default_cube(metric, rules_version))
+
+
+def render_heatmap(matrix, row_labels, col_labels, diverging=False, highlight=None) -> str:
+    """HTML table heatmap in the theme palette; diverging maps sign to green/red"""
+    scale = max(float(abs(matrix).max()), 1e-9)
+    header = "".join(f'<th style="padding: 0.4rem;">{label}</th>' for label in col_labels)
+    rows = []
+    for r, row_label in enumerate(row_labels):
+        cells = []
+        for c, value in enumerate(matrix[r]):
+            alpha = 0.15 + 0.75 * abs(value) / scale
+            if diverging:
+                color = f"rgba(163, 201, 168, {alpha:.2f})" if value >= 0 else f"rgba(244, 151, 142, {alpha:.2f})"
+            else:
+                color = f"rgba(106, 93, 123, {alpha * 0.8:.2f})"
+            border = "3px solid #6A5D7B" if highlight == (r, c) else "1px solid rgba(255, 255, 255, 0.6)"
+            cells.append(
+                f'<td style="background: {color}; border: {border}; padding: 0.4rem; text-align: center;">{value:+.2f}</td>'
+            )
+        rows.append(f'<tr><th style="padding: 0.4rem; text-align: right;">{row_label}</th>{"".join(cells)}</tr>')
+    return (
+        '<div class="glass-card" style="overflow-x: auto;"><table style="border-collapse: collapse; width: 100%;">'
+        f"<tr><th></th>{header}</tr>{''.join(rows)}</table></div>"
+    )
+
+# ============================================================================
+# DECISION HISTORY
+# ============================================================================
+
+@st.cache_resource
+def load_history():
+    """Decision history store ($REFEREE_HISTORY), opened once per process"""
+    from history import DecisionHistory
     
-    .metric-label {
-        font-size: 1rem;
-        opacity: 0.95;
-        font-weight: 600;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
+    return DecisionHistory()
+
+# ============================================================================
+# MESSAGE SEARCH
+# ============================================================================
+
+@st.cache_resource(show_spinner="Indexing every message the engine can emit...")
+def load_search_index(rules_version: str):
+    """Full-text index over all profiles' outputs, built once per rule set"""
+    from search_index import default_index
     
-    .glass-alert-success {
-        background: rgba(212, 241, 221, 0.7);
-        backdrop-filter: blur(10px);
-        border-left: 5px solid #A3C9A8;
-        padding: 1.2rem;
-        border-radius: 15px;
-        margin: 1rem 0;
-        box-shadow: 0 4px 15px rgba(163, 201, 168, 0.2);
+    return default_index(rules_version)
+
+# ============================================================================
+# WORKLOAD TRACE INGESTION
+# ============================================================================
+
+@st.cache_data(show_spinner="Streaming query log...")
+def load_trace_profile(path: str, modified: float):
+    """Ingests a query log once per file version (modified time busts the cache)"""
+    from trace_ingest import ingest_trace, derive_constraint_values
+    
+    profile = ingest_trace(path, use_mmap=True)
+    derived = derive_constraint_values(profile)
+    return profile.to_dict(), {
+        "performance_priority": derived["performance"].value,
+        "scale": derived["scale"].value,
+        "data_complexity": derived["data_complexity"].value
     }
+
+# ============================================================================
+# PAGE SECTIONS
+# ============================================================================
+# Fragments: a widget inside one reruns only that section, so exploring
+# costs, interactions, history or search never recomputes the analysis.
+
+@st.fragment
+def render_cost_projection(options):
+    """Cost projection for a workload, recomputed on its own inputs"""
+    st.markdown("---")
+    st.markdown("### 💰 Cost Projection (36 months)")
     
-    .glass-alert-warning {
-        background: rgba(255, 243, 205, 0.7);
-        backdrop-filter: blur(10px);
-        border-left: 5px solid #F9C74F;
-        padding: 1.2rem;
-        border-radius: 15px;
-        margin: 1rem 0;
-        box-shadow: 0 4px 15px rgba(249, 199, 79, 0.2);
-    }
+    if st.toggle("📈 Project monthly cost for your workload", value=False):
+        import numpy as np
+        from cost_model import CostProjector, find_crossovers, HORIZON_MONTHS
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            reads_per_sec = st.number_input("Reads / second", min_value=0.0, value=500.0, step=100.0)
+            writes_per_sec = st.number_input("Writes / second", min_value=0.0, value=100.0, step=50.0)
+        with col2:
+            storage_gb = st.number_input("Storage (GB)", min_value=0.0, value=50.0, step=10.0)
+            item_kb = st.number_input("Average item size (KB)", min_value=0.1, value=1.0, step=0.5)
+        with col3:
+            growth_pct = st.number_input("Monthly growth (%)", min_value=0.0, value=5.0, step=1.0)
+            secondary_indexes = st.number_input("Secondary indexes", min_value=0, value=1, step=1)
+        
+        workload = {
+            "writes_per_sec": writes_per_sec,
+            "storage_gb": storage_gb,
+            "item_kb": item_kb,
+            "monthly_growth": growth_pct / 100,
+            "secondary_indexes": secondary_indexes
+        }
+        
+        projector = CostProjector(options)
+        curves = projector.project(reads_per_sec=reads_per_sec, **workload)
+        
+        st.markdown("**Monthly cost (USD) over time**")
+        st.line_chart(curves)
+        
+        months = np.arange(HORIZON_MONTHS)
+        for crossover in find_crossovers(months, curves):
+            st.markdown(
+                f"- Month {crossover['x']:.1f}: **{crossover['cheaper_after']}** becomes cheaper "
+                f"than {crossover['cheaper_before']}"
+            )
+        
+        # Same workload swept across read traffic, one vectorized pass
+        read_grid = np.geomspace(10, 100000, 200)
+        sweep = projector.sweep("reads_per_sec", read_grid, month=HORIZON_MONTHS - 1, **workload)
+        
+        st.markdown(f"**Month-{HORIZON_MONTHS} cost across read traffic (reads/second)**")
+        st.line_chart({"reads_per_sec": read_grid, **sweep}, x="reads_per_sec")
+        
+        for crossover in find_crossovers(read_grid, sweep):
+            st.markdown(
+                f"- ~{crossover['x']:,.0f} reads/s: **{crossover['cheaper_after']}** becomes cheaper "
+                f"than {crossover['cheaper_before']}"
+            )
+        
+        st.caption("List-price approximations without discounts - use for shape and crossovers, not quotes.")
+
+
+@st.fragment
+def render_interactions(constraints):
+    """Constraint interaction heatmaps, highlighting the current profile"""
+    st.markdown("---")
+    st.markdown("### 🧮 Constraint Interactions")
     
-    .glass-alert-danger {
-        background: rgba(255, 229, 229, 0.7);
-        backdrop-filter: blur(10px);
-        border-left: 5px solid #F4978E;
-        padding: 1.2rem;
-        border-radius: 15px;
-        margin: 1rem 0;
-        box-shadow: 0 4px 15px rgba(244, 151, 142, 0.2);
-        animation: pulse 2s infinite;
-    }
+    if st.toggle("Show how constraint pairs interact across every profile", value=False):
+        import numpy as np
+        from pipeline import PROFILE_FIELDS
+        
+        metric = st.radio(
+            "Measure",
+            ["fit", "score"],
+            format_func=lambda m: {"fit": "Fit level", "score": "Trade-off balance"}[m],
+            horizontal=True
+        )
+        from evaluator import active_rules
+        
+        # Trade-off scores follow the evaluator rules; fit levels don't
+        analyzer, strength = load_interactions(metric, active_rules().version if metric == "score" else None)
+        labels = [field.replace("_", " ").title() for field in analyzer.fields]
+        
+        option_name = st.selectbox("Option", analyzer.option_names)
+        o = analyzer.option_names.index(option_name)
+        
+        st.markdown("**Interaction strength per constraint pair** - how far fit departs from each constraint's effect on its own")
+        st.markdown(render_heatmap(strength[o], labels, labels), unsafe_allow_html=True)
+        
+        # Drill into one pair, defaulting to the strongest for this option
+        i, j = np.unravel_index(np.argmax(strength[o]), strength[o].shape)
+        col1, col2 = st.columns(2)
+        with col1:
+            field_a = st.selectbox("Rows", analyzer.fields, index=int(i), format_func=lambda f: f.replace("_", " ").title())
+        with col2:
+            field_b = st.selectbox("Columns", analyzer.fields, index=int(j), format_func=lambda f: f.replace("_", " ").title())
+        
+        if field_a != field_b:
+            effects = analyzer.interaction(field_a, field_b)[o]
+            profile = dict(zip(PROFILE_FIELDS, constraints.to_dict().values()))
+            current = (analyzer.values[field_a].index(profile[field_a]), analyzer.values[field_b].index(profile[field_b]))
+            st.markdown(
+                render_heatmap(effects, analyzer.values[field_a], analyzer.values[field_b], diverging=True, highlight=current),
+                unsafe_allow_html=True
+            )
+            st.caption("Green: better together than either constraint alone predicts. Red: a tension. Outlined: your profile.")
+        
+        st.markdown("**Strongest interactions for this option**")
+        for item in analyzer.top_interactions(5, option_name):
+            (field_a, field_b), (value_a, value_b) = item["constraints"], item["values"]
+            direction = "tension" if item["effect"] < 0 else "synergy"
+            st.markdown(
+                f"- {field_a.replace('_', ' ')} = `{value_a}` × {field_b.replace('_', ' ')} = `{value_b}`: "
+                f"{direction} ({item['effect']:+.2f})"
+            )
+
+
+@st.fragment
+def render_global_sensitivity():
+    """Which constraints drive each option's fit across every profile (Sobol indices)"""
+    st.markdown("---")
+    st.markdown("### 🌐 Global Sensitivity")
     
-    @keyframes pulse {
-        0%, 100% { transform: scale(1); }
-        50% { transform: scale(1.02); }
-    }
+    if st.toggle("Show which constraints drive the decision across all profiles", value=False):
+        from global_sensitivity import ALL_OPTIONS
+        from evaluator import active_rules
+        
+        metric = st.radio(
+            "Measure",
+            ["fit", "score"],
+            format_func=lambda m: {"fit": "Fit level", "score": "Trade-off balance"}[m],
+            horizontal=True,
+            key="global_sensitivity_metric"
+        )
+        analyzer = load_global_sensitivity(metric, active_rules().version if metric == "score" else None)
+        option_name = st.selectbox("Option", [ALL_OPTIONS] + analyzer.option_names, key="global_sensitivity_option")
+        
+        rows = analyzer.indices(option_name)
+        st.bar_chart(
+            {
+                "constraint": [row["constraint"].replace("_", " ") for row in rows],
+                "on its own": [row["first_order"] for row in rows],
+                "through interactions": [row["interactions"] for row in rows]
+            },
+            x="constraint",
+            y=["on its own", "through interactions"],
+            horizontal=True
+        )
+        for row in rows[:3]:
+            st.markdown(
+                f"- **{row['constraint'].replace('_', ' ').title()}** explains {row['first_order']:.0%} of the variation "
+                f"on its own, {row['total_effect']:.0%} including interactions"
+            )
+        
+        inert = analyzer.inert()
+        if inert:
+            st.caption(f"Same {metric} for every profile (no sensitivity): {', '.join(inert)}")
+        st.caption(
+            "Sobol indices - every constraint value equally likely, computed exactly over all profiles. "
+            "Constraint Sensitivity explains one profile; this ranks constraints across all of them."
+        )
+
+
+@st.fragment
+def render_profile_diff(constraints, analysis_options=None):
+    """Side-by-side diff of the current profile against another one"""
+    st.markdown("---")
+    st.markdown("### 🔀 Profile Diff")
     
-    .glass-alert-info {
-        background: rgba(227, 242, 253, 0.7);
-        backdrop-filter: blur(10px);
-        border-left: 5px solid #90CAF9;
-        padding: 1.2rem;
-        border-radius: 15px;
-        margin: 1rem 0;
-        box-shadow: 0 4px 15px rgba(144, 202, 249, 0.2);
-    }
+    if st.toggle("Compare this profile with another one (e.g. in a year)", value=False):
+        from pipeline import PROFILE_FIELDS, profile_from_dict
+        from profile_diff import diff_profiles, fit_direction, is_empty, render_diff_markdown
+        from report import FIT_LABELS
+        
+        current = constraints.to_dict()
+        columns = st.columns(4)
+        target = {}
+        for i, (key, enum) in enumerate(zip(current, PROFILE_FIELDS.values())):
+            values = [member.value for member in enum]
+            with columns[i % 4]:
+                target[key] = st.selectbox(
+                    key.replace("_", " ").title(), values, index=values.index(current[key]), key=f"diff_{key}"
+                )
+        
+        # Extended constraints carry over unchanged to the other profile
+        diff = diff_profiles(constraints, profile_from_dict({**constraints.extended_dict(), **target}), analysis_options)
+        if not diff["constraints"]:
+            st.info("Change at least one constraint above to see what moves.")
+            return
+        
+        icons = {"better": "⬆️", "worse": "⬇️", "same": "➡️", "added": "➕", "removed": "➖"}
+        for option_name, option_diff in diff["options"].items():
+            old, new = option_diff["fit"]
+            changed = sum(len(m) for m in option_diff["added"].values()) + sum(len(m) for m in option_diff["removed"].values())
+            st.markdown(
+                f"- {icons[fit_direction(option_diff['fit'])]} **{option_name}:** "
+                f"{FIT_LABELS.get(old, '—')} → {FIT_LABELS.get(new, '—')}"
+                + ("" if is_empty(option_diff) else f" · {changed} trade-off messages changed")
+            )
+        
+        markdown = render_diff_markdown(diff, "Current profile", "Compared profile")
+        with st.expander("Every change", expanded=False):
+            st.markdown(markdown.split("\n", 1)[1])
+        st.download_button(
+            label="📥 Download Diff (Markdown)",
+            data=markdown,
+            file_name=f"referee_profile_diff_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
+            mime="text/markdown"
+        )
+
+
+@st.fragment
+def render_path_planner(constraints, analysis_options=None):
+    """Cheapest constraint changes that reach a target fit"""
+    st.markdown("---")
+    st.markdown("### 🧭 Path Planner")
     
-    .tech-badge {
-        display: inline-block;
-        background: linear-gradient(135deg, #A3C9A8, #C8B8DB);
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 20px;
-        margin: 0.3rem;
-        font-size: 0.9rem;
-        font-weight: 600;
-        box-shadow: 0 4px 10px rgba(0, 0, 0, 0.1);
-    }
+    if st.toggle("Find the cheapest constraint changes to reach a target fit", value=False):
+        from path_planner import PathPlanner, describe_plan, fit_target, no_risky_target
+        from pipeline import PROFILE_FIELDS
+        from report import FIT_LABELS
+        
+        option_names = list(analysis_options or get_database_options())
+        targets = {"No risky fits": no_risky_target()}
+        for option_name in option_names:
+            targets[f"{option_name}: {FIT_LABELS['strong_fit']}"] = fit_target(option_name, "strong_fit")
+            targets[f"{option_name}: {FIT_LABELS['moderate_fit']} or better"] = fit_target(option_name, "moderate_fit")
+        
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            target = targets[st.selectbox("Target", list(targets), key="planner_target")]
+        with col2:
+            # The planner only moves core fields and extended fields already set
+            locked = st.multiselect(
+                "Can't change",
+                list(PROFILE_FIELDS) + list(constraints.extended_dict()),
+                format_func=lambda field: field.replace("_", " ").title(),
+                key="planner_locked"
+            )
+        
+        planner = PathPlanner(constraints, analysis_options, locked)
+        plans = planner.plan(target)
+        if not plans:
+            st.info(f"No affordable way to reach {target.description} - allow more constraints to change.")
+            return
+        if not plans[0]["changes"]:
+            st.success(f"Your current profile already reaches {target.description}.")
+            return
+        
+        for i, plan in enumerate(plans, 1):
+            fits = " · ".join(f"{name}: {FIT_LABELS[level]}" for name, level in plan["fits"].items())
+            st.markdown(f"**{i}.** {describe_plan(plan)}")
+            st.caption(fits)
+        st.caption(
+            "Costs are relative effort per change - upskilling the team (8 per level) costs far more than "
+            "relaxing a deadline (1). Plans are minimum-cost paths over the precomputed fit table."
+        )
+
+
+@st.fragment
+def render_pareto(constraints, options):
+    """Non-dominated layers of the compared options for this profile"""
+    st.markdown("---")
+    st.markdown("### ⚖️ Pareto Frontier")
     
-    .footer {
-        background: rgba(234, 231, 220, 0.6);
-        backdrop-filter: blur(15px);
-        border-radius: 20px;
-        padding: 2rem;
-        text-align: center;
-        margin-top: 3rem;
-        box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        border: 1px solid rgba(255, 255, 255, 0.3);
-    }
+    if st.toggle("Show which options no other option beats on every constraint", value=False):
+        from pareto import ParetoAnalyzer
+        
+        analyzer = ParetoAnalyzer.for_profile(constraints, options)
+        dominated_by, best_at = analyzer.dominated_by(), analyzer.best_at()
+        
+        lines = []
+        for number, names in enumerate(analyzer.layer_names(), 1):
+            lines.append(f"\n**Layer {number}**" + (" - the frontier" if number == 1 else "") + "\n")
+            for name in names:
+                if name in dominated_by:
+                    lines.append(f"- {name} - beaten or matched everywhere by {', '.join(dominated_by[name])}")
+                else:
+                    strengths = ", ".join(key.replace("_", " ") for key in best_at[name]) or "no single constraint"
+                    lines.append(f"- {name} - best at {strengths}")
+        st.markdown("\n".join(lines))
+        
+        with st.expander("Per-constraint scores", expanded=False):
+            st.dataframe(
+                {"option": analyzer.option_names, **{
+                    key.replace("_", " "): analyzer.scores[:, k] for k, key in enumerate(analyzer.keys)
+                }},
+                hide_index=True
+            )
+        st.caption(
+            "Each option is scored against each constraint on its own (strengths minus weighted costs). "
+            "Frontier options each give something up to the others - still trade-offs, not winners."
+        )
+
+
+@st.fragment
+def render_decision_history(constraints):
+    """Save the last analysis and browse past decisions"""
+    st.markdown("---")
+    st.markdown("### 🗂️ Decision History")
     
-    .fit-badge-strong {
-        background: linear-gradient(135deg, #A3C9A8, #B8D4BE);
-        color: white;
-        padding: 0.5rem 1.5rem;
-        border-radius: 20px;
-        font-weight: 700;
-        display: inline-block;
-        box-shadow: 0 4px 15px rgba(163, 201, 168, 0.3);
-    }
+    if st.toggle("Save and review past analyses", value=False):
+        history = load_history()
+        last_analysis = st.session_state.get('last_analysis')
+        
+        if last_analysis:
+            with st.form("save_analysis", clear_on_submit=True):
+                col1, col2 = st.columns([1, 2])
+                with col1:
+                    team = st.text_input("Team")
+                with col2:
+                    note = st.text_input("Decision note")
+                if st.form_submit_button("💾 Save this analysis"):
+                    history.record(team=team.strip(), note=note.strip(), **last_analysis)
+                    st.success("Analysis saved to the decision history.")
+        else:
+            st.caption("Run an analysis to save it here.")
+        
+        from datetime import timedelta
+        from history import GROUP_COLUMNS, QUARTER_DAYS
+        from report import FIT_LABELS
+        
+        st.markdown("**Recent analyses**")
+        recent = history.recent(10)
+        for entry in recent:
+            saved = datetime.fromtimestamp(entry["created_at"]).strftime("%Y-%m-%d %H:%M")
+            profile = " · ".join([entry[key] for key in constraints.to_dict()] + list(entry["extended"].values()))
+            fits_text = ", ".join(f"{name}: {FIT_LABELS[level]}" for name, level in entry["fits"].items())
+            st.markdown(
+                f"- {saved} · **{entry['team'] or 'no team'}** · `{profile}`"
+                + (f" · {entry['scenario']}" if entry['scenario'] else "")
+                + (f" — *{entry['note']}*" if entry['note'] else "")
+                + f"<br><small>{fits_text}</small>",
+                unsafe_allow_html=True
+            )
+        if not recent:
+            st.caption("No saved analyses yet.")
+        
+        group_by = st.selectbox(
+            "Fit levels over the last quarter, by",
+            GROUP_COLUMNS,
+            format_func=lambda column: column.replace("_", " ").title()
+        )
+        since = (datetime.now() - timedelta(days=QUARTER_DAYS)).timestamp()
+        distribution = history.fit_distribution(group_by, since)
+        rows = [
+            {group_by: group or "—", "option": option_name, **{FIT_LABELS[level]: counts.get(level, 0) for level in FIT_LABELS}}
+            for group, per_option in sorted(distribution.items())
+            for option_name, counts in per_option.items()
+        ]
+        if rows:
+            st.dataframe(rows, hide_index=True, use_container_width=True)
+
+
+@st.fragment
+def render_message_search(options):
+    """Search everything the engine can say, across all profiles"""
+    st.markdown("---")
+    st.markdown("### 🔎 Search the Trade-off Engine")
     
-    .fit-badge-moderate {
-        background: linear-gradient(135deg, #F9C74F, #FFD93D);
-        color: white;
-        padding: 0.5rem 1.5rem;
-        border-radius: 20px;
-        font-weight: 700;
-        display: inline-block;
-        box-shadow: 0 4px 15px rgba(249, 199, 79, 0.3);
-    }
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        query = st.text_input("Search messages, fits and insights", placeholder="e.g. schema migrations, GSIs, failover")
+    with col2:
+        option_filter = st.selectbox("Option", ["All options"] + list(options), key="search_option")
     
-    .fit-badge-risky {
-        background: linear-gradient(135deg, #F4978E, #FBB6AF);
-        color: white;
-        padding: 0.5rem 1.5rem;
-        border-radius: 20px;
-        font-weight: 700;
-        display: inline-block;
-        box-shadow: 0 4px 15px rgba(244, 151, 142, 0.3);
-        animation: pulse 2s infinite;
-    }
-</style>
-""", unsafe_allow_html=True)
+    if query.strip():
+        from evaluator import active_rules
+        from search_index import describe_triggers
+        
+        search_index = load_search_index(active_rules().version)
+        results = search_index.search(query, limit=15, option=None if option_filter == "All options" else option_filter)
+        for result in results:
+            where = " · ".join(html.escape(part) for part in [result["option"], result["stage"], result["category"]] if part)
+            st.markdown(
+                f"- {html.escape(result['text'])}<br><small>{where} — when {html.escape(describe_triggers(result))} "
+                f"({result['profiles']} of {search_index.profile_total} profiles)</small>",
+                unsafe_allow_html=True
+            )
+        if not results:
+            st.caption("No message matches - try fewer or shorter words (prefixes match too).")
 
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
 
 def main():
+    start_metrics_server()
+    rule_watcher = start_rule_watcher()
+    PAGE_RUNS.inc()
+    
+    if rule_watcher and rule_watcher.last_error:
+        st.sidebar.warning(f"Rule files rejected, previous rules still active: {rule_watcher.last_error}")
+    
     # Hero Section
     st.markdown("""
     <div class="hero-section">
@@ -317,253 +592,253 @@ def main():
     # ========================================================================
     st.sidebar.markdown("### ⚙️ Define Your Constraints")
     
+    # Optional: derive measurable constraints from a local query log
+    with st.sidebar.expander("📂 Derive from a query log", expanded=False):
+        trace_path = st.text_input(
+            "Path to CSV or JSON Lines log",
+            help="Streamed from disk in bounded memory - columns: timestamp, op, key, query, joins"
+        )
+        if st.button("Derive profile") and trace_path:
+            if os.path.isfile(trace_path):
+                st.session_state['trace_profile'] = load_trace_profile(
+                    trace_path, os.path.getmtime(trace_path)
+                )
+            else:
+                st.error(f"File not found: {trace_path}")
+        
+        if 'trace_profile' in st.session_state:
+            stats, derived = st.session_state['trace_profile']
+            st.caption(
+                f"{stats['requests']:,} requests · read ratio {stats['read_ratio']:.0%} · "
+                f"p99 {stats['qps_p99']:,.0f} QPS · ~{stats['key_cardinality']:,} keys · "
+                f"joins in {stats['join_fraction']:.1%}"
+            )
+            if stats['skipped']:
+                st.caption(f"⚠️ Skipped {stats['skipped']:,} records that didn't parse")
+            if st.button("Clear derived profile"):
+                del st.session_state['trace_profile']
+                st.rerun()
+    
+    trace_defaults = st.session_state['trace_profile'][1] if 'trace_profile' in st.session_state else {}
+    
+    # Deep links from the static report site: ?profile=<profile_key>&scenario=<scenario key>
+    link_defaults = {}
+    if "profile" in st.query_params:
+        from pipeline import profile_from_key
+        try:
+            linked = profile_from_key(st.query_params["profile"])
+            link_defaults = {**linked.to_dict(), **linked.extended_dict()}
+        except ValueError:
+            st.sidebar.warning(f"Ignoring unknown profile link: {st.query_params['profile']}")
+    
     # Get constraints from dedicated module (no duplication)
-    constraints = get_user_constraints()
+    constraints = get_user_constraints(defaults={**link_defaults, **trace_defaults})
     
     # What-If Scenario (only UI element not in get_user_constraints)
     st.sidebar.markdown("---")
     st.sidebar.subheader("🔮 What-If Scenario")
+    scenario_labels = ["None", "Traffic increases 10x", "Team size doubles", "Budget cuts 30%", "Latency becomes critical"]
+    linked_scenario = {
+        "traffic_10x": "Traffic increases 10x",
+        "team_doubles": "Team size doubles",
+        "budget_cuts": "Budget cuts 30%",
+        "latency_critical": "Latency becomes critical"
+    }.get(st.query_params.get("scenario"), "None")
     scenario = st.sidebar.selectbox(
         "Test a scenario:",
-        ["None", "Traffic increases 10x", "Team size doubles", "Budget cuts 30%", "Latency becomes critical"],
+        scenario_labels,
+        index=scenario_labels.index(linked_scenario),
         help="See how choices hold up under changed conditions"
     )
     
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("🧩 Architectures")
+    explore_architectures = st.sidebar.checkbox(
+        "Explore multi-database architectures",
+        value=False,
+        help="Combine 2-3 options (e.g. cache + primary store) and see how they cover each other's gaps"
+    )
+    
+    # Plugin options are listed without importing them; a provider loads
+    # only once its option is added to the comparison
+    plugin_names = list(available_options())
+    selected_plugins = []
+    if plugin_names:
+        st.sidebar.markdown("---")
+        st.sidebar.subheader("🔌 More Options")
+        selected_plugins = st.sidebar.multiselect(
+            "Add options from plugins",
+            plugin_names,
+            help="Compared alongside the built-in options"
+        )
+    
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("⚡ Live Mode")
+    live_mode = st.sidebar.toggle(
+        "Update the analysis as constraints change",
+        value=False,
+        help="No Analyze button - profiles you've seen before are served from cache instantly"
+    )
+    
     # ========================================================================
     # STEP 2: Load Database Options
     # ========================================================================
-    options = get_database_options()
+    try:
+        options = comparison_options(selected_plugins)
+    except PluginError as error:
+        st.sidebar.error(f"Plugin unavailable: {error}")
+        options = get_database_options()
+        selected_plugins = []
+    analysis_options = options if selected_plugins else None  # None: the default catalog, precomputable
     
     # ========================================================================
     # STEP 3: Analyze Button
     # ========================================================================
     st.markdown("---")
     
-    if st.button("🔍 Analyze Trade-offs", type="primary", use_container_width=True):
+    if live_mode:
+        st.caption("⚡ Live mode - the analysis follows your constraints.")
+        analyze_requested = True
+    else:
+        analyze_requested = st.button("🔍 Analyze Trade-offs", type="primary", use_container_width=True)
+    
+    if analyze_requested:
         st.session_state['analysis_timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
+        # Deferred until the first analysis (see note at the top of the file)
+        from pipeline import SCENARIOS, analysis_cached, stream_analysis
+        from report import ASSUMPTIONS, render_export, sorted_sensitivities as sorted_by_impact
+        
+        scenario_keys = [SCENARIOS[scenario]] if scenario != "None" else []
+        if live_mode and not analysis_cached(constraints, scenario_keys, analysis_options):
+            time.sleep(LIVE_DEBOUNCE_SECONDS)
+        
         st.markdown("### 📊 Trade-off Analysis")
         
         # Display constraint profile
         with st.expander("📌 Your Constraint Profile", expanded=False):
-            constraint_dict = constraints.to_dict()
+            constraint_dict = {**constraints.to_dict(), **constraints.extended_dict()}
             for key, value in constraint_dict.items():
                 st.markdown(f"**{key.replace('_', ' ').title()}:** `{value}`")
         
         # ========================================================================
-        # STEP 4: Evaluate Each Option (Delegation)
+        # STEP 4-5: Stream Evaluations + Advanced Analysis (Delegation to pipeline.py)
         # ========================================================================
-        evaluations = {}
-        for option_name, option_data in options.items():
-            evaluations[option_name] = evaluate_options(option_name, option_data, constraints)
+        # Stages arrive in display order; each section renders as soon as its
+        # stage completes instead of after the whole analysis.
+        # Every section below is one write of cached fragments (html_fragments.py)
+        replayed = analysis_cached(constraints, scenario_keys, analysis_options)
+        analysis_stream = stream_analysis(constraints, scenarios=scenario_keys, options=analysis_options)
+        _, fits = next(analysis_stream)
         
-        # ========================================================================
-        # STEP 5: Run Advanced Analysis (Delegation)
-        # ========================================================================
-        fit_assessor = ConstraintFitAssessor(constraints)
-        sensitivity_analyzer = ConstraintSensitivityAnalyzer(constraints)
-        comparator = CrossOptionComparator(constraints)
-        scenario_analyzer = WhatIfScenarioAnalyzer(constraints)
-        
-        sensitivities = sensitivity_analyzer.analyze_sensitivity()
-        comparisons = comparator.generate_comparisons()
+        # Fit overview first - one write for every badge
+        st.markdown(fit_overview(fits), unsafe_allow_html=True)
         
         # ========================================================================
         # STEP 6: Render Options with Fit Assessment
         # ========================================================================
-        for option_name, evaluation in evaluations.items():
-            option_data = options[option_name]
-            
-            # Get fit assessment
-            fit_level, fit_reasoning, context_warning = fit_assessor.assess_fit(option_name)
-            
-            # Map fit levels to badges
-            fit_badges = {
-                "strong_fit": '<span class="fit-badge-strong">🟢 Strong Fit</span>',
-                "moderate_fit": '<span class="fit-badge-moderate">🟡 Moderate Fit</span>',
-                "risky_fit": '<span class="fit-badge-risky">🔴 Risky Fit</span>'
-            }
-            
-            st.markdown(f"""
-            <div class="glass-card">
-                <h3 style="color: #6A5D7B !important;">{option_name}</h3>
-                <div style="margin: 1rem 0;">
-                    {fit_badges[fit_level]}
-                </div>
-                <p style="color: #666; font-size: 1.1rem; margin: 1rem 0;">
-                    <em>{fit_reasoning}</em>
-                </p>
-            """, unsafe_allow_html=True)
-            
-            if context_warning:
-                st.markdown(f"""
-                <div class="glass-alert-warning">
-                    <strong>⚠️ Context Switch Warning:</strong> {context_warning}
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Option overview
-            st.markdown(f"*{option_data['description']}*")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.caption(f"**Type:** {option_data['type']}")
-                st.caption(f"**Pricing:** {option_data['pricing_model']}")
-                st.caption(f"**Setup Time:** {option_data['setup_time']}")
-            
-            with col2:
-                st.caption(f"**Scaling:** {option_data['scaling_model']}")
-                st.caption(f"**Consistency:** {option_data['consistency']}")
-                st.caption(f"**Complexity:** {option_data['base_complexity']}")
-            
-            st.markdown("---")
-            
-            # Trade-off analysis
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("**✅ Strengths**")
-                for strength in evaluation["strengths"]:
-                    st.markdown(f"- {strength}")
-                
-                st.markdown("")
-                st.markdown("**💸 Hidden Costs**")
-                for cost in evaluation["hidden_costs"]:
-                    st.markdown(f"- {cost}")
-            
-            with col2:
-                st.markdown("**⚠️ Limitations**")
-                for limitation in evaluation["limitations"]:
-                    st.markdown(f"- {limitation}")
-                
-                st.markdown("")
-                st.markdown("**❌ When NOT to Choose**")
-                for avoid in evaluation["avoid_when"]:
-                    st.markdown(f"- {avoid}")
+        evaluations = {}
+        if replayed:
+            # Nothing to wait for - every card in one write
+            for _ in fits:
+                _, (option_name, evaluation) = next(analysis_stream)
+                evaluations[option_name] = evaluation
+            st.markdown(option_cards(options, fits, evaluations), unsafe_allow_html=True)
+        else:
+            # A placeholder per option keeps catalog order while cards fill in
+            card_slots = {option_name: st.empty() for option_name in fits}
+            for option_name, slot in card_slots.items():
+                slot.markdown(option_card(option_name, options[option_name], fits[option_name]), unsafe_allow_html=True)
             
-            st.markdown("</div>", unsafe_allow_html=True)
-            st.markdown("<br>", unsafe_allow_html=True)
+            for _ in card_slots:
+                _, (option_name, evaluation) = next(analysis_stream)
+                evaluations[option_name] = evaluation
+                card_slots[option_name].markdown(
+                    option_card(option_name, options[option_name], fits[option_name], evaluation),
+                    unsafe_allow_html=True
+                )
         
         # ========================================================================
         # STEP 7: Constraint Sensitivity Analysis
         # ========================================================================
-        st.markdown("### 🎚️ Constraint Sensitivity Analysis")
-        st.markdown("*Which constraints have the most influence:*")
-        
-        # Sort by impact
-        impact_order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
-        sorted_sensitivities = sorted(
-            sensitivities.items(),
-            key=lambda x: impact_order[x[1][0]]
-        )
-        
-        # Display as metric cards
-        cols = st.columns(min(4, len(sorted_sensitivities)))
+        _, sensitivities = next(analysis_stream)
         
-        impact_colors = {
-            "HIGH": "rgba(244, 151, 142, 0.7)",
-            "MEDIUM": "rgba(249, 199, 79, 0.7)",
-            "LOW": "rgba(163, 201, 168, 0.7)"
-        }
-        
-        for idx, (col, (constraint_name, (impact, explanation))) in enumerate(zip(cols, sorted_sensitivities[:4])):
-            with col:
-                display_name = constraint_name.replace("_", " ").title()
-                st.markdown(f"""
-                <div class="metric-glass-card" style="background: {impact_colors[impact]};">
-                    <div class="metric-label">{display_name}</div>
-                    <div class="metric-value">{impact}</div>
-                    <div class="metric-label" style="font-size: 0.8rem;">Impact</div>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        # Explanations for HIGH impact
-        st.markdown("<br>", unsafe_allow_html=True)
-        for constraint_name, (impact, explanation) in sorted_sensitivities:
-            if impact == "HIGH":
-                st.markdown(f"""
-                <div class="glass-alert-info">
-                    <strong>{constraint_name.replace('_', ' ').title()}:</strong> {explanation}
-                </div>
-                """, unsafe_allow_html=True)
+        # Metric cards for the top four by impact, then the HIGH-impact explanations
+        st.markdown(
+            "### 🎚️ Constraint Sensitivity Analysis\n*Which constraints have the most influence:*\n\n"
+            + sensitivity_block(sorted_by_impact(sensitivities)),
+            unsafe_allow_html=True
+        )
         
         # ========================================================================
         # STEP 8: Direct Comparisons
         # ========================================================================
-        st.markdown("---")
-        st.markdown("### 🔄 Direct Comparisons")
+        _, comparisons = next(analysis_stream)
         
-        for comparison in comparisons:
-            st.markdown(f"""
-            <div class="glass-alert-info">
-                {comparison}
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown("---\n### 🔄 Direct Comparisons\n\n" + comparison_alerts(comparisons), unsafe_allow_html=True)
         
         # ========================================================================
-        # STEP 9: What-If Scenario Analysis
+        # STEP 8b: Multi-Database Architectures (Delegation)
         # ========================================================================
-        if scenario != "None":
+        if explore_architectures:
+            from architecture_search import ArchitectureSearcher
+            
             st.markdown("---")
-            st.markdown(f"### 🔮 What-If Analysis: {scenario}")
+            st.markdown("### 🧩 Multi-Database Architectures")
+            st.markdown("*Combinations ranked by how well members cover each other's constraint gaps - still trade-offs, not winners:*")
             
-            scenario_map = {
-                "Traffic increases 10x": "traffic_10x",
-                "Team size doubles": "team_doubles",
-                "Budget cuts 30%": "budget_cuts",
-                "Latency becomes critical": "latency_critical"
-            }
+            architectures = ArchitectureSearcher(constraints, options).search()
+            if not architectures:
+                st.info("No multi-store architecture to suggest - one needs at least two compared options, one of them a primary store rather than a cache.")
             
-            scenario_results = scenario_analyzer.analyze_scenario(scenario_map[scenario])
+            for architecture in architectures:
+                st.markdown(architecture_card(architecture), unsafe_allow_html=True)
+                
+                with st.expander("💸 Combined hidden costs and anti-patterns", expanded=False):
+                    for cost in architecture["trade_offs"]["hidden_costs"]:
+                        st.markdown(f"- {cost}")
+                    for avoid in architecture["trade_offs"]["avoid_when"]:
+                        st.markdown(f"- ❌ {avoid}")
+                st.markdown("<br>", unsafe_allow_html=True)
+        
+        # ========================================================================
+        # STEP 9: What-If Scenario Analysis
+        # ========================================================================
+        if scenario != "None":
+            _, (_, scenario_results) = next(analysis_stream)
             
             # Guard against empty results
+            heading = f"---\n### 🔮 What-If Analysis: {scenario}"
             if scenario_results:
-                col1, col2 = st.columns(2)
-                
-                for idx, (col, (opt_name, result)) in enumerate(zip([col1, col2, col1, col2], scenario_results.items())):
-                    with col:
-                        st.markdown(f"""
-                        <div class="glass-card">
-                            <h4 style="color: #6A5D7B !important;">{opt_name}</h4>
-                            <p style="color: #666;">{result}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        if idx % 2 == 1:
-                            st.markdown("<br>", unsafe_allow_html=True)
+                st.markdown(heading + "\n\n" + scenario_cards(scenario_results), unsafe_allow_html=True)
             else:
+                st.markdown(heading)
                 st.warning("Scenario analysis unavailable for selected combination.")
         
         # ========================================================================
         # STEP 10: Referee Insight (Delegation)
         # ========================================================================
-        st.markdown("---")
-        st.markdown("### 🎯 Referee Insight")
+        st.markdown("---\n### 🎯 Referee Insight")
         
-        referee_insight = generate_referee_insight(
-            evaluations,
-            constraints.to_dict(),
-            options
-        )
+        _, referee_insight = next(analysis_stream)
+        next(analysis_stream, None)  # Let the stream finish (records analysis metrics)
         
-        st.markdown(f"""
-        <div class="glass-alert-success">
-            {referee_insight.replace(chr(10), '<br>')}
-        </div>
-        """, unsafe_allow_html=True)
+        with st.container(border=True):
+            st.write_stream(insight_sections(referee_insight))
+        
+        # Kept for saving to the decision history after later reruns
+        st.session_state['last_analysis'] = {
+            "constraints": constraints,
+            "fits": fits,
+            "scenario": SCENARIOS.get(scenario)
+        }
         
         # ========================================================================
         # STEP 11: Assumptions
         # ========================================================================
         with st.expander("📋 Analysis Assumptions", expanded=False):
             st.markdown("**This analysis assumes:**")
-            assumptions = [
-                "All options are managed/cloud services",
-                "Standard AWS pricing without heavy discounts",
-                "No existing infrastructure lock-in",
-                "Team can learn new technologies with time",
-                "Data sovereignty is not a constraint"
-            ]
-            for assumption in assumptions:
+            for assumption in ASSUMPTIONS:
                 st.markdown(f"- {assumption}")
         
         # ========================================================================
@@ -572,21 +847,11 @@ def main():
         st.markdown("---")
         st.markdown("### 📥 Export Decision Summary")
         
-        summary_parts = [
-            f"# Database Decision Analysis\n**Generated:** {st.session_state['analysis_timestamp']}\n\n",
-            "## Constraints\n"
-        ]
-        
-        for key, value in constraints.to_dict().items():
-            summary_parts.append(f"- **{key.title()}:** {value}\n")
-        
-        summary_parts.append("\n## Constraint Sensitivity\n")
-        for name, (impact, explanation) in sorted_sensitivities:
-            summary_parts.append(f"- **{name.title()} ({impact}):** {explanation}\n")
-        
-        summary_parts.append(f"\n## Referee Insight\n{referee_insight}\n")
-        
-        summary_text = "".join(summary_parts)
+        summary_text = render_export({
+            "constraints": {**constraints.to_dict(), **constraints.extended_dict()},
+            "sensitivities": sensitivities,
+            "insight": referee_insight
+        }, st.session_state['analysis_timestamp'])
         
         st.download_button(
             label="📄 Download Analysis (Markdown)",
@@ -594,6 +859,55 @@ def main():
             file_name="database_decision_analysis.md",
             mime="text/markdown"
         )
+        
+        # Pre-rendered copy of this exact report, when the static site is deployed -
+        # the site covers core profiles against the default catalog only
+        site_url = os.environ.get("REFEREE_SITE_URL")
+        if site_url and not constraints.extended_dict() and analysis_options is None:
+            from pipeline import profile_key
+            from static_site import page_path
+            report_path = page_path(profile_key(constraints), SCENARIOS.get(scenario))
+            st.markdown(f"[🔗 Shareable static report]({site_url.rstrip('/')}/{report_path})")
+    
+    # ========================================================================
+    # STEP 13: Cost Projection (outside the Analyze flow - inputs rerun freely)
+    # ========================================================================
+    render_cost_projection(options)
+    
+    # ========================================================================
+    # STEP 14: Constraint Interactions (precomputed over all profiles)
+    # ========================================================================
+    render_interactions(constraints)
+    
+    # ========================================================================
+    # STEP 14b: Global Sensitivity (Sobol indices over all profiles)
+    # ========================================================================
+    render_global_sensitivity()
+    
+    # ========================================================================
+    # STEP 14c: Profile Diff (today vs. another profile, from cached results)
+    # ========================================================================
+    render_profile_diff(constraints, analysis_options)
+    
+    # ========================================================================
+    # STEP 14d: Path Planner (cheapest changes to reach a target fit)
+    # ========================================================================
+    render_path_planner(constraints, analysis_options)
+    
+    # ========================================================================
+    # STEP 14e: Pareto Frontier (non-dominated options for this profile)
+    # ========================================================================
+    render_pareto(constraints, options)
+    
+    # ========================================================================
+    # STEP 15: Decision History (saved analyses across sessions)
+    # ========================================================================
+    render_decision_history(constraints)
+    
+    # ========================================================================
+    # STEP 16: Message Search (every profile, not just this one)
+    # ========================================================================
+    render_message_search(options)
     
     # ========================================================================
     # FOOTER
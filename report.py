@@ -0,0 +1,278 @@
+"""
+Report rendering for The Referee
+- Turns a pipeline analysis result into a complete Markdown or HTML report
+- Same sections as the Streamlit page, no Streamlit required
+- Deterministic output (no timestamps unless asked) so reports can be content-hashed
+"""
+
+import html
+import re
+from typing import Dict, List, Optional, Tuple
+from pipeline import SCENARIOS
+
+# Scenario key -> UI label
+SCENARIO_TITLES = {key: label for label, key in SCENARIOS.items()}
+
+FIT_LABELS = {
+    "strong_fit": "🟢 Strong Fit",
+    "moderate_fit": "🟡 Moderate Fit",
+    "risky_fit": "🔴 Risky Fit"
+}
+
+IMPACT_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+
+ASSUMPTIONS = [
+    "All options are managed/cloud services",
+    "Standard AWS pricing without heavy discounts",
+    "No existing infrastructure lock-in",
+    "Team can learn new technologies with time",
+    "Data sovereignty is not a constraint"
+]
+
+CATEGORY_TITLES = [
+    ("strengths", "✅ Strengths"),
+    ("limitations", "⚠️ Limitations"),
+    ("hidden_costs", "💸 Hidden Costs"),
+    ("avoid_when", "❌ When NOT to Choose")
+]
+
+
+def sorted_sensitivities(sensitivities: Dict[str, Tuple[str, str]]) -> List[Tuple[str, Tuple[str, str]]]:
+    """Sensitivities ordered HIGH -> LOW impact (stable within a level)"""
+    return sorted(sensitivities.items(), key=lambda item: IMPACT_ORDER[item[1][0]])
+
+
+def _title(name: str) -> str:
+    return name.replace("_", " ").title()
+
+
+# ============================================================================
+# MARKDOWN
+# ============================================================================
+
+def render_export(result: Dict, generated: str, title: str = "Database Decision Analysis") -> str:
+    """
+    The compact decision summary the app offers for download: constraints,
+    sensitivity and the Referee Insight. result needs only the constraints,
+    sensitivities and insight keys of a pipeline result.
+    """
+    parts = [f"# {title}\n**Generated:** {generated}\n\n", "## Constraints\n"]
+
+    for key, value in result["constraints"].items():
+        parts.append(f"- **{_title(key)}:** {value}\n")
+
+    parts.append("\n## Constraint Sensitivity\n")
+    for name, (impact, explanation) in sorted_sensitivities(result["sensitivities"]):
+        parts.append(f"- **{name.title()} ({impact}):** {explanation}\n")
+
+    parts.append(f"\n## Referee Insight\n{result['insight']}\n")
+    return "".join(parts)
+
+
+def render_markdown(result: Dict, options: Dict[str, Dict], scenario: Optional[str] = None,
+                    generated: Optional[str] = None) -> str:
+    """
+    Full report for one pipeline.run_analysis() result. scenario is a
+    WhatIfScenarioAnalyzer key or None; generated is an optional timestamp.
+    """
+    lines = ["# Database Decision Analysis", ""]
+    if generated:
+        lines += [f"**Generated:** {generated}", ""]
+
+    lines += ["## Constraints", ""]
+    lines += [f"- **{_title(key)}:** {value}" for key, value in result["constraints"].items()]
+
+    lines += ["", "## Trade-off Analysis"]
+    for option_name, evaluation in result["evaluations"].items():
+        option_data = options.get(option_name, {})
+        fit_level, reasoning, warning = result["fits"][option_name]
+        lines += ["", f"### {option_name}", "", f"**{FIT_LABELS[fit_level]}** - *{reasoning}*"]
+        if warning:
+            lines += ["", f"> ⚠️ **Context Switch Warning:** {warning}"]
+        if option_data:
+            lines += [
+                "",
+                f"*{option_data['description']}*",
+                "",
+                f"Type: {option_data['type']} · Pricing: {option_data['pricing_model']} · "
+                f"Setup: {option_data['setup_time']} · Scaling: {option_data['scaling_model']} · "
+                f"Consistency: {option_data['consistency']} · Complexity: {option_data['base_complexity']}"
+            ]
+        for category, title in CATEGORY_TITLES:
+            if evaluation[category]:
+                lines += ["", f"**{title}**"]
+                lines += [f"- {message}" for message in evaluation[category]]
+
+    lines += ["", "## Constraint Sensitivity", ""]
+    lines += [
+        f"- **{_title(name)} ({impact}):** {explanation}"
+        for name, (impact, explanation) in sorted_sensitivities(result["sensitivities"])
+    ]
+
+    lines += ["", "## Direct Comparisons", ""]
+    lines += [f"- {comparison}" for comparison in result["comparisons"]]
+
+    if scenario:
+        lines += ["", f"## What-If Analysis: {SCENARIO_TITLES[scenario]}", ""]
+        scenario_results = result["scenarios"].get(scenario) or {}
+        lines += [f"- **{option_name}:** {text}" for option_name, text in scenario_results.items()]
+        if not scenario_results:
+            lines.append("Scenario analysis unavailable for selected combination.")
+
+    lines += ["", "## Referee Insight", "", result["insight"].strip()]
+
+    lines += ["", "## Analysis Assumptions", ""]
+    lines += [f"- {assumption}" for assumption in ASSUMPTIONS]
+
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# HTML
+# ============================================================================
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_ITALIC = re.compile(r"(?<![*\w])\*(?!\s)(.+?)(?<!\s)\*(?![*\w])")
+_CODE = re.compile(r"`([^`]+)`")
+
+
+def _inline(text: str) -> str:
+    text = html.escape(text, quote=False)
+    text = _CODE.sub(r"<code>\1</code>", text)
+    text = _BOLD.sub(r"<strong>\1</strong>", text)
+    return _ITALIC.sub(r"<em>\1</em>", text)
+
+
+def markdown_to_html(text: str) -> str:
+    """The Markdown subset reports use: headings, lists, quotes, rules, bold/italic/code"""
+    out: List[str] = []
+    open_list = None
+
+    def close_list():
+        nonlocal open_list
+        if open_list:
+            out.append(f"</{open_list}>")
+            open_list = None
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        heading = re.match(r"(#{1,6})\s+(.*)", stripped)
+        bullet = re.match(r"[-*]\s+(.*)", stripped)
+        numbered = re.match(r"\d+\.\s+(.*)", stripped)
+
+        if bullet or numbered:
+            tag = "ul" if bullet else "ol"
+            if open_list != tag:
+                close_list()
+                out.append(f"<{tag}>")
+                open_list = tag
+            out.append(f"<li>{_inline((bullet or numbered).group(1))}</li>")
+            continue
+
+        close_list()
+        if not stripped:
+            continue
+        if heading:
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif stripped == "---":
+            out.append("<hr>")
+        elif stripped.startswith(">"):
+            out.append(f'<div class="glass-alert-warning">{_inline(stripped.lstrip("> "))}</div>')
+        else:
+            out.append(f"<p>{_inline(stripped)}</p>")
+
+    close_list()
+    return "\n".join(out)
+
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} - The Referee</title>
+<link rel="stylesheet" href="{css}">
+<style>body {{ max-width: 1100px; margin: 0 auto; padding: 2rem 1rem; }}</style>
+</head>
+<body>
+<div class="hero-section">
+<div class="hero-logo">⚖️</div>
+<h1 class="hero-title">The Referee</h1>
+<p class="hero-subtitle">Constraint-Driven Database Advisor — No Winners, Just Trade-offs</p>
+</div>
+{nav}
+{body}
+<div class="footer"><p>Rule-Driven Decision Support · Static report</p></div>
+</body>
+</html>
+"""
+
+
+def render_html(result: Dict, options: Dict[str, Dict], scenario: Optional[str] = None,
+                css_href: str = "referee.css", links: Optional[Dict[str, str]] = None) -> str:
+    """
+    Full report as a standalone HTML page styled with the app theme.
+    links maps link text -> URL for the navigation bar (other scenarios,
+    the interactive app, ...).
+    """
+    sections = []
+
+    constraint_items = "".join(
+        f"<li><strong>{_title(key)}:</strong> <code>{html.escape(value)}</code></li>"
+        for key, value in result["constraints"].items()
+    )
+    sections.append(f'<div class="glass-card"><h3>📌 Constraint Profile</h3><ul>{constraint_items}</ul></div>')
+
+    sections.append("<h2>📊 Trade-off Analysis</h2>")
+    for option_name, evaluation in result["evaluations"].items():
+        option_data = options.get(option_name, {})
+        fit_level, reasoning, warning = result["fits"][option_name]
+        badge = fit_level.replace("_fit", "")
+        parts = [
+            f"<h3>{html.escape(option_name)}</h3>",
+            f'<span class="fit-badge-{badge}">{FIT_LABELS[fit_level]}</span>',
+            f"<p><em>{_inline(reasoning)}</em></p>"
+        ]
+        if warning:
+            parts.append(
+                f'<div class="glass-alert-warning"><strong>⚠️ Context Switch Warning:</strong> {_inline(warning)}</div>'
+            )
+        if option_data:
+            parts.append(f"<p><em>{_inline(option_data['description'])}</em></p>")
+        for category, title in CATEGORY_TITLES:
+            items = "".join(f"<li>{_inline(message)}</li>" for message in evaluation[category])
+            parts.append(f"<p><strong>{title}</strong></p><ul>{items}</ul>")
+        sections.append(f'<div class="glass-card">{"".join(parts)}</div>')
+
+    sections.append("<h2>🎚️ Constraint Sensitivity Analysis</h2>")
+    for name, (impact, explanation) in sorted_sensitivities(result["sensitivities"]):
+        sections.append(
+            f'<div class="glass-alert-info"><strong>{_title(name)} ({impact}):</strong> {_inline(explanation)}</div>'
+        )
+
+    sections.append("<h2>🔄 Direct Comparisons</h2>")
+    sections += [f'<div class="glass-alert-info">{_inline(comparison)}</div>' for comparison in result["comparisons"]]
+
+    if scenario:
+        sections.append(f"<h2>🔮 What-If Analysis: {SCENARIO_TITLES[scenario]}</h2>")
+        scenario_results = result["scenarios"].get(scenario) or {}
+        for option_name, text in scenario_results.items():
+            sections.append(f'<div class="glass-card"><h4>{html.escape(option_name)}</h4><p>{_inline(text)}</p></div>')
+        if not scenario_results:
+            sections.append('<div class="glass-alert-warning">Scenario analysis unavailable for selected combination.</div>')
+
+    sections.append("<h2>🎯 Referee Insight</h2>")
+    sections.append(f'<div class="glass-alert-success">{markdown_to_html(result["insight"])}</div>')
+
+    assumptions = "".join(f"<li>{html.escape(assumption)}</li>" for assumption in ASSUMPTIONS)
+    sections.append(f"<details><summary>📋 Analysis Assumptions</summary><ul>{assumptions}</ul></details>")
+
+    nav = ""
+    if links:
+        nav = "<p>" + " · ".join(
+            f'<a href="{html.escape(url)}">{html.escape(text)}</a>' for text, url in links.items()
+        ) + "</p>"
+
+    title = SCENARIO_TITLES[scenario] if scenario else "Trade-off Analysis"
+    return _PAGE.format(title=html.escape(title), css=html.escape(css_href), nav=nav, body="\n".join(sections))
@@ -0,0 +1,286 @@
+"""
+Memory-mapped result file for The Referee
+- Every profile x option x scenario result precomputed into one binary file
+- Versioned, fixed-layout records: fit codes, message-ID ranges, string IDs
+- Shared string table - each distinct message is stored once
+- Opened with mmap: no parsing, pages shared across processes
+
+Usage:
+    python result_store.py build referee_results.bin [--workers N]
+    python result_store.py info referee_results.bin
+
+File layout (little-endian, sections 8-byte aligned):
+
+    header        HEADER struct (magic, version, counts, engine digest, offsets)
+    names         u32[n_options + n_scenarios + n_sensitivities] string IDs
+    records       RECORD[n_profiles], indexed by pipeline.profile_index()
+    message_ids   u32[n_message_ids] - lists referenced by (start, count) pairs
+    string_index  u64[n_strings + 1] byte offsets into string_data
+    string_data   UTF-8 bytes
+"""
+
+import argparse
+import mmap
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+import numpy as np
+from constraints import Constraints
+from evaluator import EVALUATION_CATEGORIES
+import pipeline
+
+MAGIC = b"REFEREE\0"
+FORMAT_VERSION = 1
+
+# magic, version, reserved, n_profiles, n_options, n_scenarios, n_sensitivities,
+# n_strings, digest, then u64 offsets: names, records, message_ids,
+# n_message_ids, string_index, string_data
+HEADER = struct.Struct("<8sHHIIIII32sQQQQQQ")
+
+FIT_LEVELS = ["strong_fit", "moderate_fit", "risky_fit"]
+IMPACT_LEVELS = ["HIGH", "MEDIUM", "LOW"]
+
+# Sensitivity keys in the order ConstraintSensitivityAnalyzer emits them
+SENSITIVITY_KEYS = [
+    "budget", "scale", "performance_priority", "team_skill",
+    "data_complexity", "time_to_market", "consistency"
+]
+
+MISSING = 0xFFFFFFFF
+
+
+def record_dtype(n_options: int, n_scenarios: int, n_sensitivities: int) -> np.dtype:
+    """Fixed-size per-profile record; (start, count) pairs index message_ids"""
+    return np.dtype([
+        ("insight", "<u4"),
+        ("comparisons", "<u4", (2,)),
+        ("sensitivity_impact", "u1", (n_sensitivities,)),
+        ("sensitivity_text", "<u4", (n_sensitivities,)),
+        ("fit_code", "u1", (n_options,)),
+        ("fit_reasoning", "<u4", (n_options,)),
+        ("fit_warning", "<u4", (n_options,)),
+        ("messages", "<u4", (n_options, len(EVALUATION_CATEGORIES), 2)),
+        ("scenario_text", "<u4", (n_scenarios, n_options))
+    ])
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+# ============================================================================
+# WRITER
+# ============================================================================
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def intern(self, text: str) -> int:
+        return self.ids.setdefault(text, len(self.ids))
+
+    def encode(self):
+        data = bytearray()
+        offsets = [0]
+        for text in self.ids:  # dicts keep insertion (= ID) order
+            data += text.encode("utf-8")
+            offsets.append(len(data))
+        return np.array(offsets, dtype="<u8"), bytes(data)
+
+
+def _analyze_index(index: int) -> Dict:
+    return pipeline.run_analysis(pipeline.profile_from_index(index))
+
+
+def build_results(path: str, workers: int = None) -> int:
+    """Precomputes every profile and writes the result file; returns its size"""
+    from options import get_database_options
+
+    option_names = list(get_database_options())
+    scenario_keys = list(pipeline.SCENARIOS.values())
+    n_profiles = pipeline.profile_count()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_analyze_index, range(n_profiles), chunksize=32))
+
+    strings = _StringTable()
+    names = [strings.intern(name) for name in option_names + scenario_keys + SENSITIVITY_KEYS]
+    message_ids: List[int] = []
+
+    def id_range(messages: List[str]):
+        start = len(message_ids)
+        message_ids.extend(strings.intern(message) for message in messages)
+        return start, len(messages)
+
+    records = np.zeros(n_profiles, dtype=record_dtype(len(option_names), len(scenario_keys), len(SENSITIVITY_KEYS)))
+    for index, result in enumerate(results):
+        record = records[index]
+        record["insight"] = strings.intern(result["insight"])
+        record["comparisons"] = id_range(result["comparisons"])
+
+        for i, key in enumerate(SENSITIVITY_KEYS):
+            impact, explanation = result["sensitivities"][key]
+            record["sensitivity_impact"][i] = IMPACT_LEVELS.index(impact)
+            record["sensitivity_text"][i] = strings.intern(explanation)
+
+        for i, option_name in enumerate(option_names):
+            fit_level, reasoning, warning = result["fits"][option_name]
+            record["fit_code"][i] = FIT_LEVELS.index(fit_level)
+            record["fit_reasoning"][i] = strings.intern(reasoning)
+            record["fit_warning"][i] = strings.intern(warning)
+            for j, category in enumerate(EVALUATION_CATEGORIES):
+                record["messages"][i, j] = id_range(result["evaluations"][option_name][category])
+
+        for s, scenario in enumerate(scenario_keys):
+            scenario_results = result["scenarios"][scenario]
+            for i, option_name in enumerate(option_names):
+                text = scenario_results.get(option_name)
+                record["scenario_text"][s, i] = MISSING if text is None else strings.intern(text)
+
+    string_index, string_data = strings.encode()
+    names = np.array(names, dtype="<u4")
+    message_ids = np.array(message_ids, dtype="<u4")
+
+    # Section offsets
+    names_offset = _align(HEADER.size)
+    records_offset = _align(names_offset + names.nbytes)
+    ids_offset = _align(records_offset + records.nbytes)
+    string_index_offset = _align(ids_offset + message_ids.nbytes)
+    string_data_offset = _align(string_index_offset + string_index.nbytes)
+
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0,
+        n_profiles, len(option_names), len(scenario_keys), len(SENSITIVITY_KEYS),
+        len(strings.ids), bytes.fromhex(pipeline.engine_digest()),
+        names_offset, records_offset, ids_offset, len(message_ids),
+        string_index_offset, string_data_offset
+    )
+
+    with open(path, "wb") as f:
+        for offset, payload in ((0, header),
+                                (names_offset, names.tobytes()),
+                                (records_offset, records.tobytes()),
+                                (ids_offset, message_ids.tobytes()),
+                                (string_index_offset, string_index.tobytes()),
+                                (string_data_offset, string_data)):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(payload)
+        return f.tell()
+
+
+# ============================================================================
+# READER
+# ============================================================================
+
+class ResultStore:
+    """
+    Read-only view over a result file. Opening maps the file and builds numpy
+    views over it - no records are parsed, so startup cost does not depend on
+    the number of profiles. Strings are decoded on lookup.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        (magic, version, _, self.n_profiles, n_options, n_scenarios, n_sensitivities,
+         n_strings, digest, names_offset, records_offset, ids_offset, n_message_ids,
+         string_index_offset, string_data_offset) = HEADER.unpack_from(buffer, 0)
+
+        if magic != MAGIC:
+            raise ValueError("Not a Referee result file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported result file version {version} (expected {FORMAT_VERSION})")
+
+        self.digest = digest.hex()
+        names = np.frombuffer(buffer, "<u4", n_options + n_scenarios + n_sensitivities, names_offset)
+        self.records = np.frombuffer(
+            buffer, record_dtype(n_options, n_scenarios, n_sensitivities), self.n_profiles, records_offset
+        )
+        self.message_ids = np.frombuffer(buffer, "<u4", n_message_ids, ids_offset)
+        self.string_index = np.frombuffer(buffer, "<u8", n_strings + 1, string_index_offset)
+        self.string_data_offset = string_data_offset
+
+        self.option_names = [self.string(i) for i in names[:n_options]]
+        self.scenario_keys = [self.string(i) for i in names[n_options:n_options + n_scenarios]]
+        self.sensitivity_keys = [self.string(i) for i in names[n_options + n_scenarios:]]
+
+    @classmethod
+    def open(cls, path: str) -> "ResultStore":
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def string(self, string_id: int) -> str:
+        start = self.string_data_offset + int(self.string_index[string_id])
+        end = self.string_data_offset + int(self.string_index[string_id + 1])
+        return self.buffer[start:end].decode("utf-8")
+
+    def messages(self, id_range) -> List[str]:
+        start, count = int(id_range[0]), int(id_range[1])
+        return [self.string(i) for i in self.message_ids[start:start + count]]
+
+    def lookup(self, constraints: Constraints) -> Dict:
+        """Same structure as pipeline.run_analysis()"""
+        return self.lookup_index(pipeline.profile_index(constraints))
+
+    def lookup_index(self, index: int) -> Dict:
+        record = self.records[index]
+        constraints = pipeline.profile_from_index(index)
+
+        return {
+            "constraints": constraints.to_dict(),
+            "evaluations": {
+                option_name: {
+                    category: self.messages(record["messages"][i, j])
+                    for j, category in enumerate(EVALUATION_CATEGORIES)
+                }
+                for i, option_name in enumerate(self.option_names)
+            },
+            "fits": {
+                option_name: (
+                    FIT_LEVELS[record["fit_code"][i]],
+                    self.string(record["fit_reasoning"][i]),
+                    self.string(record["fit_warning"][i])
+                )
+                for i, option_name in enumerate(self.option_names)
+            },
+            "sensitivities": {
+                key: (IMPACT_LEVELS[record["sensitivity_impact"][i]], self.string(record["sensitivity_text"][i]))
+                for i, key in enumerate(self.sensitivity_keys)
+            },
+            "comparisons": self.messages(record["comparisons"]),
+            "scenarios": {
+                scenario: {
+                    option_name: self.string(record["scenario_text"][s, i])
+                    for i, option_name in enumerate(self.option_names)
+                    if record["scenario_text"][s, i] != MISSING
+                }
+                for s, scenario in enumerate(self.scenario_keys)
+            },
+            "insight": self.string(record["insight"])
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect a precomputed result file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Precompute every profile into a result file")
+    build.add_argument("path")
+    build.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    info = subparsers.add_parser("info", help="Show a result file's header")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        size = build_results(args.path, args.workers)
+        print(f"Wrote {args.path} ({size:,} bytes)")
+    else:
+        store = ResultStore.open(args.path)
+        print(f"Profiles: {store.n_profiles}")
+        print(f"Options: {', '.join(store.option_names)}")
+        print(f"Scenarios: {', '.join(store.scenario_keys)}")
+        print(f"Strings: {len(store.string_index) - 1}")
+        print(f"Engine digest: {store.digest}")
+        print(f"Current: {store.digest == pipeline.engine_digest()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Rule base consistency audit for The Referee
+- Sweeps every profile x option x scenario across a process pool, then the
+  profiles again with each extended constraint value set on its own
+  (pipeline.sweep_profile), and flags:
+  - contradictions: one message in two categories of the same evaluation
+  - strong fits the evaluator says to avoid (AVOID_WHEN_LIMIT or more
+    avoid-when items)
+  - fit levels that disagree with the evaluator's message balance
+  - options missing from a scenario's results
+- Checks the rule files themselves for rules no option can ever trigger and
+  messages filed under different categories by different rules
+- Compact report grouped by finding; exits 1 on errors so it can gate
+  every rule change (--strict: on warnings too)
+
+Usage:
+    python rule_audit.py [--workers N] [--strict] [--json] [--limit 10]
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import pipeline
+
+# A strong fit with at least this many avoid-when items is flagged
+AVOID_WHEN_LIMIT = 2
+
+# Finding kind -> severity; errors fail the audit, warnings only with --strict
+FINDINGS = {
+    "contradiction": "error",
+    "conflicting_message": "error",
+    "unreachable_rule": "error",
+    "scenario_gap": "error",
+    "strong_fit_avoided": "warning",
+    "fit_balance": "warning"
+}
+
+# ============================================================================
+# PROFILE SWEEP
+# ============================================================================
+
+def _audit_result(result: Dict) -> List[Tuple[str, str, str]]:
+    """(kind, option, detail) for every finding in one run_analysis() result"""
+    from evaluator import score_evaluation
+
+    findings = []
+    for option_name, (fit_level, _, _) in result["fits"].items():
+        evaluation = result["evaluations"][option_name]
+
+        categories: Dict[str, List[str]] = {}
+        for category, messages in evaluation.items():
+            for message in dict.fromkeys(messages):
+                categories.setdefault(message, []).append(category)
+        for message, found_in in categories.items():
+            if len(found_in) > 1:
+                findings.append(("contradiction", option_name, f"{' + '.join(found_in)}: {message}"))
+
+        avoid_when = len(evaluation["avoid_when"])
+        if fit_level == "strong_fit" and avoid_when >= AVOID_WHEN_LIMIT:
+            findings.append(("strong_fit_avoided", option_name, f"strong_fit with {avoid_when} avoid-when items"))
+
+        score = score_evaluation(evaluation)
+        if fit_level == "strong_fit" and score < 0:
+            findings.append(("fit_balance", option_name, "strong_fit but messages lean negative"))
+        elif fit_level == "risky_fit" and score > 0:
+            findings.append(("fit_balance", option_name, "risky_fit but messages lean positive"))
+
+    for scenario, scenario_results in result["scenarios"].items():
+        for option_name in result["fits"]:
+            if not (scenario_results or {}).get(option_name):
+                findings.append(("scenario_gap", option_name, f"no {scenario} result"))
+    return findings
+
+
+def _audit_profile(index: int) -> List[Tuple[str, str, str]]:
+    return _audit_result(pipeline.run_analysis(pipeline.sweep_profile(index)))
+
+
+def sweep(workers: Optional[int] = None) -> Dict[Tuple[str, str, str], List[int]]:
+    """Every finding across the sweep -> the sweep positions it occurs in"""
+    indices = range(pipeline.sweep_count())
+    if workers == 1:
+        per_profile = [_audit_profile(index) for index in indices]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            per_profile = list(executor.map(_audit_profile, indices, chunksize=32))
+
+    occurrences: Dict[Tuple[str, str, str], List[int]] = defaultdict(list)
+    for index, findings in enumerate(per_profile):
+        for finding in findings:
+            occurrences[finding].append(index)
+    return occurrences
+
+
+# ============================================================================
+# RULE FILE CHECKS
+# ============================================================================
+
+def audit_rules(rules=None, options: Optional[Dict[str, Dict]] = None) -> List[Tuple[str, str, str]]:
+    """
+    Static checks of the compiled rules: (kind, section, detail). A section's
+    output depends only on (option, value), so a rule no catalog option
+    matches can never fire under any profile.
+    """
+    from options import get_database_options
+    from evaluator import active_rules
+
+    rules = rules or active_rules()
+    options = options if options is not None else get_database_options()
+    findings = []
+    filed_under: Dict[str, Dict[str, str]] = defaultdict(dict)  # message -> {category: section}
+
+    for name, section in rules.sections.items():
+        seen = set()
+        for rule in (rule for rules_for_value in section.index.values() for rule in rules_for_value):
+            if id(rule) in seen:
+                continue
+            seen.add(id(rule))
+            for category, messages in rule.additions:
+                for message in messages:
+                    filed_under[message].setdefault(category, name)
+            if not any(rule.matches(option_name, option_data) for option_name, option_data in options.items()):
+                first = rule.additions[0][1][0]
+                findings.append(("unreachable_rule", name, f"no option matches the rule adding {first!r}"))
+
+    for message, categories in filed_under.items():
+        if len(categories) > 1:
+            where = ", ".join(f"{category} ({section})" for category, section in categories.items())
+            findings.append(("conflicting_message", "rules", f"{message!r} is filed under {where}"))
+    return findings
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def run_audit(workers: Optional[int] = None) -> Dict:
+    """Static checks plus the full sweep, grouped into report entries"""
+    start = time.perf_counter()
+    entries = [
+        {"kind": kind, "severity": FINDINGS[kind], "subject": subject, "detail": detail, "profiles": 0, "example": None}
+        for kind, subject, detail in audit_rules()
+    ]
+    for (kind, option_name, detail), indices in sweep(workers).items():
+        entries.append({
+            "kind": kind,
+            "severity": FINDINGS[kind],
+            "subject": option_name,
+            "detail": detail,
+            "profiles": len(indices),
+            "example": pipeline.profile_key(pipeline.sweep_profile(indices[0]))
+        })
+
+    entries.sort(key=lambda e: (e["severity"] != "error", e["kind"], -e["profiles"], e["subject"]))
+    return {
+        "profiles": pipeline.sweep_count(),
+        "rules_version": pipeline.rules_version(),
+        "seconds": round(time.perf_counter() - start, 2),
+        "errors": sum(e["severity"] == "error" for e in entries),
+        "warnings": sum(e["severity"] == "warning" for e in entries),
+        "findings": entries
+    }
+
+
+def render_report(audit: Dict, limit: int = 10) -> str:
+    """Compact text report: counts per kind, then the top entries of each"""
+    lines = [
+        f"Audited {audit['profiles']} profiles, rules {audit['rules_version']} in {audit['seconds']:.2f}s: "
+        f"{audit['errors']} errors, {audit['warnings']} warnings"
+    ]
+    by_kind: Dict[str, List[Dict]] = defaultdict(list)
+    for entry in audit["findings"]:
+        by_kind[entry["kind"]].append(entry)
+
+    for kind, entries in by_kind.items():
+        lines.append(f"\n{FINDINGS[kind].upper()} {kind} ({len(entries)})")
+        for entry in entries[:limit]:
+            where = f" in {entry['profiles']} profiles, e.g. {entry['example']}" if entry["profiles"] else ""
+            lines.append(f"    {entry['subject']}: {entry['detail']}{where}")
+        if len(entries) > limit:
+            lines.append(f"    ... {len(entries) - limit} more (--limit)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep the rule base for contradictions and dead rules")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--strict", action="store_true", help="Fail on warnings as well as errors")
+    parser.add_argument("--json", action="store_true", help="Print the audit as JSON")
+    parser.add_argument("--limit", type=int, default=10, help="Entries to print per finding kind")
+    args = parser.parse_args()
+
+    audit = run_audit(args.workers)
+    if args.json:
+        print(json.dumps(audit, indent=2, ensure_ascii=False))
+    else:
+        print(render_report(audit, args.limit))
+    sys.exit(1 if audit["errors"] or (args.strict and audit["warnings"]) else 0)
+
+
+if __name__ == "__main__":
+    main()
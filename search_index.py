@@ -0,0 +1,364 @@
+"""
+Full-text search for The Referee
+- Inverted index over every message the engine can emit, built once from a
+  sweep of all profiles x scenarios (see snapshot.py), plus the profiles
+  again with each extended constraint value set on its own
+  (pipeline.sweep_profile)
+- Each message is linked to its option, category and the constraint values
+  that trigger it
+- Ranked BM25 keyword search with prefix matching; queries answer in well
+  under a millisecond
+
+Usage:
+    python search_index.py "schema migrations" [--option DynamoDB] [--stage evaluations] [--json]
+"""
+
+import argparse
+import bisect
+import heapq
+import itertools
+import json
+import math
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import pipeline
+from constraints import EXTENDED_DEFAULTS, EXTENDED_FIELDS
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Weight of a vocabulary term matched by prefix rather than exactly
+PREFIX_WEIGHT = 0.6
+MAX_EXPANSIONS = 50
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by can do does for from how in is it of on or the to "
+    "we what when where which who why with about any mention mentions say says".split()
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_MARKDOWN = re.compile(r"[*_`#>]+")
+
+# ============================================================================
+# TOKENIZER
+# ============================================================================
+
+def _normalize(token: str) -> str:
+    """Folds simple plurals so "migrations" finds "migration" and "GSIs" finds "GSI" """
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [_normalize(token) for token in _TOKEN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def _plain(text: str) -> str:
+    return _MARKDOWN.sub("", text).strip(" -")
+
+
+# ============================================================================
+# DOCUMENTS
+# ============================================================================
+
+def insight_messages(insight: str) -> Iterator[Tuple[str, str]]:
+    """(section, line) for every content line of a Referee Insight"""
+    section = ""
+    for line in insight.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped == "---":
+            continue
+        if stripped.startswith("#"):
+            section = _plain(stripped)
+            continue
+        if stripped.startswith("**") and stripped.rstrip("*").endswith(":") and stripped.count("**") == 2:
+            section = _plain(stripped).rstrip(":")
+            continue
+        yield section, _plain(re.sub(r"^\d+\.\s+", "", stripped))
+
+
+def _leaf_messages(stage: str, item: str, value) -> Iterator[Tuple[Optional[str], str, str]]:
+    """(option, category, text) for every message in one snapshot leaf"""
+    if stage == "fits":
+        level, reasoning, warning = value
+        yield item, level, reasoning
+        if warning:
+            yield item, "context_warning", warning
+    elif stage == "evaluations":
+        option_name, category = item.split(" / ")
+        for message in value:
+            yield option_name, category, message
+    elif stage == "sensitivities":
+        impact, explanation = value
+        yield None, f"{item} ({impact})", explanation
+    elif stage == "comparisons":
+        for comparison in value:
+            yield None, "comparison", _plain(comparison)
+    elif stage == "scenarios":
+        scenario, option_name = item.split(" / ")
+        yield option_name, scenario, _plain(value)
+    elif stage == "insight":
+        for section, line in insight_messages(value):
+            yield None, section, line
+
+
+def _sweep_leaves(index: int) -> List[Tuple[str, str, str]]:
+    """Snapshot leaves of one sweep position (see snapshot._leaves)"""
+    from snapshot import _leaves
+    return list(_leaves(pipeline.run_analysis(pipeline.sweep_profile(index))))
+
+
+def _bitmask(indices: List[int]) -> int:
+    """Integer with the given bits set, built in one pass instead of an OR per bit"""
+    bits = bytearray((max(indices, default=-1) >> 3) + 1)
+    for index in indices:
+        bits[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(bits, "little")
+
+
+# ============================================================================
+# SEARCH INDEX
+# ============================================================================
+
+class SearchIndex:
+    """
+    Inverted index over distinct messages. A document is one (stage, option,
+    category, text); its profiles are kept as a bitmask over sweep positions
+    (pipeline.sweep_profile) - core profiles only when profiles=profile_count().
+    """
+
+    def __init__(self, documents: List[Dict], masks: List[int], profiles: Optional[int] = None):
+        self.documents = documents
+        self.masks = masks
+        self.profile_total = profiles or pipeline.profile_count()
+
+        # (field, value) -> bitmask of profiles with that value; extended
+        # fields only once the sweep covers them
+        fields = list(pipeline.PROFILE_KEYS)
+        if self.profile_total > pipeline.profile_count():
+            fields += list(EXTENDED_FIELDS)
+        positions: Dict[str, Dict[str, List[int]]] = {field: {} for field in fields}
+        for index in range(self.profile_total):
+            constraints = pipeline.sweep_profile(index)
+            values = {**constraints.to_dict(), **{field: getattr(constraints, field).value for field in EXTENDED_FIELDS}}
+            for field in fields:
+                positions[field].setdefault(values[field], []).append(index)
+        self.value_masks: Dict[str, Dict[str, int]] = {
+            field: {value: _bitmask(indices) for value, indices in by_value.items()}
+            for field, by_value in positions.items()
+        }
+
+        # term -> {doc id: BM25 weight}, precomputed so a query only sums
+        lengths, counts = [], []
+        for doc in documents:
+            tokens = tokenize(" ".join(filter(None, [doc["text"], doc["option"], doc["category"]])))
+            lengths.append(len(tokens))
+            counts.append({token: tokens.count(token) for token in set(tokens)})
+        average = sum(lengths) / max(len(lengths), 1)
+
+        document_frequency: Dict[str, int] = {}
+        for term_counts in counts:
+            for term in term_counts:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        self.postings: Dict[str, Dict[int, float]] = {}
+        for doc_id, term_counts in enumerate(counts):
+            norm = K1 * (1 - B + B * lengths[doc_id] / average)
+            for term, tf in term_counts.items():
+                idf = math.log(1 + (len(documents) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+                self.postings.setdefault(term, {})[doc_id] = idf * tf * (K1 + 1) / (tf + norm)
+        self.vocabulary = sorted(self.postings)
+
+    @classmethod
+    def from_leaves(cls, sweeps: Iterable[Tuple[int, Iterable[Tuple[str, str, str]]]],
+                    profiles: Optional[int] = None) -> "SearchIndex":
+        """Indexes (sweep position, [(stage, item, JSON content), ...]) pairs"""
+        documents: List[Dict] = []
+        positions: List[List[int]] = []
+        doc_ids: Dict[Tuple, int] = {}
+        decoded: Dict[Tuple[str, str, str], List] = {}
+
+        for index, leaves in sweeps:
+            for leaf in leaves:
+                if leaf not in decoded:
+                    stage, item, content = leaf
+                    decoded[leaf] = list(_leaf_messages(stage, item, json.loads(content)))
+                for option_name, category, text in decoded[leaf]:
+                    identity = (leaf[0], option_name, category, text)
+                    if identity not in doc_ids:
+                        doc_ids[identity] = len(documents)
+                        documents.append({"stage": leaf[0], "option": option_name, "category": category, "text": text})
+                        positions.append([])
+                    positions[doc_ids[identity]].append(index)
+        return cls(documents, [_bitmask(indices) for indices in positions], profiles)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, extended: Iterable[Tuple[int, Iterable[Tuple[str, str, str]]]] = (),
+                      profiles: Optional[int] = None) -> "SearchIndex":
+        """Indexes a snapshot's core profiles, plus any extended sweep positions"""
+        def core():
+            for key, profile in snapshot.profiles.items():
+                yield pipeline.profile_index(pipeline.profile_from_key(key)), (
+                    (stage, item, snapshot.strings[string_id])
+                    for stage, node in profile["stages"].items()
+                    for item, string_id in node["items"].items()
+                )
+        return cls.from_leaves(itertools.chain(core(), extended), profiles)
+
+    @classmethod
+    def build(cls, workers: Optional[int] = None) -> "SearchIndex":
+        """Sweeps the engine as it is now and indexes everything it emits, extended rules included"""
+        from snapshot import Snapshot
+        indices = range(pipeline.profile_count(), pipeline.sweep_count())
+        if workers == 1:
+            extended = map(_sweep_leaves, indices)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                extended = list(executor.map(_sweep_leaves, indices, chunksize=64))
+        return cls.from_snapshot(Snapshot.take(workers), zip(indices, extended), pipeline.sweep_count())
+
+    def _expand(self, term: str) -> Iterator[Tuple[str, float]]:
+        """Vocabulary terms a query term matches: itself, then prefix completions"""
+        if term in self.postings:
+            yield term, 1.0
+        if len(term) < 2:
+            return
+        start = bisect.bisect_right(self.vocabulary, term)
+        for candidate in self.vocabulary[start:start + MAX_EXPANSIONS]:
+            if not candidate.startswith(term):
+                break
+            yield candidate, PREFIX_WEIGHT
+
+    def triggers(self, doc_id: int) -> Tuple[Dict[str, List[str]], bool]:
+        """
+        Constraint values under which a message appears: fields restricted to
+        a subset of their values, and whether those restrictions alone
+        explain every profile it appears in (False: only some combinations).
+        """
+        mask = self.masks[doc_id]
+        # The sweep sets one extended value at a time, so once a message needs
+        # an extended value the other extended fields were only seen at default
+        defaults = {field: default.value for field, default in EXTENDED_DEFAULTS.items() if field in self.value_masks}
+        unseen = any(not mask & self.value_masks[field][default] for field, default in defaults.items())
+
+        when: Dict[str, List[str]] = {}
+        explained = (1 << self.profile_total) - 1
+        for field, masks_by_value in self.value_masks.items():
+            values = [value for value, value_mask in masks_by_value.items() if mask & value_mask]
+            if unseen and values == [defaults.get(field)]:
+                continue
+            if len(values) < len(masks_by_value):
+                when[field] = values
+                union = 0
+                for value in values:
+                    union |= masks_by_value[value]
+                explained &= union
+        return when, explained == mask
+
+    def search(self, query: str, limit: int = 10, option: Optional[str] = None,
+               stage: Optional[str] = None) -> List[Dict]:
+        """
+        Ranked matches for a keyword query. Every term also matches as a
+        prefix; documents matching more query terms rank first, then by BM25.
+        """
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            best: Dict[int, float] = {}
+            for candidate, weight in self._expand(term):
+                for doc_id, score in self.postings[candidate].items():
+                    if score * weight > best.get(doc_id, 0.0):
+                        best[doc_id] = score * weight
+            for doc_id, score in best.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+                matched[doc_id] = matched.get(doc_id, 0) + 1
+
+        candidates = (
+            doc_id for doc_id in scores
+            if (option is None or self.documents[doc_id]["option"] == option)
+            and (stage is None or self.documents[doc_id]["stage"] == stage)
+        )
+        top = heapq.nlargest(limit, candidates, key=lambda doc_id: (matched[doc_id], scores[doc_id]))
+
+        results = []
+        for doc_id in top:
+            when, exact = self.triggers(doc_id)
+            results.append({
+                **self.documents[doc_id],
+                "when": when,
+                "exact": exact,
+                "profiles": bin(self.masks[doc_id]).count("1"),
+                "score": round(scores[doc_id], 4)
+            })
+        return results
+
+
+@lru_cache(maxsize=2)
+def default_index(rules_version: Optional[str] = None) -> SearchIndex:
+    """Index of the current engine, built in-process once per rule set"""
+    return SearchIndex.build(workers=1)
+
+
+def search(query: str, limit: int = 10, option: Optional[str] = None, stage: Optional[str] = None) -> List[Dict]:
+    """Searches everything the engine (with the active rules) can say"""
+    from evaluator import active_rules
+    return default_index(active_rules().version).search(query, limit, option, stage)
+
+
+def describe_triggers(result: Dict) -> str:
+    """Human-readable trigger conditions of one search result"""
+    if not result["when"]:
+        return "every profile" if result["exact"] else "some constraint combinations"
+    conditions = " · ".join(
+        f"{field.replace('_', ' ')} = {' / '.join(values)}" for field, values in result["when"].items()
+    )
+    return conditions if result["exact"] else f"some combinations with {conditions}"
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    from snapshot import STAGES
+
+    parser = argparse.ArgumentParser(description="Search every message the Referee can emit")
+    parser.add_argument("query")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--option", help="Only messages about this option")
+    parser.add_argument("--stage", choices=STAGES, help="Only messages from this stage")
+    parser.add_argument("--snapshot", help="Index a saved snapshot instead of sweeping the engine")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.snapshot:
+        from snapshot import Snapshot
+        index = SearchIndex.from_snapshot(Snapshot.load(args.snapshot))
+    else:
+        index = SearchIndex.build()
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = index.search(args.query, args.limit, args.option, args.stage)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    print(f"{len(index.documents)} messages indexed in {built:.2f}s; "
+          f"{len(results)} results in {elapsed * 1000:.3f} ms")
+    for result in results:
+        where = " · ".join(filter(None, [result["option"], result["stage"], result["category"]]))
+        print(f"\n[{where}] {result['text']}")
+        print(f"    when: {describe_triggers(result)} ({result['profiles']} of {index.profile_total} profiles)")
+
+
+if __name__ == "__main__":
+    main()
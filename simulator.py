@@ -0,0 +1,217 @@
+"""
+Traffic simulator for The Referee
+- Queueing model of each option's service-time distribution
+- Capacity growth driven by the catalog's scaling_model
+- Arrival-rate ramps with p50/p99 latency and saturation points
+
+Latency uses the Sakasegawa approximation for a G/G/c queue: the probability
+of waiting is rho^(sqrt(2(c+1)) - 1), the conditional wait is exponential with
+mean (1 + cv^2)/2 * S / (c(1 - rho)), and service time is lognormal with the
+catalog's mean and coefficient of variation. Whenever arrivals outrun capacity
+(during a resize, a failover or at the scaling ceiling) the excess queues as a
+backlog that adds backlog / capacity seconds to every request; requests that
+could not be served within REQUEST_TIMEOUT_S are dropped and counted as failed.
+"""
+
+from functools import lru_cache
+from statistics import NormalDist
+from typing import Dict
+import numpy as np
+from options import get_database_options, get_scaling_models
+from metrics import CACHE_REQUESTS
+
+# Base traffic (requests/second) and hot working set (GB) implied by each Scale value
+SCALE_BASE_RPS = {"small": 200.0, "medium": 2000.0, "massive": 20000.0}
+SCALE_WORKING_SET_GB = {"small": 1.0, "medium": 8.0, "massive": 200.0}
+
+REQUEST_TIMEOUT_S = 30.0
+
+Z_P99 = NormalDist().inv_cdf(0.99)
+
+# ============================================================================
+# TRAFFIC SIMULATOR
+# ============================================================================
+
+class TrafficSimulator:
+    """Simulates every option's latency and capacity under an arrival-rate ramp"""
+
+    def __init__(self, options: Dict[str, Dict] = None, dt: float = 1.0):
+        options = options if options is not None else get_database_options()
+        scaling_models = get_scaling_models()
+
+        self.names = [name for name, data in options.items() if "performance_model" in data]
+        self.dt = dt
+
+        def column(values) -> np.ndarray:
+            return np.array(values, dtype=float)[:, None]
+
+        performance = [options[name]["performance_model"] for name in self.names]
+        scaling = [scaling_models[options[name]["scaling_model"]] for name in self.names]
+
+        self.service_s = column([p["service_time_ms"] / 1000 for p in performance])
+        self.service_cv = column([p["service_time_cv"] for p in performance])
+        self.node_capacity = column([p["node_capacity_rps"] or np.nan for p in performance])
+        self.memory_gb = column([p["memory_gb_per_node"] or np.nan for p in performance])
+        self.scale_out_at = column([s["scale_out_at"] for s in scaling])
+        self.resize_delay_s = column([s["resize_delay_s"] for s in scaling])
+        self.failover_s = column([s["failover_s"] for s in scaling])
+        self.step_factor = column([s["step_factor"] for s in scaling])
+        self.max_steps = column([s["max_steps"] for s in scaling])
+        self.headroom = column([s["initial_headroom"] or np.nan for s in scaling])
+        self.in_memory = column([s["in_memory"] for s in scaling]).astype(bool)
+
+        # Lognormal service time parameters
+        sigma_sq = np.log1p(self.service_cv ** 2)
+        self.service_mu = np.log(self.service_s) - sigma_sq / 2
+        self.service_sigma = np.sqrt(sigma_sq)
+
+    def simulate(self, base_rps, working_set_gb, multiplier: float = 10.0,
+                 ramp_s: float = 300.0, hold_s: float = 1800.0,
+                 working_set_growth: float = 0.0) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Ramps arrivals linearly from base_rps to multiplier x base_rps over
+        ramp_s seconds, then holds for hold_s seconds. base_rps and
+        working_set_gb may be arrays (broadcast together); every metric comes
+        back with that shape, per option. The working set stays at
+        working_set_gb unless working_set_growth is set: it then grows by that
+        fraction of the traffic growth (1.0: in step with arrivals).
+
+        - baseline_p50_ms / baseline_p99_ms: latency before the ramp
+        - p50_ms / p99_ms: latency at the end of the hold
+        - worst_p99_ms: worst p99 seen at any point
+        - saturation_rps: arrival rate at which initial capacity saturates
+        - final_capacity_rps: capacity after all scaling completed
+        - saturated_s: seconds spent with arrivals above live capacity
+        - recovery_s: seconds after the ramp ends until the backlog cleared
+        - memory_exceeded_s: seconds the working set did not fit in RAM
+        - failed_pct: share of requests that timed out in the backlog
+        """
+        base_rps, working_set_gb = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(base_rps, dtype=float)),
+            np.atleast_1d(np.asarray(working_set_gb, dtype=float))
+        )
+        shape = base_rps.shape
+        base_rps = base_rps.reshape(1, -1)
+        working_set_gb = working_set_gb.reshape(1, -1)
+        grid = (len(self.names), base_rps.shape[1])
+
+        # Initial capacity: enough nodes to keep base traffic (and, in memory,
+        # the working set) under the scale-out threshold, plus any headroom
+        # the scaling model keeps relative to traffic.
+        sized = np.maximum(
+            np.ceil(base_rps / (self.node_capacity * self.scale_out_at)),
+            np.where(self.in_memory, np.ceil(working_set_gb / (self.memory_gb * self.scale_out_at)), 1.0)
+        ) * self.node_capacity
+        capacity = np.broadcast_to(np.fmax(sized, self.headroom * base_rps), grid).copy()
+        saturation_rps = capacity.copy()
+        memory_per_rps = np.where(self.in_memory, self.memory_gb / self.node_capacity, np.nan)
+
+        steps_taken = np.zeros(grid)
+        resize_done_at = np.full(grid, np.inf)
+        backlog = np.zeros(grid)
+        saturated_s = np.zeros(grid)
+        memory_exceeded_s = np.zeros(grid)
+        recovered_at = np.zeros(grid)
+        worst_p99 = np.zeros(grid)
+        failed = np.zeros(grid)
+
+        times = np.arange(0.0, ramp_s + hold_s, self.dt)
+        rates = base_rps * (1 + (multiplier - 1) * np.clip(times / ramp_s, 0, 1))[:, None, None]
+        baseline = self._latency(np.broadcast_to(base_rps, grid), capacity, backlog)
+
+        for t, arrivals in zip(times, rates):
+            working_set = working_set_gb * (1 + working_set_growth * (arrivals / base_rps - 1))
+            memory_utilisation = working_set / (capacity * memory_per_rps)
+
+            # Complete resizes that are due, then trigger new ones
+            done = t >= resize_done_at
+            capacity = np.where(done, capacity * self.step_factor, capacity)
+            steps_taken += done
+            resize_done_at = np.where(done, np.inf, resize_done_at)
+
+            pressure = np.maximum(arrivals / capacity, np.nan_to_num(memory_utilisation))
+            trigger = (pressure > self.scale_out_at) & np.isinf(resize_done_at) & (steps_taken < self.max_steps)
+            resize_done_at = np.where(trigger, t + self.resize_delay_s, resize_done_at)
+
+            # Failover at the tail of a resize takes capacity offline
+            failing_over = (t >= resize_done_at - self.failover_s) & (t < resize_done_at)
+            live = np.where(failing_over, 0.0, capacity)
+
+            backlog = np.maximum(0.0, backlog + (arrivals - live) * self.dt)
+            timed_out = np.maximum(0.0, backlog - capacity * REQUEST_TIMEOUT_S)
+            failed += timed_out
+            backlog -= timed_out
+            saturated_s += (arrivals >= live) * self.dt
+            memory_exceeded_s += (np.nan_to_num(memory_utilisation) > 1) * self.dt
+            recovered_at = np.where(backlog > 0, t + self.dt, recovered_at)
+
+            _, p99 = self._latency(arrivals, capacity, backlog)
+            worst_p99 = np.maximum(worst_p99, p99)
+
+        p50, p99 = self._latency(np.broadcast_to(rates[-1], grid), capacity, backlog)
+
+        metrics = {
+            "baseline_p50_ms": baseline[0] * 1000,
+            "baseline_p99_ms": baseline[1] * 1000,
+            "p50_ms": p50 * 1000,
+            "p99_ms": p99 * 1000,
+            "worst_p99_ms": worst_p99 * 1000,
+            "saturation_rps": saturation_rps,
+            "final_capacity_rps": capacity,
+            "saturated_s": saturated_s,
+            "recovery_s": np.maximum(0.0, recovered_at - ramp_s),
+            "memory_exceeded_s": memory_exceeded_s,
+            "failed_pct": 100 * failed / (rates.sum(axis=0) * self.dt)
+        }
+        return {
+            name: {key: values[i].reshape(shape) for key, values in metrics.items()}
+            for i, name in enumerate(self.names)
+        }
+
+    def _latency(self, arrivals: np.ndarray, capacity: np.ndarray, backlog: np.ndarray):
+        """Returns (p50, p99) response time in seconds"""
+        servers = np.maximum(capacity * self.service_s, 1e-9)
+        rho = np.clip(arrivals / np.maximum(capacity, 1e-9), 0.0, 0.999)
+
+        p_wait = rho ** (np.sqrt(2 * (servers + 1)) - 1)
+        conditional_wait = (1 + self.service_cv ** 2) / 2 * self.service_s / (servers * (1 - rho))
+        backlog_wait = backlog / np.maximum(capacity, 1e-9)
+
+        quantiles = []
+        for q, z in ((0.50, 0.0), (0.99, Z_P99)):
+            service = np.exp(self.service_mu + z * self.service_sigma)
+            wait = np.where(p_wait > 1 - q, conditional_wait * np.log(p_wait / (1 - q)), 0.0)
+            quantiles.append(service + wait + backlog_wait)
+        return quantiles
+
+
+def simulate_traffic_spike(constraints_dict: Dict[str, str], multiplier: float = 10.0,
+                           options: Dict[str, Dict] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Simulates a traffic spike from the profile's scale, one result per option.
+    Only the scale matters, so runs against the default catalog are memoized.
+    """
+    if options is None:
+        hits = _simulate_default_catalog.cache_info().hits
+        results = _simulate_default_catalog(constraints_dict["scale"], multiplier)
+        hit = _simulate_default_catalog.cache_info().hits > hits
+        CACHE_REQUESTS.inc(cache="traffic_simulation", result="hit" if hit else "miss")
+        return results
+    return _simulate(options, constraints_dict["scale"], multiplier)
+
+
+@lru_cache(maxsize=None)
+def _simulate_default_catalog(scale: str, multiplier: float) -> Dict[str, Dict[str, float]]:
+    return _simulate(None, scale, multiplier)
+
+
+def _simulate(options: Dict[str, Dict], scale: str, multiplier: float) -> Dict[str, Dict[str, float]]:
+    results = TrafficSimulator(options).simulate(
+        SCALE_BASE_RPS[scale],
+        SCALE_WORKING_SET_GB[scale],
+        multiplier=multiplier
+    )
+    return {
+        name: {key: float(values[0]) for key, values in metrics.items()}
+        for name, metrics in results.items()
+    }
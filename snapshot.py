@@ -0,0 +1,287 @@
+"""
+Regression snapshots for The Referee
+- Runs every stage for all profiles x scenarios across a process pool
+- Content-hashes every output into a hash tree: root -> profile -> stage -> item
+- Stores a snapshot compactly: gzip'd, each distinct output stored once
+- Diffs two snapshots top-down, skipping every subtree whose hash matches,
+  down to the profiles, options and messages that changed
+
+Usage:
+    python snapshot.py take baseline.snap [--workers N]
+    python snapshot.py diff baseline.snap candidate.snap [--limit 20]
+    python snapshot.py check baseline.snap    # current engine vs baseline, exit 1 on changes
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+import pipeline
+
+SNAPSHOT_VERSION = 1
+
+# Stage -> how its items are keyed in the tree
+STAGES = ["fits", "evaluations", "sensitivities", "comparisons", "scenarios", "insight"]
+
+# ============================================================================
+# HASH TREE
+# ============================================================================
+
+def _hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _node_hash(children: Dict[str, str]) -> str:
+    """Hash of an inner node from its (name, child hash) pairs, in name order"""
+    return _hash("\0".join(f"{name}\0{digest}" for name, digest in sorted(children.items())).encode())
+
+
+def _leaves(result: Dict) -> Iterator[Tuple[str, str, str]]:
+    """(stage, item, JSON content) for every output of one pipeline result"""
+    for option_name, fit in result["fits"].items():
+        yield "fits", option_name, json.dumps(list(fit))
+    for option_name, evaluation in result["evaluations"].items():
+        for category, messages in evaluation.items():
+            yield "evaluations", f"{option_name} / {category}", json.dumps(messages)
+    for name, sensitivity in result["sensitivities"].items():
+        yield "sensitivities", name, json.dumps(list(sensitivity))
+    yield "comparisons", "all", json.dumps(result["comparisons"])
+    for scenario, scenario_results in result["scenarios"].items():
+        for option_name, text in (scenario_results or {}).items():
+            yield "scenarios", f"{scenario} / {option_name}", json.dumps(text)
+    yield "insight", "all", json.dumps(result["insight"])
+
+
+def _snapshot_profile(index: int) -> List[Tuple[str, str, str]]:
+    return list(_leaves(pipeline.run_analysis(pipeline.profile_from_index(index))))
+
+
+# ============================================================================
+# SNAPSHOT
+# ============================================================================
+
+class Snapshot:
+    """
+    One sweep of the whole profile space.
+
+    profiles maps profile key -> {"hash", "stages": {stage: {"hash",
+    "items": {item: string id}}}}; strings holds each distinct output once.
+    """
+
+    def __init__(self, meta: Dict, strings: List[str], profiles: Dict[str, Dict]):
+        self.meta = meta
+        self.strings = strings
+        self.profiles = profiles
+
+    @property
+    def root(self) -> str:
+        return self.meta["root"]
+
+    @classmethod
+    def take(cls, workers: Optional[int] = None) -> "Snapshot":
+        """Sweeps every profile with the engine as it is now (workers=1: in-process)"""
+        start = time.perf_counter()
+        if workers == 1:
+            sweeps = [_snapshot_profile(index) for index in range(pipeline.profile_count())]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                sweeps = list(executor.map(_snapshot_profile, range(pipeline.profile_count()), chunksize=32))
+
+        strings: List[str] = []
+        string_ids: Dict[str, int] = {}
+        string_hashes: List[str] = []
+        profiles: Dict[str, Dict] = {}
+
+        for index, leaves in enumerate(sweeps):
+            stages: Dict[str, Dict] = {}
+            for stage, item, content in leaves:
+                if content not in string_ids:
+                    string_ids[content] = len(strings)
+                    strings.append(content)
+                    string_hashes.append(_hash(content.encode()))
+                stages.setdefault(stage, {"items": {}})["items"][item] = string_ids[content]
+            for stage in stages.values():
+                stage["hash"] = _node_hash({item: string_hashes[i] for item, i in stage["items"].items()})
+            key = pipeline.profile_key(pipeline.profile_from_index(index))
+            profiles[key] = {"hash": _node_hash({name: s["hash"] for name, s in stages.items()}), "stages": stages}
+
+        meta = {
+            "version": SNAPSHOT_VERSION,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "engine_digest": pipeline.engine_digest(),
+            "catalog_version": pipeline.catalog_version(),
+            "rules_version": pipeline.rules_version(),
+            "scenarios": list(pipeline.SCENARIOS.values()),
+            "root": _node_hash({key: profile["hash"] for key, profile in profiles.items()}),
+            "seconds": round(time.perf_counter() - start, 3)
+        }
+        return cls(meta, strings, profiles)
+
+    def save(self, path: str) -> None:
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump({"meta": self.meta, "strings": self.strings, "profiles": self.profiles},
+                      f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "Snapshot":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data["meta"].get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"{path} is snapshot v{data['meta'].get('version')}, expected v{SNAPSHOT_VERSION}")
+        return cls(data["meta"], data["strings"], data["profiles"])
+
+    def content(self, profile_key: str, stage: str, item: str):
+        """Decoded output of one tree leaf, or None when it doesn't exist"""
+        string_id = self.profiles.get(profile_key, {}).get("stages", {}).get(stage, {}).get("items", {}).get(item)
+        return None if string_id is None else json.loads(self.strings[string_id])
+
+
+# ============================================================================
+# DIFF
+# ============================================================================
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> List[Dict]:
+    """
+    Every changed leaf as {profile, stage, item, old, new}, descending only
+    into subtrees whose hashes differ. Missing sides are None.
+    """
+    changes: List[Dict] = []
+    if old.root == new.root:
+        return changes
+
+    for key in sorted(set(old.profiles) | set(new.profiles)):
+        old_profile, new_profile = old.profiles.get(key), new.profiles.get(key)
+        if old_profile and new_profile and old_profile["hash"] == new_profile["hash"]:
+            continue
+        old_stages = old_profile["stages"] if old_profile else {}
+        new_stages = new_profile["stages"] if new_profile else {}
+
+        for stage in STAGES:
+            old_stage, new_stage = old_stages.get(stage), new_stages.get(stage)
+            if old_stage and new_stage and old_stage["hash"] == new_stage["hash"]:
+                continue
+            old_items = old_stage["items"] if old_stage else {}
+            new_items = new_stage["items"] if new_stage else {}
+
+            for item in sorted(set(old_items) | set(new_items)):
+                old_value = old.strings[old_items[item]] if item in old_items else None
+                new_value = new.strings[new_items[item]] if item in new_items else None
+                if old_value != new_value:
+                    changes.append({
+                        "profile": key,
+                        "stage": stage,
+                        "item": item,
+                        "old": None if old_value is None else json.loads(old_value),
+                        "new": None if new_value is None else json.loads(new_value)
+                    })
+    return changes
+
+
+def _option(change: Dict) -> str:
+    """Option an item belongs to ("" for profile-wide stages)"""
+    if change["stage"] in ("fits", "evaluations"):
+        return change["item"].split(" / ")[0]
+    if change["stage"] == "scenarios":
+        return change["item"].split(" / ")[1]
+    return ""
+
+
+def message_changes(change: Dict) -> Tuple[List[str], List[str]]:
+    """(removed, added) messages of one changed leaf"""
+    def messages(value) -> List[str]:
+        if value is None:
+            return []
+        if change["stage"] in ("evaluations", "comparisons"):
+            return list(value)
+        return [" - ".join(str(part) for part in value if part)] if isinstance(value, list) else [value]
+
+    old, new = messages(change["old"]), messages(change["new"])
+    return [m for m in old if m not in new], [m for m in new if m not in old]
+
+
+def summarize(changes: List[Dict]) -> Dict:
+    """Counts of changed profiles, stages, options and fit-level flips"""
+    fit_flips = Counter(
+        (_option(change), change["old"][0], change["new"][0])
+        for change in changes
+        if change["stage"] == "fits" and change["old"] and change["new"] and change["old"][0] != change["new"][0]
+    )
+    return {
+        "profiles": len({change["profile"] for change in changes}),
+        "leaves": len(changes),
+        "stages": Counter(change["stage"] for change in changes),
+        "options": Counter(_option(change) for change in changes if _option(change)),
+        "fit_flips": fit_flips
+    }
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _print_diff(old: Snapshot, new: Snapshot, limit: int) -> int:
+    start = time.perf_counter()
+    changes = diff_snapshots(old, new)
+    elapsed = time.perf_counter() - start
+
+    print(f"old: rules {old.meta['rules_version']}, catalog {old.meta['catalog_version']} ({old.meta['created']})")
+    print(f"new: rules {new.meta['rules_version']}, catalog {new.meta['catalog_version']} ({new.meta['created']})")
+    if not changes:
+        print(f"No output changed across {len(new.profiles)} profiles (diff {elapsed * 1000:.1f} ms)")
+        return 0
+
+    summary = summarize(changes)
+    print(f"{summary['leaves']} outputs changed in {summary['profiles']} of {len(new.profiles)} profiles "
+          f"(diff {elapsed * 1000:.1f} ms)")
+    print("By stage: " + ", ".join(f"{stage} {n}" for stage, n in summary["stages"].most_common()))
+    print("By option: " + ", ".join(f"{option} {n}" for option, n in summary["options"].most_common()))
+    for (option_name, before, after), n in summary["fit_flips"].most_common():
+        print(f"  fit {option_name}: {before} -> {after} in {n} profiles")
+
+    print()
+    for change in changes[:limit]:
+        print(f"{change['profile']} · {change['stage']} · {change['item']}")
+        removed, added = message_changes(change)
+        for message in removed:
+            print(f"    - {message}")
+        for message in added:
+            print(f"    + {message}")
+    if len(changes) > limit:
+        print(f"... {len(changes) - limit} more (--limit)")
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot every profile's outputs and diff rule versions")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    take = subparsers.add_parser("take", help="Sweep all profiles and save a snapshot")
+    take.add_argument("path")
+    take.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    diff = subparsers.add_parser("diff", help="Compare two saved snapshots")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--limit", type=int, default=20, help="Changed outputs to print")
+    check = subparsers.add_parser("check", help="Compare the current engine against a saved snapshot")
+    check.add_argument("baseline")
+    check.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    check.add_argument("--limit", type=int, default=20, help="Changed outputs to print")
+    args = parser.parse_args()
+
+    if args.command == "take":
+        snapshot = Snapshot.take(args.workers)
+        snapshot.save(args.path)
+        print(f"{len(snapshot.profiles)} profiles, {len(snapshot.strings)} distinct outputs, "
+              f"root {snapshot.root} ({snapshot.meta['seconds']:.2f}s) -> {args.path}")
+    elif args.command == "diff":
+        sys.exit(_print_diff(Snapshot.load(args.old), Snapshot.load(args.new), args.limit))
+    else:
+        sys.exit(_print_diff(Snapshot.load(args.baseline), Snapshot.take(args.workers), args.limit))
+
+
+if __name__ == "__main__":
+    main()
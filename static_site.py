@@ -0,0 +1,240 @@
+"""
+Static report site for The Referee
+- Renders every profile x scenario report to HTML and Markdown
+- Stable URL scheme: profiles/<profile_key>/index.html, profiles/<profile_key>/<scenario>.html
+- Rendered in parallel across a process pool
+- Content-hashed manifest: unchanged pages are not rewritten on rebuild, and
+  nothing is rendered at all when no input (engine, renderer, theme) changed
+
+Usage:
+    python static_site.py build site/ [--workers N] [--app-url https://referee.example.com/]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+import pipeline
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CSS_SOURCE = os.path.join(BASE_DIR, "static", "referee.css")
+
+MANIFEST = "manifest.json"
+SITE_VERSION = 1
+
+# None is the plain report (no what-if scenario)
+PAGE_SCENARIOS = [None] + list(pipeline.SCENARIOS.values())
+FORMATS = ("html", "md")
+
+# Sources that determine page content, besides pipeline.engine_sources()
+RENDER_MODULES = ["report.py", "static_site.py", os.path.join("static", "referee.css")]
+
+# ============================================================================
+# URL SCHEME
+# ============================================================================
+
+def page_path(profile_key: str, scenario: Optional[str] = None, fmt: str = "html") -> str:
+    """Site-relative path of one report page"""
+    return f"profiles/{profile_key}/{scenario or 'index'}.{fmt}"
+
+
+def app_link(app_url: str, profile_key: str, scenario: Optional[str] = None) -> str:
+    """Deep link into the interactive app (see referee_tool query parameters)"""
+    params = {"profile": profile_key}
+    if scenario:
+        params["scenario"] = scenario
+    return f"{app_url}?{urlencode(params)}"
+
+
+def source_digest(app_url: str = "") -> str:
+    """Hash of everything page content depends on"""
+    digest = hashlib.sha256(pipeline.engine_digest().encode())
+    for module in RENDER_MODULES:
+        with open(os.path.join(BASE_DIR, module), "rb") as f:
+            digest.update(f.read())
+    digest.update(app_url.encode())
+    return digest.hexdigest()
+
+
+# ============================================================================
+# RENDERING (module-level so process workers can run it)
+# ============================================================================
+
+_previous: Dict[str, str] = {}
+_out_dir = ""
+_app_url = ""
+
+
+def _init_worker(out_dir: str, previous: Dict[str, str], app_url: str) -> None:
+    global _out_dir, _previous, _app_url
+    _out_dir, _previous, _app_url = out_dir, previous, app_url
+
+
+def _write_if_changed(path: str, content: str) -> Tuple[str, bool]:
+    data = content.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    target = os.path.join(_out_dir, path)
+    if _previous.get(path) == digest and os.path.exists(target):
+        return digest, False
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(data)
+    return digest, True
+
+
+def _render_profile(index: int) -> List[Tuple[str, str, bool]]:
+    """Renders every page for one profile; returns (path, sha256, written)"""
+    from options import get_database_options
+    from report import SCENARIO_TITLES, render_html, render_markdown
+
+    options = get_database_options()
+    constraints = pipeline.profile_from_index(index)
+    key = pipeline.profile_key(constraints)
+    result = pipeline.analyze(constraints)
+
+    pages = []
+    for scenario in PAGE_SCENARIOS:
+        links = {"Report" if scenario is None else "No scenario": "index.html"}
+        links.update({
+            title: f"{other}.html" for other, title in SCENARIO_TITLES.items() if other != scenario
+        })
+        links["Markdown"] = os.path.basename(page_path(key, scenario, "md"))
+        links["All profiles"] = "../../index.html"
+        if _app_url:
+            links["Open in the interactive app"] = app_link(_app_url, key, scenario)
+
+        for fmt in FORMATS:
+            path = page_path(key, scenario, fmt)
+            if fmt == "html":
+                content = render_html(result, options, scenario, css_href="../../referee.css", links=links)
+            else:
+                content = render_markdown(result, options, scenario)
+            pages.append((path, *_write_if_changed(path, content)))
+    return pages
+
+
+def _render_index() -> str:
+    """Profile picker that navigates to the static page - no server code involved"""
+    import html
+
+    selects = []
+    for key, enum in zip(pipeline.PROFILE_KEYS, pipeline.PROFILE_FIELDS.values()):
+        choices = "".join(f'<option value="{member.value}">{member.value}</option>' for member in enum)
+        selects.append(f'<label>{key.replace("_", " ").title()} <select data-key="{key}">{choices}</select></label><br>')
+    scenarios = '<option value="index">None</option>' + "".join(
+        f'<option value="{key}">{html.escape(label)}</option>' for label, key in pipeline.SCENARIOS.items()
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>The Referee - Reports</title>
+<link rel="stylesheet" href="referee.css">
+<style>body {{ max-width: 800px; margin: 0 auto; padding: 2rem 1rem; }} label {{ display: inline-block; margin: 0.3rem 0; }}</style>
+</head>
+<body>
+<div class="hero-section"><div class="hero-logo">⚖️</div><h1 class="hero-title">The Referee</h1>
+<p class="hero-subtitle">Pre-rendered trade-off reports for every constraint profile</p></div>
+<form class="glass-card" id="picker">
+{"".join(selects)}
+<label>What-if scenario <select id="scenario">{scenarios}</select></label><br>
+<button type="submit">Open report</button>
+</form>
+<script>
+document.getElementById("picker").addEventListener("submit", function (event) {{
+  event.preventDefault();
+  var key = Array.prototype.map.call(document.querySelectorAll("select[data-key]"), function (s) {{ return s.value; }}).join("-");
+  window.location.href = "profiles/" + key + "/" + document.getElementById("scenario").value + ".html";
+}});
+</script>
+</body>
+</html>
+"""
+
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def build_site(out_dir: str, workers: Optional[int] = None, app_url: str = "", force: bool = False) -> Dict:
+    """
+    Renders the whole site into out_dir. Pages whose content hash matches the
+    previous manifest are left untouched; pages no longer produced are removed.
+    Returns counts of pages written, unchanged and removed.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST)
+
+    sources = source_digest(app_url)
+    previous: Dict[str, str] = {}
+    if os.path.exists(manifest_path) and not force:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == SITE_VERSION:
+            previous = manifest["pages"]
+            if manifest.get("source_digest") == sources and all(
+                os.path.exists(os.path.join(out_dir, path)) for path in previous
+            ):
+                return {"pages": len(previous), "written": 0, "unchanged": len(previous), "removed": 0}
+
+    _init_worker(out_dir, previous, app_url)
+    pages: Dict[str, str] = {}
+    written = 0
+
+    # Site-level files go through the same hash check as report pages
+    with open(CSS_SOURCE, encoding="utf-8") as f:
+        site_files = [("referee.css", f.read()), ("index.html", _render_index())]
+    for path, content in site_files:
+        pages[path], changed = _write_if_changed(path, content)
+        written += changed
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(out_dir, previous, app_url)
+    ) as executor:
+        for profile_pages in executor.map(_render_profile, range(pipeline.profile_count()), chunksize=16):
+            for path, digest, changed in profile_pages:
+                pages[path] = digest
+                written += changed
+
+    removed = 0
+    for path in set(previous) - set(pages):
+        target = os.path.join(out_dir, path)
+        if os.path.exists(target):
+            os.remove(target)
+            removed += 1
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": SITE_VERSION,
+            "source_digest": sources,
+            "pages": dict(sorted(pages.items()))
+        }, f, indent=0)
+
+    return {"pages": len(pages), "written": written, "unchanged": len(pages) - written, "removed": removed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render every report as a static site")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Render (or incrementally update) the site")
+    build.add_argument("out_dir")
+    build.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    build.add_argument("--app-url", default="", help="Interactive app URL for 'Open in the app' links")
+    build.add_argument("--force", action="store_true", help="Rewrite every page")
+    build.add_argument("--clean", action="store_true", help="Delete out_dir first")
+    args = parser.parse_args()
+
+    if args.clean and os.path.isdir(args.out_dir):
+        shutil.rmtree(args.out_dir)
+    counts = build_site(args.out_dir, args.workers, args.app_url, args.force)
+    print(f"{counts['pages']} pages: {counts['written']} written, "
+          f"{counts['unchanged']} unchanged, {counts['removed']} removed")
+
+
+if __name__ == "__main__":
+    main()
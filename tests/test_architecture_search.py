@@ -0,0 +1,61 @@
+import random
+from itertools import combinations
+
+import pytest
+from architecture_search import INTEGRATION_PENALTY, ArchitectureSearcher
+from evaluator import CONSTRAINT_SECTIONS
+from options import get_database_options
+from pipeline import iter_profiles, profile_from_key
+
+
+def brute_force(searcher, sizes, top_k):
+    """Top scores over every combination the search may return, dominated ones excluded"""
+    def coverage(members):
+        return [max(searcher.coverage[name][key] for name in members) for key in CONSTRAINT_SECTIONS]
+
+    def returnable(members):
+        return len(members) in sizes and any(searcher._is_primary(name) for name in members)
+
+    scores = []
+    for size in sizes:
+        for members in combinations(searcher.options, size):
+            if not returnable(members):
+                continue
+            covered = coverage(members)
+            rests = [members[:i] + members[i + 1:] for i in range(size)]
+            if any(returnable(rest) and coverage(rest) == covered for rest in rests):
+                continue
+            scores.append(sum(covered) - INTEGRATION_PENALTY * (size - 1))
+    return sorted(scores, reverse=True)[:top_k]
+
+
+def test_matches_brute_force_on_every_core_profile():
+    options = get_database_options()
+    for constraints in iter_profiles():
+        searcher = ArchitectureSearcher(constraints, options)
+        found = [architecture["score"] for architecture in searcher.search()]
+        assert found == brute_force(searcher, (2, 3), 5), constraints.to_dict()
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_brute_force_on_random_catalogs(seed):
+    rng = random.Random(seed)
+    searcher = ArchitectureSearcher(profile_from_key("low-latency-medium-beginner-urgent-simple-eventual"), {})
+    # Few coverage levels so catalogs hold ties, duplicates and redundant members
+    names = [f"option{i}" for i in range(rng.randint(1, 7))]
+    searcher.options = {name: {"type": rng.choice(["relational", "document", "cache"])} for name in names}
+    searcher.coverage = {name: {key: rng.choice([-1.0, 0.0, 1.0, 2.0]) for key in CONSTRAINT_SECTIONS} for name in names}
+    searcher._describe = lambda members, score: {"members": members, "score": score}
+    sizes = rng.choice([(2, 3), (2,), (3,), (1, 3), (1, 2, 3)])
+    top_k = rng.randint(1, 6)
+
+    found = [architecture["score"] for architecture in searcher.search(sizes, top_k)]
+    assert found == brute_force(searcher, sizes, top_k)
+
+
+def test_best_pair_keeps_a_redundant_member():
+    # DynamoDB alone covers everything Redis does, but a lone store is not an architecture
+    searcher = ArchitectureSearcher(profile_from_key("low-latency-medium-beginner-urgent-simple-eventual"), get_database_options())
+    best = searcher.search()[0]
+    assert sorted(best["members"]) == ["DynamoDB", "Redis (ElastiCache)"]
+    assert best["score"] == 7.0
@@ -0,0 +1,31 @@
+import numpy as np
+from cost_model import find_crossovers
+
+
+def test_crossing_between_grid_points():
+    x = np.arange(4)
+    crossovers = find_crossovers(x, {"a": np.array([0.0, 1.0, 2.0, 3.0]), "b": np.array([1.5, 1.5, 1.5, 1.5])})
+    assert crossovers == [{"x": 1.5, "cheaper_before": "a", "cheaper_after": "b"}]
+
+
+def test_curves_equal_at_a_grid_point():
+    x = np.arange(4)
+    crossovers = find_crossovers(x, {"a": np.array([3, 2, 1, 0]), "b": np.array([1, 1, 1, 1])})
+    assert crossovers == [{"x": 2.0, "cheaper_before": "b", "cheaper_after": "a"}]
+
+
+def test_curves_equal_over_several_points():
+    x = np.arange(5)
+    crossovers = find_crossovers(x, {"a": np.array([1, 2, 2, 2, 3]), "b": np.array([2, 2, 2, 2, 2])})
+    assert crossovers == [{"x": 1.0, "cheaper_before": "a", "cheaper_after": "b"}]
+
+
+def test_touching_curves_do_not_cross():
+    x = np.arange(5)
+    curves = {"a": np.array([2, 1, 2, 2, 2]), "b": np.array([1, 1, 1, 2, 1])}
+    assert find_crossovers(x, curves) == []
+
+
+def test_identical_curves_do_not_cross():
+    x = np.arange(3)
+    assert find_crossovers(x, {"a": np.array([1, 2, 3]), "b": np.array([1, 2, 3])}) == []
@@ -0,0 +1,70 @@
+from collections import defaultdict
+from itertools import product
+
+import numpy as np
+import pytest
+from global_sensitivity import GlobalSensitivityAnalyzer, sobol_indices
+from interactions import build_cube
+
+
+def brute_force(values):
+    """Sobol indices of one option by grouping every cell, from the definitions"""
+    cells = list(product(*(range(n) for n in values.shape)))
+    scores = np.array([values[cell] for cell in cells])
+    variance = scores.var()
+    first, total = [], []
+    for axis in range(values.ndim):
+        by_value, by_rest = defaultdict(list), defaultdict(list)
+        for cell, score in zip(cells, scores):
+            by_value[cell[axis]].append(score)
+            by_rest[cell[:axis] + cell[axis + 1:]].append(score)
+        first.append(np.var([np.mean(group) for group in by_value.values()]) / variance)
+        total.append(np.mean([np.var(group) for group in by_rest.values()]) / variance)
+    return variance, first, total
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force_on_random_cubes(seed):
+    rng = np.random.default_rng(seed)
+    shape = tuple(rng.integers(2, 5, size=rng.integers(2, 5)))
+    cube = rng.integers(0, 3, size=(3,) + shape).astype(float)
+    variance, first, total = sobol_indices(cube)
+    for o in range(cube.shape[0]):
+        expected_variance, expected_first, expected_total = brute_force(cube[o])
+        np.testing.assert_allclose(variance[o], expected_variance)
+        np.testing.assert_allclose(first[o], expected_first, atol=1e-12)
+        np.testing.assert_allclose(total[o], expected_total, atol=1e-12)
+
+
+def test_matches_brute_force_on_the_fit_cube():
+    names, cube = build_cube("fit")
+    analyzer = GlobalSensitivityAnalyzer(names, cube)
+    for o, name in enumerate(names):
+        if name in analyzer.inert():
+            continue
+        _, expected_first, expected_total = brute_force(cube[o])
+        np.testing.assert_allclose(analyzer.first_order[o], expected_first, atol=1e-12)
+        np.testing.assert_allclose(analyzer.total_effect[o], expected_total, atol=1e-12)
+
+
+def test_additive_scores_have_no_interactions():
+    a, b, c = np.meshgrid([0.0, 1.0], [0.0, 2.0, 4.0], [0.0, 3.0], indexing="ij")
+    _, first, total = sobol_indices((a + b + c)[None])
+    np.testing.assert_allclose(first, total)
+    assert first.sum() == pytest.approx(1.0)
+
+
+def test_pure_interaction_has_no_first_order_effect():
+    a, b = np.meshgrid([-1.0, 1.0], [-1.0, 1.0], indexing="ij")
+    _, first, total = sobol_indices((a * b)[None])
+    np.testing.assert_allclose(first, [[0.0, 0.0]])
+    np.testing.assert_allclose(total, [[1.0, 1.0]])
+
+
+def test_constant_option_is_inert():
+    cube = np.stack([np.ones((2, 3)), np.arange(6.0).reshape(2, 3)])
+    analyzer = GlobalSensitivityAnalyzer(["flat", "varied"], cube)
+    assert analyzer.inert() == ["flat"]
+    assert np.all(analyzer.first_order[0] == 0) and np.all(analyzer.total_effect[0] == 0)
+    # Only the varied option carries weight across options
+    np.testing.assert_allclose(analyzer.overall_first_order, analyzer.first_order[1])
@@ -0,0 +1,68 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+from advanced_analysis import ConstraintFitAssessor
+from interactions import FIT_SCORES, InteractionAnalyzer, build_cube, cube_shape
+from options import get_database_options
+from pipeline import PROFILE_FIELDS, iter_profiles
+
+FIELDS = list(PROFILE_FIELDS)
+
+
+def cell(constraints):
+    return tuple(list(enum).index(getattr(constraints, field)) for field, enum in PROFILE_FIELDS.items())
+
+
+@pytest.fixture(scope="module")
+def fit_cube():
+    return build_cube("fit")
+
+
+def test_cube_cells_match_direct_assessment(fit_cube):
+    names, cube = fit_cube
+    assert cube.shape == (len(get_database_options()),) + cube_shape()
+    for constraints in iter_profiles():
+        assessor = ConstraintFitAssessor(constraints)
+        expected = [FIT_SCORES[assessor.assess_fit(name)[0]] for name in names]
+        assert list(cube[(slice(None),) + cell(constraints)]) == expected
+
+
+def test_interaction_matches_brute_force_means(fit_cube):
+    names, cube = fit_cube
+    analyzer = InteractionAnalyzer(names, cube)
+    cells = np.array([cell(constraints) for constraints in iter_profiles()])
+    fits = np.array([cube[(slice(None),) + tuple(position)] for position in cells])  # (n_profiles, n_options)
+
+    def mean(**fixed):
+        mask = np.ones(len(cells), dtype=bool)
+        for field, position in fixed.items():
+            mask &= cells[:, FIELDS.index(field)] == position
+        return fits[mask].mean(axis=0)
+
+    for field_a, field_b in combinations(FIELDS, 2):
+        effects = analyzer.interaction(field_a, field_b)
+        for a in range(len(PROFILE_FIELDS[field_a])):
+            for b in range(len(PROFILE_FIELDS[field_b])):
+                expected = mean(**{field_a: a, field_b: b}) - mean(**{field_a: a}) - mean(**{field_b: b}) + mean()
+                np.testing.assert_allclose(effects[:, a, b], expected, atol=1e-12)
+
+
+def test_additive_cube_has_no_interactions():
+    rng = np.random.default_rng(0)
+    cube = sum(
+        rng.normal(size=(2,) + tuple(n if k == axis else 1 for k, n in enumerate(cube_shape())))
+        for axis in range(len(cube_shape()))
+    )
+    analyzer = InteractionAnalyzer(["a", "b"], np.broadcast_to(cube, (2,) + cube_shape()))
+    np.testing.assert_allclose(analyzer.strength(), 0.0, atol=1e-12)
+
+
+def test_strength_is_symmetric_rms(fit_cube):
+    names, cube = fit_cube
+    analyzer = InteractionAnalyzer(names, cube)
+    strength = analyzer.strength()
+    np.testing.assert_array_equal(strength, strength.swapaxes(1, 2))
+    effects = analyzer.interaction("budget", "scale")
+    i, j = FIELDS.index("budget"), FIELDS.index("scale")
+    np.testing.assert_allclose(strength[:, i, j], np.sqrt((effects ** 2).mean(axis=(1, 2))))
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from pareto import ParetoAnalyzer, dominators, non_dominated_sort
+from pipeline import iter_profiles
+
+
+def dominates(a, b):
+    return bool(np.all(a >= b) and np.any(a > b))
+
+
+def brute_force_layers(scores):
+    """Peels the non-dominated set off one layer at a time, comparing every pair"""
+    remaining, layers = list(range(len(scores))), []
+    while remaining:
+        layer = [i for i in remaining if not any(dominates(scores[j], scores[i]) for j in remaining)]
+        layers.append(layer)
+        remaining = [i for i in remaining if i not in layer]
+    return layers
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_matches_brute_force_on_random_scores(seed):
+    rng = np.random.default_rng(seed)
+    n_options, n_objectives = rng.integers(0, 40), rng.integers(1, 6)
+    # Few score levels, so duplicates and ties are common
+    scores = rng.integers(-3, 4, size=(n_options, n_objectives)) / 2
+
+    layers = non_dominated_sort(scores)
+    assert layers == brute_force_layers(scores)
+    assert dominators(scores, layers) == {
+        i: [j for j in np.concatenate(layers[:k]).astype(int).tolist() if dominates(scores[j], scores[i])]
+        for k, layer in enumerate(layers) if k for i in layer
+    }
+
+
+def test_dominators_cover_every_dominated_row():
+    rng = np.random.default_rng(1)
+    scores = rng.integers(-6, 7, size=(200, 8)) / 2
+    layers = non_dominated_sort(scores)
+    found = dominators(scores, layers)
+    for i in range(len(scores)):
+        expected = [j for j in range(len(scores)) if dominates(scores[j], scores[i])]
+        assert sorted(found.get(i, [])) == expected
+
+
+def test_identical_rows_share_a_layer():
+    scores = np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 0.0], [0.0, 0.0]])
+    assert non_dominated_sort(scores) == [[0, 1, 2], [3]]
+    assert dominators(scores, non_dominated_sort(scores)) == {3: [0, 1, 2]}
+
+
+def test_profiles_match_brute_force():
+    for constraints in list(iter_profiles())[::7]:
+        analyzer = ParetoAnalyzer.for_profile(constraints)
+        assert analyzer.layers == brute_force_layers(analyzer.scores)
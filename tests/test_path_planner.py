@@ -0,0 +1,76 @@
+import random
+
+import pytest
+from advanced_analysis import ConstraintFitAssessor
+from constraints import EXTENDED_FIELDS
+from options import get_database_options
+from path_planner import CHANGE_COSTS, CATEGORICAL_FIELDS, PathPlanner, fit_target, no_risky_target
+from pipeline import PROFILE_FIELDS, profile_from_index, profile_from_key, profile_count
+from plugins import comparison_options
+
+
+def random_profile(rng):
+    constraints = profile_from_index(rng.randrange(profile_count()))
+    for field in rng.sample(list(EXTENDED_FIELDS), rng.randint(0, 2)):
+        setattr(constraints, field, rng.choice(list(EXTENDED_FIELDS[field])))
+    return constraints
+
+
+def random_target(rng, options):
+    if rng.random() < 0.25:
+        return no_risky_target()
+    return fit_target(rng.choice(list(options)), rng.choice(["strong_fit", "moderate_fit"]))
+
+
+def uninformed(planner):
+    """The same search with a zero heuristic - plain Dijkstra"""
+    planner._heuristic = lambda target: (lambda node: 0)
+    return planner
+
+
+@pytest.mark.parametrize("plugins", [(), ("CockroachDB Serverless",)])
+@pytest.mark.parametrize("seed", range(40))
+def test_cheapest_plan_matches_dijkstra(seed, plugins):
+    rng = random.Random(seed)
+    options = comparison_options(plugins) if plugins else None
+    start = random_profile(rng)
+    target = random_target(rng, options or get_database_options())
+    locked = rng.sample(list(PROFILE_FIELDS), rng.randint(0, 2))
+
+    plans = PathPlanner(start, options, locked).plan(target)
+    expected = uninformed(PathPlanner(start, options, locked)).plan(target, limit=1)
+    assert [plan["cost"] for plan in plans[:1]] == [plan["cost"] for plan in expected]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_plans_reach_the_target_at_their_stated_cost(seed):
+    rng = random.Random(seed)
+    start = random_profile(rng)
+    target = random_target(rng, get_database_options())
+    for plan in PathPlanner(start).plan(target):
+        # Fits of the planned profile, assessed from scratch
+        assessor = ConstraintFitAssessor(profile_from_key(plan["profile"]))
+        assert target.met({name: assessor.assess_fit(name)[0] for name in get_database_options()})
+
+        total = 0
+        for change in plan["changes"]:
+            members = [member.value for member in (PROFILE_FIELDS | EXTENDED_FIELDS)[change["field"]]]
+            up, down = CHANGE_COSTS[change["field"]]
+            steps = members.index(change["to"]) - members.index(change["from"])
+            if change["field"] in CATEGORICAL_FIELDS:
+                expected = up
+            else:
+                expected = steps * up if steps > 0 else -steps * down
+            assert change["cost"] == expected
+            total += expected
+        assert plan["cost"] == total
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_node_fits_match_direct_assessment(seed):
+    rng = random.Random(seed)
+    options = comparison_options(["CockroachDB Serverless"])
+    start = random_profile(rng)
+    planner = PathPlanner(start, options)
+    assessor = ConstraintFitAssessor(start)
+    assert planner.fits(planner.start) == {name: assessor.assess_fit(name)[0] for name in options}
@@ -0,0 +1,73 @@
+import json
+from trace_ingest import ingest_trace
+
+
+def write_lines(tmp_path, name, lines):
+    path = tmp_path / name
+    path.write_text("".join(line + "\n" for line in lines))
+    return str(path)
+
+
+def test_empty_file_with_mmap(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    path.write_bytes(b"")
+    for use_mmap in (True, False):
+        profile = ingest_trace(str(path), use_mmap=use_mmap)
+        assert profile.requests == 0
+        assert profile.skipped == 0
+        assert profile.duration_s == 0.0
+
+
+def test_malformed_json_line_is_skipped(tmp_path):
+    good = json.dumps({"timestamp": 1, "op": "get", "key": "a"})
+    path = write_lines(tmp_path, "trace.jsonl", [good, '{"timestamp": 2, "op": ', good, "[1, 2]"])
+    profile = ingest_trace(path, use_mmap=True)
+    assert profile.requests == 2
+    assert profile.reads == 2
+    assert profile.skipped == 2
+    assert profile.to_dict()["skipped"] == 2
+
+
+def test_unparseable_joins_are_skipped(tmp_path):
+    lines = [
+        json.dumps({"timestamp": 1, "op": "select", "joins": "2"}),
+        json.dumps({"timestamp": 1, "op": "select", "joins": "many"}),
+        json.dumps({"timestamp": 1, "op": "select", "joins": "nan"})
+    ]
+    profile = ingest_trace(write_lines(tmp_path, "trace.jsonl", lines))
+    assert profile.requests == 1
+    assert profile.joins == 1
+    assert profile.skipped == 2
+
+
+def test_unparseable_timestamp_is_skipped(tmp_path):
+    lines = [
+        "timestamp,op,key",
+        "2024-01-01T00:00:00Z,put,a",
+        "yesterday,put,b",
+        "inf,put,c",
+        "2024-01-01T00:00:01Z,get,d"
+    ]
+    profile = ingest_trace(write_lines(tmp_path, "trace.csv", lines), use_mmap=True)
+    assert profile.requests == 2
+    assert profile.writes == 1
+    assert profile.skipped == 2
+    assert profile.duration_s == 2.0
+
+
+def test_quoted_csv_field_spans_lines(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text(
+        'timestamp,op,key,query\r\n'
+        '1,select,a,"SELECT *\r\nFROM orders o\nJOIN users u ON o.user_id = u.id"\r\n'
+        '2,put,b,"INSERT INTO t VALUES (\'x\n\ny\')"\r\n'
+        '\r\n'
+        '3,get,c,\r\n',
+        newline=""
+    )
+    profile = ingest_trace(str(path))
+    assert profile.requests == 3
+    assert profile.reads == 2
+    assert profile.writes == 1
+    assert profile.joins == 1
+    assert profile.skipped == 0
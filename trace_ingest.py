@@ -0,0 +1,379 @@
+"""
+Workload trace ingestion for The Referee
+- Streams CSV or JSON Lines query logs in bounded memory
+- Chunked reads with optional memory-mapping
+- Streaming sketches: HyperLogLog key cardinality, log-bucket QPS histogram
+- Maps the measured workload to a Constraints profile
+- Records that don't parse are counted and skipped, never fatal
+
+Usage:
+    python trace_ingest.py queries.jsonl [--format csv|jsonl] [--mmap]
+"""
+
+import argparse
+import csv
+import json
+import math
+import mmap
+import os
+import re
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+from constraints import Constraints, Performance, Scale, DataComplexity
+
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Default column names; override with the columns argument
+DEFAULT_COLUMNS = {
+    "timestamp": "timestamp",
+    "operation": "op",
+    "key": "key",
+    "query": "query",
+    "joins": "joins"
+}
+
+READ_OPERATIONS = {"read", "get", "select", "query", "scan", "find", "batchget"}
+WRITE_OPERATIONS = {"write", "put", "insert", "update", "delete", "upsert", "set", "batchwrite"}
+
+JOIN_PATTERN = re.compile(r"\bjoin\b", re.IGNORECASE)
+
+# Seconds of out-of-order tolerance before a per-second count is final
+REORDER_WINDOW_S = 60
+
+# ============================================================================
+# STREAMING SKETCHES
+# ============================================================================
+
+class HyperLogLog:
+    """Distinct-count sketch with ~1.6% standard error at the default precision"""
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        h = hash(value) & 0xFFFFFFFFFFFFFFFF
+        index = h >> (64 - self.precision)
+        rest = (h << self.precision) & 0xFFFFFFFFFFFFFFFF
+        rank = 64 - self.precision + 1 if rest == 0 else 65 - rest.bit_length()
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction: linear counting
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class LogHistogram:
+    """Fixed relative-error histogram for positive values (quantiles within ~2%)"""
+
+    def __init__(self, relative_error: float = 0.02):
+        self.log_base = math.log1p(relative_error)
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.maximum = 0.0
+
+    def add(self, value: float, count: int = 1) -> None:
+        bucket = int(math.log(value) / self.log_base) if value > 0 else -1
+        self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total += count
+        self.maximum = max(self.maximum, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.total:
+            return 0.0
+        rank = q * (self.total - 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen > rank:
+                return 0.0 if bucket < 0 else math.exp((bucket + 0.5) * self.log_base)
+        return self.maximum
+
+
+# ============================================================================
+# WORKLOAD PROFILE
+# ============================================================================
+
+@dataclass
+class WorkloadProfile:
+    requests: int
+    reads: int
+    writes: int
+    joins: int
+    duration_s: float
+    qps_p50: float
+    qps_p99: float
+    qps_max: float
+    key_cardinality: int
+    skipped: int = 0
+
+    @property
+    def read_ratio(self) -> float:
+        classified = self.reads + self.writes
+        return self.reads / classified if classified else 0.0
+
+    @property
+    def join_fraction(self) -> float:
+        return self.joins / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "read_ratio": round(self.read_ratio, 4),
+            "join_fraction": round(self.join_fraction, 4),
+            "duration_s": self.duration_s,
+            "qps_p50": round(self.qps_p50, 1),
+            "qps_p99": round(self.qps_p99, 1),
+            "qps_max": self.qps_max,
+            "key_cardinality": self.key_cardinality,
+            "skipped": self.skipped
+        }
+
+
+class TraceIngestor:
+    """Accumulates a workload profile one record at a time in bounded memory"""
+
+    def __init__(self, columns: Optional[Dict[str, str]] = None):
+        self.columns = {**DEFAULT_COLUMNS, **(columns or {})}
+        self.keys = HyperLogLog()
+        self.qps = LogHistogram()
+        self.requests = self.reads = self.writes = self.joins = 0
+        self.skipped = 0  # records that didn't parse
+        self.first_ts = self.last_ts = None
+        self.pending: Dict[int, int] = {}  # second -> count, within REORDER_WINDOW_S
+        self.watermark = None
+
+    def feed(self, record: Optional[Dict]) -> None:
+        """Adds one record; a record that isn't a mapping or whose joins/timestamp don't parse is skipped"""
+        columns = self.columns
+        try:
+            joins = record.get(columns["joins"])
+            joined = int(float(joins)) > 0 if joins not in (None, "") else None
+            timestamp = record.get(columns["timestamp"])
+            ts = _parse_timestamp(timestamp) if timestamp not in (None, "") else None
+        except (AttributeError, TypeError, ValueError, OverflowError):
+            self.skipped += 1
+            return
+        self.requests += 1
+
+        query = str(record.get(columns["query"]) or "")
+        operation = record.get(columns["operation"])
+        if not operation and query:
+            operation = query.split(None, 1)[0]
+        operation = str(operation or "").lower()
+        if operation in READ_OPERATIONS:
+            self.reads += 1
+        elif operation in WRITE_OPERATIONS:
+            self.writes += 1
+
+        if joined is not None:
+            self.joins += joined
+        elif query and JOIN_PATTERN.search(query):
+            self.joins += 1
+
+        key = record.get(columns["key"])
+        if key not in (None, ""):
+            self.keys.add(str(key))
+
+        if ts is not None:
+            self._count_second(ts)
+
+    def _count_second(self, ts: float) -> None:
+        self.first_ts = ts if self.first_ts is None else min(self.first_ts, ts)
+        self.last_ts = ts if self.last_ts is None else max(self.last_ts, ts)
+
+        second = int(ts)
+        if self.watermark is not None and second <= self.watermark:
+            return  # Too late to count - already flushed
+        self.pending[second] = self.pending.get(second, 0) + 1
+
+        horizon = int(self.last_ts) - REORDER_WINDOW_S
+        if len(self.pending) > REORDER_WINDOW_S:
+            self._flush(horizon)
+
+    def _flush(self, up_to: float) -> None:
+        for second in sorted(s for s in self.pending if s <= up_to):
+            if self.watermark is not None and second > self.watermark + 1:
+                # Seconds with no traffic count as zero-QPS samples
+                self.qps.add(0, second - self.watermark - 1)
+            self.qps.add(self.pending.pop(second))
+            self.watermark = second
+
+    def result(self) -> WorkloadProfile:
+        self._flush(math.inf)
+        return WorkloadProfile(
+            requests=self.requests,
+            reads=self.reads,
+            writes=self.writes,
+            joins=self.joins,
+            duration_s=(self.last_ts - self.first_ts + 1) if self.first_ts is not None else 0.0,
+            qps_p50=self.qps.quantile(0.50),
+            qps_p99=self.qps.quantile(0.99),
+            qps_max=self.qps.maximum,
+            key_cardinality=self.keys.count(),
+            skipped=self.skipped
+        )
+
+
+def _parse_timestamp(value) -> float:
+    """Epoch seconds or ISO 8601; ValueError when it is neither"""
+    try:
+        ts = float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    if not math.isfinite(ts):
+        raise ValueError(f"timestamp is not finite: {value!r}")
+    return ts
+
+
+# ============================================================================
+# STREAMING READERS
+# ============================================================================
+
+def iter_line_batches(path: str, chunk_size: int = CHUNK_SIZE, use_mmap: bool = False) -> Iterator[list]:
+    """
+    Yields lists of complete lines (bytes), reading chunk_size bytes at a time.
+    An empty file can't be memory-mapped and falls back to buffered reads.
+    """
+    with open(path, "rb") as f:
+        if use_mmap and os.fstat(f.fileno()).st_size > 0:
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            read = lambda offset: source[offset:offset + chunk_size]
+        else:
+            source = None
+            read = lambda offset: f.read(chunk_size)
+
+        try:
+            offset, remainder = 0, b""
+            while True:
+                chunk = read(offset)
+                if not chunk:
+                    break
+                offset += len(chunk)
+                lines = (remainder + chunk).split(b"\n")
+                remainder = lines.pop()
+                yield lines
+            if remainder:
+                yield [remainder]
+        finally:
+            if source is not None:
+                source.close()
+
+
+def iter_records(path: str, fmt: Optional[str] = None, use_mmap: bool = False) -> Iterator[Dict]:
+    """
+    Streams records from a CSV (header row required) or JSON Lines file.
+    A line that doesn't decode yields None so the caller can count it.
+    CSV goes through csv.reader over the file, so quoted fields may span
+    lines; use_mmap applies to JSON Lines only.
+    """
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+
+    if fmt == "csv":
+        with open(path, newline="", encoding="utf-8", errors="replace") as f:
+            rows = (row for row in csv.reader(f) if row)
+            header = next(rows, None)
+            for row in rows:
+                yield dict(zip(header, row))
+        return
+
+    for lines in iter_line_batches(path, use_mmap=use_mmap):
+        for line in lines:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:  # JSONDecodeError and UnicodeDecodeError
+                    yield None
+
+
+def ingest_trace(path: str, fmt: Optional[str] = None, use_mmap: bool = False,
+                 columns: Optional[Dict[str, str]] = None) -> WorkloadProfile:
+    """Streams a query log and returns its workload profile (skipped counts unparseable records)"""
+    ingestor = TraceIngestor(columns)
+    for record in iter_records(path, fmt, use_mmap):
+        ingestor.feed(record)
+    return ingestor.result()
+
+
+# ============================================================================
+# CONSTRAINT MAPPING
+# ============================================================================
+
+# Scale boundaries sit between the traffic levels each Scale value implies
+MEDIUM_SCALE_QPS = 600
+MASSIVE_SCALE_QPS = 6000
+MEDIUM_SCALE_KEYS = 1_000_000
+MASSIVE_SCALE_KEYS = 100_000_000
+
+THROUGHPUT_QPS = 5000
+THROUGHPUT_WRITE_RATIO = 0.4
+LATENCY_READ_RATIO = 0.9
+
+MODERATE_JOIN_FRACTION = 0.02
+COMPLEX_JOIN_FRACTION = 0.2
+
+
+def derive_constraint_values(profile: WorkloadProfile) -> Dict:
+    """
+    Maps a workload profile to the constraints a query log can measure:
+    performance priority, scale and data complexity (Constraints field -> enum).
+    """
+    if profile.qps_p99 >= THROUGHPUT_QPS or (1 - profile.read_ratio) >= THROUGHPUT_WRITE_RATIO:
+        performance = Performance.THROUGHPUT
+    elif profile.read_ratio >= LATENCY_READ_RATIO:
+        performance = Performance.LATENCY
+    else:
+        performance = Performance.BALANCED
+
+    if profile.qps_p99 >= MASSIVE_SCALE_QPS or profile.key_cardinality >= MASSIVE_SCALE_KEYS:
+        scale = Scale.MASSIVE
+    elif profile.qps_p99 >= MEDIUM_SCALE_QPS or profile.key_cardinality >= MEDIUM_SCALE_KEYS:
+        scale = Scale.MEDIUM
+    else:
+        scale = Scale.SMALL
+
+    if profile.join_fraction >= COMPLEX_JOIN_FRACTION:
+        complexity = DataComplexity.COMPLEX
+    elif profile.join_fraction >= MODERATE_JOIN_FRACTION:
+        complexity = DataComplexity.MODERATE
+    else:
+        complexity = DataComplexity.SIMPLE
+
+    return {"performance": performance, "scale": scale, "data_complexity": complexity}
+
+
+def derive_constraints(profile: WorkloadProfile, base: Constraints) -> Constraints:
+    """
+    Replaces the measurable constraints in base with values derived from the
+    workload profile. Budget, team skill, time to market and consistency are
+    not visible in a query log and are kept from base.
+    """
+    return replace(base, **derive_constraint_values(profile))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Derive a constraint profile from a query log")
+    parser.add_argument("path", help="CSV or JSON Lines query log")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension")
+    parser.add_argument("--mmap", action="store_true", help="Memory-map a JSON Lines file instead of buffered reads")
+    args = parser.parse_args()
+
+    profile = ingest_trace(args.path, args.format, args.mmap)
+    for key, value in profile.to_dict().items():
+        print(f"{key}: {value}")
+
+    print("\nDerived constraints:")
+    for field, value in derive_constraint_values(profile).items():
+        print(f"{field}: {value.value}")
+
+
+if __name__ == "__main__":
+    main()